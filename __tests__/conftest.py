@@ -0,0 +1,10 @@
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+for scripts_dir in ("scripts/pricing", "scripts/validation", "scripts/benchmarks"):
+    path = str(PROJECT_ROOT / scripts_dir)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,28 @@
+import sys
+
+import benchmark_pipelines
+
+
+def _run(monkeypatch, *extra):
+    argv = ["benchmark_pipelines.py", "--stages", "compute", "--scales", "1", "--repeat", "1", *extra]
+    monkeypatch.setattr(sys, "argv", argv)
+    return benchmark_pipelines.main()
+
+
+def test_missing_baseline_fails_only_when_required(tmp_path, monkeypatch):
+    missing = tmp_path / "baseline.json"
+
+    assert _run(monkeypatch, "--baseline", str(missing)) == 0
+    assert _run(monkeypatch, "--baseline", str(missing), "--require-baseline") == 1
+
+    assert _run(monkeypatch, "--baseline", str(missing), "--save-baseline") == 0
+    assert _run(monkeypatch, "--baseline", str(missing), "--require-baseline", "--threshold", "1000") == 0
+
+
+def test_compare_to_baseline_flags_slow_stages():
+    results = [{"stage": "build", "scale": 10.0, "seconds": 2.0}, {"stage": "compute", "scale": 10.0, "seconds": 1.0}]
+    baseline = {"results": {"build@10x": {"seconds": 1.0}, "compute@10x": {"seconds": 1.0}}}
+
+    regressions = benchmark_pipelines.compare_to_baseline(results, baseline, 0.5)
+
+    assert len(regressions) == 1 and regressions[0].startswith("build@10x")
@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+import build_retrieval_index
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_tokenize_matches_the_js_stemmer_and_stopwords():
+    assert build_retrieval_index.tokenize("The agreements aren't running; cities' workers are relational!") == [
+        "agreement", "aren", "runn", "city", "worker", "relate",
+    ]
+    assert build_retrieval_index.chunk_text("") == []
+    chunks = build_retrieval_index.chunk_text("First sentence here. " * 80, max_len=500)
+    assert all(len(chunk) <= 500 and chunk.endswith(".") for chunk in chunks)
+
+
+def test_html_sections_follow_headings():
+    html = """<html><head><title>Doc</title><script>var x = "<p>no</p>";</script></head><body>
+    <p>Intro text.</p><h1>MVR API</h1><p>Driving records.</p>
+    <h2>Fields</h2><table><tr><td>Name</td><td>Type</td></tr></table><ul><li>One <b>bold</b> item</li></ul>
+    </body></html>"""
+    chunks = build_retrieval_index.html_chunks(html, "/mvr_api.html")
+    assert [(c["heading"], c["text"]) for c in chunks] == [
+        ("MVR API", "Intro text."),
+        ("MVR API", "Driving records."),
+        ("Fields", "Name Type One bold item"),
+    ]
+
+
+def test_committed_index_is_current(tmp_path):
+    artifact = build_retrieval_index.build_artifact()
+    committed = json.loads((PROJECT_ROOT / "data/retrieval_index.json").read_text(encoding="utf-8"))
+    assert committed["build_id"] == artifact["build_id"], "rebuild with scripts/pricing/build_retrieval_index.py"
+    assert committed["sources"] == artifact["sources"], "rebuild with scripts/pricing/build_retrieval_index.py"
+    assert committed["pricing"]["ESSENTIAL_CHECK"]["unit"] == artifact["pricing"]["ESSENTIAL_CHECK"]["unit"]
+
+    token = artifact["dictionary"].index("mvr")
+    postings = artifact["postings"][token]
+    assert any(artifact["chunks"][chunk]["url"] == "/mvr_api.html" for chunk in postings[::2])
+    assert build_retrieval_index.write_artifact(artifact, tmp_path / "index.json")
+    assert not build_retrieval_index.write_artifact(artifact, tmp_path / "index.json")
+    # A source edit that leaves the chunks alone still refreshes the recorded hashes
+    touched = {**artifact, "sources": {**artifact["sources"], "pricing.html": "0" * 64}}
+    assert build_retrieval_index.write_artifact(touched, tmp_path / "index.json")
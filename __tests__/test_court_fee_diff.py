@@ -0,0 +1,88 @@
+import json
+
+import pandas as pd
+import pytest
+
+import court_fee_diff
+
+
+def _fees(rows):
+    return pd.DataFrame(rows, columns=["state_code", "county_key", "jurisdiction", "process", "search_cost", "ten_year_surcharge", "court_fee", "access_fee"])
+
+
+OLD = _fees([
+    ["AL", "AUTAUGA", "Autauga", "Auto FE", 0.0, 0.0, 1.65, 1.65],
+    ["AL", "BALDWIN", "Baldwin", "Auto FE", 0.0, 0.0, 1.65, 1.65],
+    ["TX", "HARRIS", "Harris", "Vendor", 4.0, 1.5, 0.0, 0.0],
+    ["TX", "HARRIS", "Harris", "Auto FE", 0.0, 0.0, 1.45, 0.0],
+])
+NEW = _fees([
+    ["AL", "AUTAUGA", "Autauga", "Auto FE", 0.0, 0.0, 1.65, 1.65],
+    ["AL", "BALDWIN", "Baldwin", "Auto FE", 0.0, 0.0, 2.15, 1.65],
+    ["TX", "HARRIS", "Harris", "Vendor", 4.0, 1.5, 0.0, 0.0],
+    ["TX", "DALLAS", "Dallas", "Vendor", 3.0, 0.0, 0.0, 0.0],
+])
+
+
+def test_diff_classifies_rows_with_per_column_deltas():
+    changes = court_fee_diff.diff_schedules(OLD, NEW).set_index(["jurisdiction", "process"])
+
+    assert sorted(changes["change"].items()) == [
+        (("Baldwin", "Auto FE"), "changed"),
+        (("Dallas", "Vendor"), "added"),
+        (("Harris", "Auto FE"), "removed"),
+    ]
+    baldwin = changes.loc[("Baldwin", "Auto FE")]
+    assert (baldwin["delta_court_fee"], baldwin["delta_access_fee"], baldwin["total_delta"]) == (0.5, 0.0, 0.5)
+    assert changes.loc[("Harris", "Auto FE"), "total_delta"] == -1.45
+    assert pd.isna(changes.loc[("Dallas", "Vendor"), "old_total_fee"])
+
+    with pytest.raises(ValueError):
+        court_fee_diff.diff_schedules(pd.concat([OLD, OLD.iloc[:1]]), NEW)
+
+
+def test_ranking_weights_deltas_by_county_order_volume(tmp_path):
+    orders = tmp_path / "orders.csv"
+    pd.DataFrame({
+        "order_id": ["1", "2", "3", "4"],
+        "package": ["PRO", "pro", "PRO", "ESSENTIAL"],
+        "addresses": ["TX:Harris County;TX:Harris", "TX:Harris;AL:Baldwin", "TX:Harris", "AL:Baldwin"],
+    }).to_csv(orders, index=False)
+    volume = court_fee_diff.order_volume(orders)
+    # Each order counts once per county; ESSENTIAL has no criminal searches
+    assert volume[("TX", "HARRIS")] == 3 and volume[("AL", "BALDWIN")] == 1
+
+    routing = pd.DataFrame({"state_code": ["AL", "TX", "TX"], "county_key": ["BALDWIN", "HARRIS", "DALLAS"], "route": ["county", "county", "statewide"]})
+    report = court_fee_diff.rank_changes(court_fee_diff.diff_schedules(OLD, NEW), volume, routing)
+    assert report[["jurisdiction", "orders", "cost_impact"]].values.tolist() == [
+        ["Harris", 3, -4.35],
+        ["Baldwin", 1, 0.5],
+        ["Dallas", 0, 0.0],
+    ]
+
+
+def test_history_records_each_distinct_version_once(tmp_path):
+    history, path = tmp_path / "history", tmp_path / "fees.csv"
+    OLD.to_csv(path, index=False)
+    court_fee_diff.record_version(path, history)
+    assert court_fee_diff.record_version(path, history)["version"] == 1
+    NEW.to_csv(path, index=False)
+    assert court_fee_diff.previous_version(path, history) is not None
+
+    report = court_fee_diff.run(path, None, tmp_path / "changes.csv", history, routing_path=None)
+    assert len(report) == 3
+    manifest = json.loads((history / "manifest.json").read_text())
+    assert [entry["rows"] for entry in manifest["versions"]] == [4, 4]
+    pd.testing.assert_frame_equal(pd.read_csv(history / manifest["versions"][0]["file"]), OLD)
+
+
+def test_identical_reexport_reports_no_changes(tmp_path):
+    history, path, output = tmp_path / "history", tmp_path / "fees.csv", tmp_path / "changes.csv"
+    # Same sequence as the extractor: snapshot the current file, overwrite it, diff against the snapshot
+    for schedule, expected in ((OLD, None), (NEW, 3), (NEW, 0)):
+        previous = court_fee_diff.snapshot_before_replace(path, history)
+        schedule.to_csv(path, index=False)
+        report = court_fee_diff.run(path, previous, output, history, routing_path=None)
+        assert (report is None) if expected is None else len(report) == expected
+    assert pd.read_csv(output).empty
+    assert len(json.loads((history / "manifest.json").read_text())["versions"]) == 2
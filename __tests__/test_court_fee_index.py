@@ -0,0 +1,46 @@
+from multiprocessing import get_context
+from pathlib import Path
+
+import pandas as pd
+
+import court_fee_index
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+FEES_PATH = PROJECT_ROOT / "data/pricing/informdata_court_access_fees.csv"
+
+
+def test_committed_index_matches_fee_schedule():
+    fees = pd.read_csv(FEES_PATH)
+    with court_fee_index.CourtFeeIndex(court_fee_index.INDEX_PATH) as index:
+        assert index.is_current(FEES_PATH), "rebuild with scripts/pricing/court_fee_index.py build"
+        positions, cents = index.lookup_many(zip(fees["state_code"], fees["jurisdiction"], fees["process"]))
+
+    expected = (fees[list(court_fee_index.FEE_COLUMNS)] * 100).round().astype("int32").to_numpy()
+    assert (positions == range(len(fees))).all()
+    assert (cents == expected).all()
+
+
+def test_point_lookups_accept_names_and_county_spellings(tmp_path):
+    path = court_fee_index.build_index(FEES_PATH, tmp_path / "fees.feeidx")
+    with court_fee_index.CourtFeeIndex(path) as index:
+        fee = index.lookup("New Hampshire", "belknap  + district", "processor")
+        assert (fee.state, fee.jurisdiction, fee.court_fee, fee.total) == ("NH", "Belknap + District", 1300, 1940)
+        # County key alias prefers the plain county row over court-specific rows
+        assert index.lookup("NH", "Belknap County", "Processor").jurisdiction == "Belknap"
+        assert index.lookup("AR", "Arkansas County", "Auto FE").jurisdiction == "Arkansas"
+        assert index.lookup("TX", "Nowhere", "Auto FE") is None
+
+        positions, cents = index.lookup_many([("NH", "Belknap", "Processor"), ("TX", "Nowhere", "Auto FE")])
+        assert positions[1] == -1 and cents[1].tolist() == [0, 0, 0, 0]
+
+
+def _lookup_in_worker(path):
+    with court_fee_index.CourtFeeIndex(path) as index:
+        return index.lookup("AL", "Autauga", "Auto FE").total
+
+
+def test_index_is_shareable_across_processes(tmp_path):
+    path = court_fee_index.build_index(FEES_PATH, tmp_path / "fees.feeidx")
+    with get_context("spawn").Pool(2) as pool:
+        assert pool.map(_lookup_in_worker, [path, path]) == [330, 330]
@@ -0,0 +1,90 @@
+import csv
+import datetime as dt
+import io
+import resource
+import zipfile
+
+import openpyxl
+import pytest
+
+import export_sales_workbook
+from export_sales_workbook import Column
+
+
+def write_csv(path, header, rows):
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+
+def test_export_formats_sheets_and_skips_unchanged_rewrite(tmp_path):
+    fees = write_csv(tmp_path / "fees.csv", ["state", "jurisdiction", "court_fee", "searches", "effective_date"], [
+        ["CA", "Los Angeles", "15.00", "120", "2025-07-01"],
+        ["TX", "Harris <County> & Co", "", "7", "2025-09-15"],
+        ["NY", "Statewide", "95.5", "n/a", "2025-01-01"],
+    ])
+    totals = write_csv(tmp_path / "totals.csv", ["state", "total_records"], [["CA", "123456789"]])
+    output = tmp_path / "out/sales.xlsx"
+
+    rows = export_sales_workbook.export_workbook([("Court Fees", fees), ("NatCrim State Totals", totals)], output)
+    assert rows == {"Court Fees": 3, "NatCrim State Totals": 1}
+
+    book = openpyxl.load_workbook(output)
+    assert book.sheetnames == ["Court Fees", "NatCrim State Totals"]
+    sheet = book["Court Fees"]
+    assert [cell.value for cell in sheet[1]] == ["state", "jurisdiction", "court_fee", "searches", "effective_date"]
+    assert sheet["C2"].value == 15 and sheet["C2"].number_format == '"$"#,##0.00'
+    assert sheet["C3"].value is None and sheet["B3"].value == "Harris <County> & Co"
+    assert sheet["E3"].value == dt.datetime(2025, 9, 15) and sheet["E3"].number_format == "yyyy-mm-dd"
+    # "n/a" makes the sampled column text, so the numbers stay as written
+    assert sheet["D2"].value == "120" and sheet["D4"].value == "n/a"
+    assert sheet.freeze_panes == "A2" and sheet.auto_filter.ref == "A1:E4"
+    assert book["NatCrim State Totals"]["B2"].value == 123456789
+    assert book["NatCrim State Totals"]["B2"].number_format == "#,##0"
+
+    before = output.stat().st_mtime_ns
+    export_sales_workbook.export_workbook([("Court Fees", fees), ("NatCrim State Totals", totals)], output)
+    assert output.stat().st_mtime_ns == before
+    assert sorted(path.name for path in output.parent.iterdir()) == ["sales.xlsx"]
+
+
+def test_large_sheet_streams_without_holding_rows(tmp_path):
+    rows = 50_000
+    source = tmp_path / "sources.csv"
+    with source.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["state", "source_name", "record_count", "refresh_date"])
+        for i in range(rows):
+            writer.writerow(["CA", f"Source {i}", i * 37, "2025-10-03"])
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    counts = export_sales_workbook.export_workbook([("NatCrim Sources", source)], tmp_path / "big.xlsx")
+    grown_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) / 1024
+    assert counts == {"NatCrim Sources": rows}
+    # A regular (not write-only) openpyxl workbook holding these 200k cells takes about 60 MB
+    assert grown_mb < 25
+
+    with zipfile.ZipFile(tmp_path / "big.xlsx") as archive:
+        xml = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    last = xml[xml.rindex(f'<row r="{rows + 1}"'):]
+    assert f"<t>Source {rows - 1}</t>" in last and f"<v>{(rows - 1) * 37}</v>" in last
+    assert f'<autoFilter ref="A1:D{rows + 1}"' in last
+    assert '<col width="8" customWidth="1" min="1" max="1" />' in xml and '<pane ySplit="1" topLeftCell="A2"' in xml
+
+
+def test_invalid_sheets_are_rejected_and_leave_no_output(tmp_path):
+    output = tmp_path / "bad.xlsx"
+    book = openpyxl.Workbook(write_only=True)
+    export_sales_workbook.add_sheet(book, "Fees", [Column("state")], [["CA"]])
+    with pytest.raises(ValueError, match="Invalid sheet name"):
+        export_sales_workbook.add_sheet(book, "Fees/2025", [Column("state")], [["CA"]])
+    with pytest.raises(ValueError, match="Duplicate sheet name"):
+        export_sales_workbook.add_sheet(book, "fees", [Column("state")], [])
+    with pytest.raises(ValueError, match="Unknown column kinds"):
+        export_sales_workbook.add_sheet(book, "Totals", [Column("state", "percent")], [])
+    with pytest.raises(ValueError, match="Missing export inputs"):
+        export_sales_workbook.export_workbook([("Pricing", tmp_path / "missing.csv")], output)
+    assert list(tmp_path.iterdir()) == []
+    book.save(io.BytesIO())
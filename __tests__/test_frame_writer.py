@@ -0,0 +1,65 @@
+import json
+
+import pandas as pd
+import pytest
+
+import frame_writer
+
+
+FRAME = pd.DataFrame({
+    "service_id": ["SSN_TRACE", "COUNTY_CRIM", "MVR"],
+    "service_name": ["SSN Trace", "County Criminal / Civil", None],
+    "total_cost": [1.25, 0.1 + 0.2, float("nan")],
+    "searches": [1, 2, 3],
+    "pass_through": [False, True, False],
+})
+
+
+def test_formats_render_once_and_match_legacy_serialization(tmp_path):
+    targets = {fmt: tmp_path / f"table.{fmt}" for fmt in frame_writer.FORMATS}
+    written = frame_writer.write_frame(FRAME, targets)
+
+    assert [(entry.format, entry.changed, entry.rows) for entry in written] == [(fmt, True, 3) for fmt in frame_writer.FORMATS]
+    # Same text as the old to_json round trip, except floats keep full precision instead of 10 digits
+    rounded = frame_writer.write_frame(FRAME.round(2), {"json": tmp_path / "rounded.json"})[0].path
+    assert rounded.read_text() == json.dumps(json.loads(FRAME.round(2).to_json(orient="records")), indent=2)
+    assert json.loads(targets["json"].read_text())[1]["total_cost"] == 0.1 + 0.2
+    assert [json.loads(line)["service_name"] for line in targets["ndjson"].read_text().splitlines()] == ["SSN Trace", "County Criminal / Civil", None]
+    pd.testing.assert_frame_equal(pd.read_parquet(targets["parquet"]), FRAME)
+    assert targets["csv"].read_bytes() == FRAME.to_csv(index=False).encode("utf-8")
+    assert {entry.sha256 for entry in written} == {frame_writer.file_digest(path) for path in targets.values()}
+
+
+def test_datetime_columns_serialize_as_iso_strings(tmp_path):
+    dated = FRAME.assign(
+        refresh_date=pd.to_datetime(["2025-10-03 00:00", "2025-08-04 12:30", None]),
+        snapshot=pd.Timestamp("2025-10-03", tz="UTC"),
+    )
+    json_path, ndjson_path = tmp_path / "dated.json", tmp_path / "dated.ndjson"
+    frame_writer.write_outputs(dated, json_path, ndjson_path)
+
+    records = json.loads(json_path.read_text())
+    assert [r["refresh_date"] for r in records] == ["2025-10-03T00:00:00", "2025-08-04T12:30:00", None]
+    assert records[0]["snapshot"] == "2025-10-03T00:00:00+00:00"
+    assert [json.loads(line) for line in ndjson_path.read_text().splitlines()] == records
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    csv_path, json_path = tmp_path / "out/table.csv", tmp_path / "out/table.json"
+    frame_writer.write_outputs(FRAME, csv_path, json_path)
+    before = {path: path.stat().st_mtime_ns for path in (csv_path, json_path)}
+
+    again = frame_writer.write_outputs(FRAME.copy(), csv_path, json_path)
+    assert not any(entry.changed for entry in again)
+    assert {path: path.stat().st_mtime_ns for path in (csv_path, json_path)} == before
+
+    edited = FRAME.assign(searches=[1, 2, 4])
+    changed = frame_writer.write_outputs(edited, csv_path)
+    assert changed[0].changed and changed[0].to_dict()["sha256"] != again[0].sha256
+    assert pd.read_csv(csv_path)["searches"].tolist() == [1, 2, 4]
+    assert sorted(path.name for path in csv_path.parent.iterdir()) == ["table.csv", "table.json"]
+
+    with pytest.raises(ValueError, match="More than one output per format"):
+        frame_writer.write_outputs(FRAME, csv_path, tmp_path / "other.csv")
+    with pytest.raises(ValueError, match="Cannot infer output format"):
+        frame_writer.write_outputs(FRAME, tmp_path / "table.xlsx")
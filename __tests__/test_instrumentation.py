@@ -0,0 +1,32 @@
+import json
+
+from instrumentation import instrumented_run, span
+
+
+def test_spans_are_recorded_and_written(tmp_path):
+    metrics_path = tmp_path / "metrics.json"
+    profile_path = tmp_path / "run.prof"
+
+    with instrumented_run("unit_test", metrics_path, profile_path):
+        with span("load") as load_span:
+            load_span.rows_out = 10
+        with span("clean", rows_in=10) as clean_span:
+            with span("classify"):
+                pass
+            clean_span.rows_out = 8
+            clean_span.rows_rejected = 2
+
+    payload = json.loads(metrics_path.read_text())
+    names = [s["name"] for s in payload["spans"]]
+    assert names == ["load", "clean/classify", "clean"]
+    clean = payload["spans"][-1]
+    assert clean["rows_rejected"] == 2
+    assert "rows_per_sec" in clean
+    assert profile_path.exists()
+    assert payload["hot_functions"]
+
+
+def test_span_is_noop_outside_a_run():
+    with span("orphan", rows_in=3) as orphan:
+        orphan.rows_out = 3
+    assert orphan.rows_out == 3
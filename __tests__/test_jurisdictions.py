@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pandas as pd
+
+import jurisdictions
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_state_codes_from_every_source_format():
+    raw = ["AL", "us-al", "Alabama", "ALABAMA | Circuit, District ( F/M )", "AL - All Counties", "AL, Statewide"]
+    assert {jurisdictions.state_code(value) for value in raw} == {"AL"}
+    assert jurisdictions.state_code("U.S. Virgin Islands") == "VI"
+    assert jurisdictions.state_code("United States") == jurisdictions.NATIONAL_CODE
+    assert jurisdictions.state_code("Nowhere") is None
+    assert jurisdictions.parse_state_header("KANSAS | District ( F/M )") == ("KS", "District ( F/M )")
+
+
+def test_county_keys_collapse_spelling_variants():
+    same = ["St. John''s Parish", "Saint Johns", "ST JOHNS COUNTY"]
+    assert {jurisdictions.county_key(value) for value in same} == {"STJOHNS"}
+    assert jurisdictions.county_key("Doña Ana County") == jurisdictions.county_key("Dona Ana") == "DONAANA"
+    assert jurisdictions.county_key("Bedford City") != jurisdictions.county_key("Bedford")
+
+    assert jurisdictions.jurisdiction_county("Ashley and Hamburg District Court") == "Ashley"
+    assert jurisdictions.jurisdiction_county("Belknap + District") == "Belknap"
+    assert jurisdictions.jurisdiction_county("Lewis and Clark") == "Lewis and Clark"
+    assert jurisdictions.jurisdiction_county("AOC Statewide") is None
+
+    known = frozenset({"LEWISANDCLARK"})
+    assert jurisdictions.scope_counties("Lewis And Clark County", known) == ("LEWISANDCLARK",)
+    assert jurisdictions.scope_counties("Butts, Lamar & Monroe") == ("BUTTS", "LAMAR", "MONROE")
+
+
+def test_committed_datasets_join_on_exact_keys():
+    fees = pd.read_csv(PROJECT_ROOT / "data/pricing/informdata_court_access_fees.csv")
+    statewide = pd.read_csv(PROJECT_ROOT / "data/pricing/informdata_statewide.csv")
+    coverage = pd.read_csv(PROJECT_ROOT / "content/pricing/informdata_statewide_coverage.csv")
+
+    assert fees["state_code"].notna().all()
+    coverage_codes = set(jurisdictions.state_keys(coverage["state_code"]))
+    assert set(statewide["state_code"]) <= coverage_codes
+    assert set(fees["state_code"]) - {jurisdictions.NATIONAL_CODE} <= coverage_codes
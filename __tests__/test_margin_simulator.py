@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import margin_simulator
+import order_cost_engine
+import synthetic_data
+
+
+@pytest.fixture(scope="module")
+def inputs():
+    engine = order_cost_engine.OrderCostEngine.from_files()
+    packages = order_cost_engine.load_packages()
+    prices = margin_simulator.package_prices(packages, pd.read_csv(margin_simulator.PRICING_TABLE_PATH))
+    counts = {name: config.get("search_counts", {}) for name, config in packages.items()}
+    return engine, prices, counts
+
+
+def test_group_quantiles_match_numpy():
+    rng = np.random.default_rng(0)
+    groups = rng.integers(0, 4, size=1000)
+    values = rng.normal(size=1000)
+    out = margin_simulator.group_quantiles(groups, values, 5)
+    for group in range(4):
+        assert out[group] == pytest.approx(np.quantile(values[groups == group], margin_simulator.QUANTILES))
+    assert np.isnan(out[4]).all()
+
+
+def test_simulation_is_seeded_and_prices_statewide_once(inputs):
+    engine, prices, counts = inputs
+    mix = margin_simulator.county_mix(engine)
+    first = margin_simulator.simulate(engine, mix, prices, counts, orders=20_000, seed=11)
+    again = margin_simulator.simulate(engine, mix, prices, counts, orders=20_000, seed=11)
+    np.testing.assert_array_equal(first.margin, again.margin)
+
+    essential = first.package == first.packages.index("ESSENTIAL")
+    assert (first.searches[essential] == 0).all()
+    assert first.margin[essential] == pytest.approx(prices["ESSENTIAL"] - engine.package_cost["ESSENTIAL"])
+
+    # Every South Dakota county routes to the statewide repository -> one search per order
+    sd = margin_simulator.county_mix(engine, {key: 1.0 for key in engine.routes if key[0] == "SD" and key[1] != "*"})
+    sim = margin_simulator.simulate(engine, sd, prices, counts, orders=2_000, seed=3, packages=["PRO"])
+    assert set(sim.searches) == {1}
+    assert sim.search_cost == pytest.approx(np.full(2_000, engine.routes[("SD", "*")][1]))
+
+    report = margin_simulator.summarize(sim).set_index(["group_type", "group"])
+    assert report.loc[("state", "SD"), "orders"] == 2_000
+    assert report.loc[("package", "PRO"), "mean_search_cost"] == pytest.approx(engine.routes[("SD", "*")][1])
+
+
+def test_history_drives_mix_and_search_counts(tmp_path, inputs):
+    orders = pd.DataFrame({
+        "order_id": ["1", "2", "3"],
+        "package": ["PRO", "PRO", "ESSENTIAL"],
+        "addresses": ["TX:Harris;TX:Harris County;TX:Dallas", "TX:Harris", "AL:Jefferson"],
+    })
+    orders.to_csv(tmp_path / "orders.csv", index=False)
+    weights, counts = margin_simulator.history_distributions(tmp_path / "orders.csv")
+    assert weights == {("TX", "HARRIS"): 2.0, ("TX", "DALLAS"): 1.0, ("AL", "JEFFERSON"): 1.0}
+    assert counts == {"PRO": {2: 1.0, 1: 1.0}, "ESSENTIAL": {1: 1.0}}
+
+
+def test_history_round_trip_from_synthetic_orders(tmp_path, inputs):
+    engine, prices, counts = inputs
+    synthetic_data.order_histories(300, seed=5).to_csv(tmp_path / "orders.csv", index=False)
+    weights, observed = margin_simulator.history_distributions(tmp_path / "orders.csv")
+    mix = margin_simulator.county_mix(engine, weights)
+    sim = margin_simulator.simulate(engine, mix, prices, {**counts, **observed}, orders=5_000, seed=0)
+    assert sim.searches.max() <= synthetic_data.MAX_ADDRESSES
+    assert np.isfinite(sim.margin).all()
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import monitoring_projection
+
+
+@pytest.fixture(scope="module")
+def rates():
+    return monitoring_projection.monitoring_rates(pd.read_csv(monitoring_projection.PRICING_TABLE_PATH))
+
+
+def test_rates_cover_monitoring_services(rates):
+    assert set(rates.index) == {
+        "CRIMINAL_ACTIVITY_MONITORING",
+        "MED_EX_COMPLETE_MONITORING",
+        "MED_EX_PLUS_MONITORING",
+        "MED_EX_PRO_MONITORING",
+    }
+    # Criminal monitoring is pass-through: its vendor fee is reported as pass-through cost
+    assert rates.loc["CRIMINAL_ACTIVITY_MONITORING", "pass_through"] == rates.loc["CRIMINAL_ACTIVITY_MONITORING", "vendor"]
+    assert rates.loc["MED_EX_PLUS_MONITORING", "pass_through"] == 0.0
+
+
+def test_cohort_matrix_matches_closed_form(rates):
+    cohorts = pd.DataFrame({
+        "roster_id": ["A", "B", "C"],
+        "service_id": ["CRIMINAL_ACTIVITY_MONITORING", "MED_EX_PLUS_MONITORING", "CRIMINAL_ACTIVITY_MONITORING"],
+        "start_month": ["2026-01", "2026-03", "2026-02"],
+        "subjects": [1000, 200, 500],
+        "monthly_churn": [0.1, 0.0, 0.5],
+        "price": [None, 4.0, None],
+        "end_month": [None, "2026-04", None],
+    })
+    projection = monitoring_projection.project(cohorts, rates, months=6)
+    assert projection.months.astype(str).tolist()[:2] == ["2026-01", "2026-02"]
+
+    subjects = projection.metrics["active_subjects"]
+    np.testing.assert_allclose(subjects[0], 1000 * 0.9 ** np.arange(6))
+    np.testing.assert_allclose(subjects[1], [0, 0, 200, 200, 0, 0])
+    np.testing.assert_allclose(subjects[2], [0, 500, 250, 125, 62.5, 31.25])
+
+    revenue = projection.metrics["revenue"]
+    assert revenue[1, 2] == pytest.approx(800.0)
+    assert revenue[0, 0] == pytest.approx(1000 * rates.loc["CRIMINAL_ACTIVITY_MONITORING", "price"])
+
+    monthly = projection.monthly().set_index(["service_id", "month"])
+    expected = subjects[0, 1] + subjects[2, 1]
+    assert monthly.loc[("CRIMINAL_ACTIVITY_MONITORING", "2026-02"), "active_subjects"] == pytest.approx(expected, abs=1e-4)
+    assert monthly["margin"].sum() == pytest.approx(projection.rosters()["margin"].sum(), rel=1e-6)
+
+
+def test_rejects_non_monitoring_services(rates):
+    cohorts = pd.DataFrame({
+        "roster_id": ["A"], "service_id": ["SSN_TRACE"], "start_month": ["2026-01"], "subjects": [10], "monthly_churn": [0.0],
+    })
+    with pytest.raises(ValueError, match="SSN_TRACE"):
+        monitoring_projection.project(cohorts, rates)
@@ -0,0 +1,64 @@
+import json
+
+import pandas as pd
+import pytest
+
+import natcrim_backfill
+import synthetic_data
+
+
+def test_discovery_infers_dates_and_rejects_ambiguous_archives(tmp_path):
+    for name in ("InformData NatCrim Source List as of 10.3.25.xlsx", "informdata_natcrim_raw_2024-01-05.xlsx", "~$lock_2024-02-01.xlsx"):
+        (tmp_path / name).touch()
+    (tmp_path / "notes.txt").touch()
+
+    snapshots = natcrim_backfill.discover_workbooks([str(tmp_path)])
+    assert [(s.stamp, s.workbook.name) for s in snapshots] == [
+        ("2024-01-05", "informdata_natcrim_raw_2024-01-05.xlsx"),
+        ("2025-10-03", "InformData NatCrim Source List as of 10.3.25.xlsx"),
+    ]
+    assert len(natcrim_backfill.discover_workbooks([str(tmp_path / "*2024*.xlsx")])) == 1
+
+    (tmp_path / "natcrim_20251003.xlsx").touch()
+    with pytest.raises(ValueError, match="Two workbooks for snapshot 2025-10-03"):
+        natcrim_backfill.discover_workbooks([str(tmp_path)])
+    (tmp_path / "natcrim_20251003.xlsx").unlink()
+    (tmp_path / "latest.xlsx").touch()
+    with pytest.raises(ValueError, match="latest.xlsx"):
+        natcrim_backfill.discover_workbooks([str(tmp_path)])
+
+
+def test_parallel_backfill_writes_outputs_and_resumes_by_fingerprint(tmp_path):
+    archive, content, reports = tmp_path / "archive", tmp_path / "content", tmp_path / "reports"
+    for seed, stamp in ((1, "2024-01-05"), (2, "2024-04-05")):
+        synthetic_data.write_natcrim_workbook(synthetic_data.natcrim_source_list(0.02, seed), archive / f"natcrim_raw_{stamp}.xlsx")
+    snapshots = natcrim_backfill.discover_workbooks([str(archive)])
+
+    def run(**kwargs):
+        return natcrim_backfill.backfill(snapshots, 2, content_dir=content, reports_dir=reports, manifest_dir=reports / "backfill", **kwargs)
+
+    first = run()
+    assert [(r.stamp, r.status) for r in first] == [("2024-01-05", "done"), ("2024-04-05", "done")]
+    sources = pd.read_csv(content / "natcrim_sources_2024-04-05.csv")
+    assert len(sources) == first[1].sources == 241
+    assert (content / "natcrim_sources_2024-04-05").is_dir() and (content / "natcrim_sources_2024-04-05.parquet").is_file()
+    assert (reports / "natcrim_stale_sources_2024-01-05.csv").exists()
+    manifest = json.loads((reports / "backfill/natcrim_2024-01-05.json").read_text())
+    assert manifest["sources"] == first[0].sources and "sources_parquet" in manifest["outputs"]
+    assert not any((reports / "backfill/.staging").iterdir())
+
+    assert [r.status for r in run()] == ["skipped", "skipped"]
+    # A hand-edited output no longer matches its manifest, so only that snapshot reruns
+    sources.head(10).to_csv(content / "natcrim_sources_2024-04-05.csv", index=False)
+    assert [r.status for r in run()] == ["skipped", "done"]
+    assert len(pd.read_csv(content / "natcrim_sources_2024-04-05.csv")) == 241
+    assert [r.status for r in run(force=True)] == ["done", "done"]
+
+
+def test_pipeline_fingerprint_covers_every_module_the_refresh_imports():
+    inputs = natcrim_backfill.pipeline_inputs()
+    # frame_writer renders the CSVs; natcrim_preview is imported inside main()
+    for module in ("refresh_natcrim_data", "frame_writer", "natcrim_cube", "jurisdictions", "natcrim_preview"):
+        assert f"scripts/pricing/{module}.py" in inputs
+    assert "scripts/pricing/natcrim_backfill.py" not in inputs
+    assert "config/natcrim_scope_overrides.csv" in inputs
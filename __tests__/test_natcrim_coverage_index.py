@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+import natcrim_coverage_index
+
+
+UNIVERSE = pd.DataFrame({
+    "state": ["TX", "TX", "TX", "MT"],
+    "county_key": ["HARRIS", "DALLAS", "DEWITT", "LEWISANDCLARK"],
+    "county_name": ["Harris", "Dallas", "DeWitt", "Lewis and Clark"],
+})
+
+
+def _row(state, record_type, source, scope, refresh="2025-01-01"):
+    return {
+        "standardized_state": state,
+        "state_name": {"TX": "Texas", "MT": "Montana"}[state],
+        "record_type": record_type,
+        "source_name": source,
+        "coverage_scope": scope,
+        "refresh_date": refresh,
+        "record_count": 1,
+    }
+
+
+def _index():
+    rows = pd.DataFrame([
+        _row("TX", "COURT", "Harris County District Clerk", "Harris County"),
+        _row("TX", "DOC", "Texas DOC", "Harris", "2025-06-01"),
+        _row("TX", "COURT", "De Witt Courts", "De Witt & Dallas"),
+        _row("TX", "ARREST", "Texas DPS", "STATEWIDE"),
+        _row("TX", "COURT", "Typo Court", "Hariss"),
+        _row("MT", "COURT", "Lewis and Clark Justice", "Lewis And Clark County"),
+    ])
+    return natcrim_coverage_index.build_index(rows, UNIVERSE)
+
+
+def test_scopes_resolve_to_canonical_counties():
+    index = _index()
+    assert index.unresolved["coverage_scope"].tolist() == ["Hariss"]
+    assert index.covering_sources("TX:DEWITT") == ["De Witt Courts"]
+    assert index.covering_sources("MT:LEWISANDCLARK") == ["Lewis and Clark Justice"]
+    with pytest.raises(ValueError, match="Unknown county id"):
+        index.covering_sources("TX:NOWHERE")
+
+
+def test_set_queries_and_statewide_overlay():
+    index = _index()
+    ids = lambda positions: [index.county_ids[i] for i in positions]  # noqa: E731
+
+    assert ids(index.select(["TX"], has=["COURT"], lacks=["DOC"])) == ["TX:DALLAS", "TX:DEWITT"]
+    assert ids(index.select(["TX"], has=["COURT", "ARREST"])) == []
+    assert ids(index.select(["TX"], has=["COURT", "ARREST"], include_statewide=True)) == ["TX:DALLAS", "TX:DEWITT", "TX:HARRIS"]
+    assert ids(index.uncovered()) == []
+
+    frame = index.frame(index.select(["TX"], has=["DOC"])).iloc[0]
+    assert frame["record_types"] == "COURT,DOC"
+    assert frame["newest_doc"] == "2025-06-01"
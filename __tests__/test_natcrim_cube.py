@@ -0,0 +1,46 @@
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+import natcrim_cube
+import refresh_natcrim_data
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CONTENT_DIR = PROJECT_ROOT / "content/pricing"
+
+
+def _cube():
+    sources = pd.read_csv(CONTENT_DIR / "natcrim_sources_2025-10-03.csv")
+    scoped = refresh_natcrim_data.scope_dataframe(sources)
+    return scoped, natcrim_cube.build_cube(scoped, date(2025, 10, 3))
+
+
+def test_cube_rollups_reproduce_committed_totals():
+    _, cube = _cube()
+
+    state_totals = natcrim_cube.rollup(cube, ["standardized_state", "state_name"])
+    committed = pd.read_csv(CONTENT_DIR / "natcrim_state_totals_2025-10-03.csv")
+    pd.testing.assert_frame_equal(state_totals[committed.columns.tolist()], committed)
+
+    summary = natcrim_cube.rollup(cube, ["standardized_state", "state_name", "coverage_domain"])
+    committed = pd.read_csv(CONTENT_DIR / "natcrim_scope_summary_2025-10-03.csv")
+    summary = summary.rename(columns={"record_count": "total_records"})[committed.columns.tolist()]
+    pd.testing.assert_frame_equal(summary, committed)
+
+
+def test_distinct_source_counts_are_exact_across_slices(tmp_path):
+    scoped, cube = _cube()
+
+    expected = scoped.groupby("record_type")["source_name"].nunique()
+    rolled = natcrim_cube.rollup(cube, ["record_type"]).set_index("record_type")["source_count"]
+    assert rolled.to_dict() == expected.to_dict()
+
+    path = natcrim_cube.write_cube(cube, tmp_path / "cube.parquet")
+    restored = natcrim_cube.read_cube(path)
+    assert restored.attrs["reference_date"] == "2025-10-03"
+    stale = natcrim_cube.rollup(restored[restored["refresh_age"] == natcrim_cube.STALE_BUCKET], ["record_type"])
+    cutoff = pd.Timestamp(natcrim_cube.months_before(date(2025, 10, 3), 12))
+    stale_rows = scoped[pd.to_datetime(scoped["refresh_date"]) < cutoff]
+    assert stale.set_index("record_type")["row_count"].to_dict() == stale_rows["record_type"].value_counts().to_dict()
@@ -0,0 +1,44 @@
+import pandas as pd
+
+import natcrim_duplicates
+
+
+def _rows(names, scope="COUNTY"):
+    return pd.DataFrame({
+        "standardized_state": ["FL"] * len(names),
+        "record_type": ["COURT"] * len(names),
+        "source_name": names,
+        "coverage_scope": [scope] * len(names),
+        "record_count": range(len(names)),
+    })
+
+
+def test_exact_mask_matches_full_key_comparison():
+    df = _rows(["Alachua Court", "Alachua Court", "Leon Court", None, None])
+    mask = natcrim_duplicates.exact_duplicate_mask(df)
+    expected = df[natcrim_duplicates.DUPLICATE_KEY_COLUMNS].duplicated(keep=False)
+    assert mask.tolist() == expected.tolist() == [True, True, False, True, True]
+
+
+def test_near_duplicates_cluster_within_blocks_only():
+    df = _rows([
+        "St. Johns County Clerk Of Courts",
+        "St Johns  Co Clerk of the Courts",
+        "Duval County Clerk Of Courts",
+    ])
+    other_state = _rows(["St Johns County Clerk of Courts"]).assign(standardized_state="GA")
+    clusters = natcrim_duplicates.near_duplicate_clusters(pd.concat([df, other_state], ignore_index=True))
+
+    assert set(clusters["standardized_state"]) == {"FL"}
+    assert clusters["cluster_id"].nunique() == 1
+    assert set(clusters["source_name"]) == {"St. Johns County Clerk Of Courts", "St Johns  Co Clerk of the Courts"}
+    assert clusters["similarity"].tolist() == [1.0, 1.0]
+
+
+def test_fuzzy_threshold_controls_token_matches():
+    df = _rows(["Palm Beach County Clerk Of Courts", "Palm Beach Clerk Of Courts"])
+    assert natcrim_duplicates.near_duplicate_clusters(df).empty
+
+    report = natcrim_duplicates.duplicates_report(df, threshold=0.75)
+    assert set(report["match_type"]) == {"normalized", "fuzzy"}
+    assert report.loc[report["match_type"] == "fuzzy", "similarity"].tolist() == [0.8]
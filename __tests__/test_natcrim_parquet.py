@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import natcrim_parquet
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SOURCES_CSV = PROJECT_ROOT / "content/pricing/natcrim_sources_2025-10-03.csv"
+
+
+def _sources():
+    return pd.read_csv(SOURCES_CSV, dtype={"standardized_state": "string", "coverage_scope": "string", "refresh_date": "string"}, keep_default_na=False, na_values=[""])
+
+
+def test_dataset_round_trips_and_prunes_by_state_type_and_date(tmp_path):
+    sources = _sources()
+    path = natcrim_parquet.write_sources_dataset(sources, tmp_path / "sources.parquet", compression="snappy")
+
+    back = natcrim_parquet.read_sources_dataset(path)
+    key = natcrim_parquet.SOURCE_COLUMNS
+    expected = sources.sort_values(key, na_position="last").reset_index(drop=True)
+    pd.testing.assert_frame_equal(back.sort_values(key, na_position="last").reset_index(drop=True), expected, check_dtype=False)
+    assert back["standardized_state"].isna().sum() == sources["standardized_state"].isna().sum()
+
+    pruned = natcrim_parquet.read_sources_dataset(path, states=["TX"], record_types=["COURT"], refreshed_since="2025-01-01")
+    mask = (sources["standardized_state"] == "TX") & (sources["record_type"] == "COURT") & (sources["refresh_date"] >= "2025-01-01")
+    assert len(pruned) == int(mask.sum()) > 0
+
+
+def test_partition_files_carry_sorted_row_groups_with_statistics(tmp_path):
+    path = natcrim_parquet.write_sources_dataset(_sources(), tmp_path / "sources.parquet")
+    assert (path / "standardized_state=UNKNOWN").is_dir()
+
+    meta = pq.ParquetFile(path / "standardized_state=TX" / "part-0.parquet").metadata
+    names = [meta.schema.column(i).name for i in range(meta.num_columns)]
+    types = []
+    for i in range(meta.num_row_groups):
+        group = meta.row_group(i)
+        record_type = group.column(names.index("record_type"))
+        assert record_type.statistics.min == record_type.statistics.max
+        assert "ZSTD" in record_type.compression and "RLE_DICTIONARY" in record_type.encodings
+        assert group.column(names.index("refresh_date")).statistics.has_min_max
+        assert group.column(names.index("record_count")).statistics.has_min_max
+        types.append(record_type.statistics.min)
+    assert types == sorted(types) and len(set(types)) == len(types)
+
+    with pytest.raises(ValueError):
+        natcrim_parquet.write_sources_dataset(_sources(), tmp_path / "other.parquet", compression="lzma")
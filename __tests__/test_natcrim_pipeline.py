@@ -38,3 +38,27 @@ def test_domain_summary_contains_expected_buckets():
 
     expected = {"STATEWIDE", "DOC", "WARRANT", "SEX_OFFENDER", "COUNTY"}
     assert expected.issubset(domains), "Coverage domain summary missing expected buckets"
+
+
+def test_states_without_county_court_sources_are_flagged(tmp_path):
+    import refresh_natcrim_data
+
+    scoped = refresh_natcrim_data.scope_dataframe(pd.read_csv(PROJECT_ROOT / "content/pricing/natcrim_sources_2025-10-03.csv"))
+    outputs = refresh_natcrim_data.write_qa_reports(scoped, "2025-10-03", reports_dir=tmp_path)
+    section = outputs["coverage_report"].read_text().split("## States Lacking County-Level Coverage")[1].split("##")[0]
+    # MT, NH and WY only have county-scoped ARREST/DOC/SOR/WARRANT rows, which do not replace court research
+    flagged = [line.split(" ")[1] for line in section.splitlines() if line.startswith("| ") and "(" in line]
+    assert flagged == ["MT", "NH", "WY"]
+
+
+def test_qa_reports_are_dated_by_snapshot_not_run_date(tmp_path):
+    import refresh_natcrim_data
+    from natcrim_cube import STALE_BUCKET
+
+    scoped = refresh_natcrim_data.scope_dataframe(pd.read_csv(PROJECT_ROOT / "content/pricing/natcrim_sources_2025-10-03.csv"))
+    outputs = refresh_natcrim_data.write_qa_reports(scoped, "2025-10-03", reports_dir=tmp_path)
+    assert "- **Stale refresh threshold:** 2024-10-03" in outputs["coverage_report"].read_text()
+    stale = pd.read_csv(outputs["stale_report"])
+    cube = refresh_natcrim_data.build_cube(scoped, pd.Timestamp("2025-10-03").date())
+    assert len(stale) == cube.loc[cube["refresh_age"] == STALE_BUCKET, "row_count"].sum()
+    assert (pd.to_datetime(stale["refresh_date"]) < "2024-10-03").all()
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import natcrim_preview
+import refresh_natcrim_data
+import synthetic_data
+
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory):
+    raw = synthetic_data.natcrim_source_list(0.3, seed=4)
+    return raw, synthetic_data.write_natcrim_workbook(raw, tmp_path_factory.mktemp("preview") / "natcrim_raw_2025-10-03.xlsx")
+
+
+def test_stratified_estimate_brackets_the_full_refresh_totals(workbook):
+    raw, path = workbook
+    full = refresh_natcrim_data.clean_dataframe(refresh_natcrim_data.load_raw_dataframe(path))
+
+    preview = natcrim_preview.run_preview(path, per_stratum=5, expected_band=None)
+
+    assert preview.rows_scanned == len(raw) and preview.sampled < len(raw)
+    total = preview.total_records
+    assert total.low <= full["record_count"].sum() <= total.high
+    assert total.bound < 0.15 * total.value
+    # Stratum sizes are counted exactly, so source counts per type are not estimates
+    by_type = preview.by_record_type.set_index("record_type")["sources"]
+    assert by_type.to_dict() == full["record_type"].value_counts().to_dict()
+    assert preview.domains["estimated_sources"].sum() == pytest.approx(len(raw), abs=len(preview.domains))
+    assert not preview.problems
+
+
+def test_format_drift_fails_fast(tmp_path, workbook):
+    raw, path = workbook
+    shifted = tmp_path / "shifted.xlsx"
+    with pd.ExcelWriter(shifted) as writer:
+        raw.head(50).to_excel(writer, sheet_name="Source List", startrow=synthetic_data.NATCRIM_PREAMBLE_ROWS + 2, index=False)
+    with pytest.raises(ValueError, match="Header moved to row 11"):
+        natcrim_preview.run_preview(shifted)
+
+    renamed = synthetic_data.write_natcrim_workbook(raw.head(50).rename(columns={"Number of Records": "Records"}), tmp_path / "renamed.xlsx")
+    with pytest.raises(ValueError, match="Header drift on row 9"):
+        natcrim_preview.run_preview(renamed)
+
+    text_counts = raw.head(200).assign(**{"Number of Records": lambda df: df["Number of Records"].map("{:,} recs".format)})
+    preview = natcrim_preview.run_preview(synthetic_data.write_natcrim_workbook(text_counts, tmp_path / "text.xlsx"))
+    assert any("not numbers" in problem for problem in preview.problems)
+    assert any("outside the expected band" in problem for problem in preview.problems)
+
+    with pytest.raises(SystemExit, match="1"):
+        refresh_natcrim_data.main(["--source", str(path), "--preview", "--preview-expected-records", "1", "2", "--metrics-json", str(tmp_path / "m.json")])
+
+
+def test_refresh_preview_options_reach_run_preview(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_run_preview(source, per_stratum, seed, expected_band):
+        calls.append((per_stratum, seed, expected_band))
+        return SimpleNamespace(problems=[])
+
+    monkeypatch.setattr(natcrim_preview, "run_preview", fake_run_preview)
+    monkeypatch.setattr(natcrim_preview, "print_preview", lambda preview: None)
+    workbook = tmp_path / "raw.xlsx"
+    workbook.touch()
+    refresh_natcrim_data.main(["--source", str(workbook), "--preview", "--preview-seed", "7", "--metrics-json", str(tmp_path / "m.json")])
+    refresh_natcrim_data.main(["--source", str(workbook), "--preview", "--preview-per-stratum", "3", "--preview-expected-records", "1", "2", "--metrics-json", str(tmp_path / "m.json")])
+    assert calls == [
+        (natcrim_preview.DEFAULT_PER_STRATUM, 7, natcrim_preview.EXPECTED_RECORD_BAND),
+        (3, natcrim_preview.DEFAULT_SEED, (1, 2)),
+    ]
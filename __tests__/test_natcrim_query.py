@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import natcrim_parquet
+import natcrim_query
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATASET = PROJECT_ROOT / "content/pricing/natcrim_sources_2025-10-03"
+
+
+def test_pushed_down_filters_match_a_full_scan():
+    query = natcrim_query.make_query(
+        states=["Texas"],
+        record_types=["court"],
+        refreshed_since="2025-01-01",
+        min_records=1_000_000,
+        columns=["source_name", "refresh_date", "record_count"],
+    )
+    result = natcrim_query.run_query(query, DATASET, cache=False)
+
+    full = natcrim_parquet.read_sources_dataset(DATASET)
+    mask = (
+        (full["standardized_state"] == "TX")
+        & (full["record_type"] == "COURT")
+        & (full["refresh_date"] >= "2025-01-01")
+        & (full["record_count"] >= 1_000_000)
+    )
+    expected = full.loc[mask, ["source_name", "refresh_date", "record_count"]].reset_index(drop=True)
+    assert list(result.columns) == ["source_name", "refresh_date", "record_count"]
+    pd.testing.assert_frame_equal(result, expected)
+
+    county = natcrim_query.run_query(natcrim_query.make_query(coverage_domains=["COUNTY"], columns=["coverage_domain"]), DATASET, cache=False)
+    assert len(county) == int((full["coverage_domain"] == "COUNTY").sum())
+
+    with pytest.raises(ValueError):
+        natcrim_query.make_query(states=["Atlantis"])
+    with pytest.raises(ValueError):
+        natcrim_query.make_query(columns=["price"])
+
+
+def test_cache_serves_repeats_and_invalidates_on_rewrite(tmp_path):
+    sources = natcrim_parquet.read_sources_dataset(DATASET)
+    path = natcrim_parquet.write_sources_dataset(sources, tmp_path / "natcrim_sources_2025-10-03")
+    natcrim_query.clear_cache()
+    query = natcrim_query.make_query(states=["NJ"])
+
+    first = natcrim_query.run_query(query, path)
+    first.loc[:, "record_count"] = -1
+    assert (natcrim_query.run_query(query, path)["record_count"] >= 0).all()
+    assert natcrim_query.cache_info().hits == 1
+
+    natcrim_parquet.write_sources_dataset(sources[sources["standardized_state"] != "NJ"], path)
+    assert natcrim_query.run_query(query, path).empty
+    assert natcrim_query.latest_dataset(tmp_path) == path
@@ -0,0 +1,68 @@
+import json
+
+import pandas as pd
+
+import natcrim_reconcile
+
+
+LEGACY = pd.DataFrame({
+    "State": ["AK", "AK", "AK", "TX", "TX"],
+    "Record Type": ["SOR", "Court", "Court", "Court", "DOC"],
+    "Source Name": ["Alaska Sex Offender Registry", "Alaska Office of the Courts", "Alaska Office of the Courts", "Harris County", "Texas Dept of Corrections"],
+    "Coverage Level": ["", "", "Juneau", "Harris", ""],
+    "Last Refresh": ["2024-05-02 00:00:00"] * 5,
+    "Record Count": ["100", "5000", "40", "1000000", "200"],
+})
+NEW = pd.DataFrame({
+    "standardized_state": ["AK", "AK", "AK", "AK", "TX", "TX", None],
+    "state_name": ["Alaska"] * 4 + ["Texas", "Texas", None],
+    "record_type": ["SOR", "SOR", "COURT", "COURT", "COURT", "DOC", "SWL"],
+    "source_name": ["Alaska Sex Offender Registry", "Alaska Sex Offender Registry", "Alaska Office Of The Courts.", "Alaska Office Of The Courts.", "Harris County", "Texas Department Of Corrections", "Every Politician"],
+    "record_count": [100, 2, 5000, 40, 1000050, 200, 75],
+})
+
+
+def _status(report, level):
+    frame = report[report["level"] == level]
+    keys = [col for col in natcrim_reconcile.LEVELS[level] if col != "source_key"]
+    return {tuple(row[keys]): row["status"] for _, row in frame.iterrows()}
+
+
+def test_levels_align_normalized_keys_and_apply_tolerance():
+    legacy = LEGACY.rename(columns=natcrim_reconcile.LEGACY_SOURCE_COLUMNS)
+    report = natcrim_reconcile.reconcile(legacy, NEW, rel_tolerance=0.0001)
+
+    # Case, punctuation and "Dept"/"Department" differences still join
+    assert _status(report, "record_type") == {
+        ("AK", "SOR"): "mismatch",
+        ("AK", "COURT"): "match",
+        ("TX", "COURT"): "within_tolerance",
+        ("TX", "DOC"): "match",
+        ("UNKNOWN", "SWL"): "new_only",
+    }
+    sor = report[(report["level"] == "source") & (report["record_type"] == "SOR")].iloc[0]
+    assert (sor["record_delta"], sor["legacy_sources"], sor["new_sources"]) == (2, 1, 2)
+    assert report.loc[report["level"] == "source", "source_name"].tolist()[:2] == ["Alaska Sex Offender Registry", "Every Politician"]
+
+    strict = natcrim_reconcile.reconcile(legacy, NEW)
+    assert _status(strict, "state")[("TX",)] == "mismatch"
+    assert "totals" not in set(strict["level"])
+
+
+def test_run_writes_discrepancies_and_summary(tmp_path):
+    LEGACY.to_csv(tmp_path / "informdata_natcrim_sources_2025-10-03.csv", index=False)
+    NEW.to_csv(tmp_path / "natcrim_sources_2025-10-03.csv", index=False)
+    pd.DataFrame({"State": ["AK", "TX"], "Total Records": [5140, 1000200]}).to_csv(tmp_path / "informdata_natcrim_state_totals_2025-10-03.csv", index=False)
+    pd.DataFrame({"standardized_state": ["AK", "TX"], "state_name": ["Alaska", "Texas"], "record_count": [5142, 1000250]}).to_csv(tmp_path / "natcrim_state_totals_2025-10-03.csv", index=False)
+
+    outputs = natcrim_reconcile.run("2025-10-03", tmp_path, tmp_path / "reports", abs_tolerance=50)
+
+    summary = json.loads(outputs["summary"].read_text())["levels"]
+    assert summary["totals"] == {
+        "keys": 2, "mismatch": 0, "legacy_only": 0, "new_only": 0, "within_tolerance": 2, "match": 0,
+        "legacy_records": 1005340, "new_records": 1005392, "abs_record_delta": 52,
+    }
+    assert summary["source"]["new_only"] == 1 and summary["source"]["mismatch"] == 1
+    report = pd.read_csv(outputs["report"])
+    assert "match" not in set(report["status"])
+    assert report.iloc[0][["level", "state", "status"]].tolist() == ["totals", "TX", "within_tolerance"]
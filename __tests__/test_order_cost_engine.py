@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+import order_cost_engine
+import synthetic_data
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return order_cost_engine.OrderCostEngine.from_files()
+
+
+def test_orders_cost_one_search_per_jurisdiction(engine):
+    orders = pd.DataFrame({
+        "order_id": ["A", "B", "C", "D"],
+        "package": ["ESSENTIAL_COUNTY", "essential", "PRO", "UNKNOWN"],
+        "addresses": [
+            # Harris twice; both South Dakota counties route to its repository (one search)
+            "TX:Harris;Texas:Harris County;SD:Minnehaha;South Dakota:Pennington County;AZ:Maricopa",
+            "TX:Harris",
+            "TX:Nowhere;ZZ:Somewhere",
+            None,
+        ],
+    })
+    costed = engine.cost_orders(orders).set_index("order_id")
+
+    a = costed.loc["A"]
+    assert (a.county_searches, a.statewide_searches, a.unpriced_searches) == (2, 1, 0)
+    assert a.county_fee_cost == round(engine.routes[("TX", "HARRIS")][1] + engine.routes[("AZ", "MARICOPA")][1], 2)
+    assert a.statewide_cost == engine.routes[("SD", "*")][1]
+    assert a.total_cost == round(a.component_cost + a.county_fee_cost + a.statewide_cost, 2)
+
+    assert costed.loc["B", "county_searches"] == 0 and costed.loc["B", "total_cost"] == engine.package_cost["ESSENTIAL"]
+    assert costed.loc["C", "unpriced_searches"] == 2 and costed.loc["C", "total_cost"] == engine.package_cost["PRO"]
+    assert pd.isna(costed.loc["D", "total_cost"])
+
+
+def test_chunked_run_matches_single_pass(engine, tmp_path):
+    orders = synthetic_data.order_histories(500, seed=3)
+    orders_path = tmp_path / "orders.csv"
+    orders.to_csv(orders_path, index=False)
+
+    whole = order_cost_engine.run(orders_path, tmp_path / "whole.csv", None, engine, chunk_size=10_000)
+    chunked = order_cost_engine.run(orders_path, tmp_path / "chunked.csv", tmp_path / "summary.csv", engine, chunk_size=37)
+
+    assert (tmp_path / "whole.csv").read_bytes() == (tmp_path / "chunked.csv").read_bytes()
+    pd.testing.assert_frame_equal(whole, chunked)
+    assert chunked["orders"].sum() == 500
+    assert chunked["total_cost"].sum() == pytest.approx(pd.read_csv(tmp_path / "whole.csv")["total_cost"].sum())
@@ -0,0 +1,42 @@
+import gzip
+import json
+
+import pandas as pd
+
+import parse_natcrim_sources
+
+
+def _sources():
+    return pd.DataFrame(
+        {
+            "state": ["AK", "TX", None],
+            "jurisdiction": ["Court", None, "SWL"],
+            "source_name": ["Alaska Court System", "Texas DPS", "OFAC"],
+            "record_type": ["Other", "Other", "Other"],
+            "coverage_notes": ["", "Statewide", None],
+            "update_date": pd.to_datetime(["2025-07-16", None, "2024-01-02 03:04:05.250"], format="ISO8601"),
+        }
+    )
+
+
+def test_streamed_json_matches_indented_dump():
+    df = _sources()
+    records = parse_natcrim_sources.to_records(df)
+
+    assert records[1]["updated_at"] is None
+    assert records[2]["updated_at"] == "2024-01-02T03:04:05.250000"
+    streamed = "".join(parse_natcrim_sources.iter_encoded(df, "json", batch_size=2))
+    assert streamed == json.dumps(records, indent=2)
+
+
+def test_ndjson_and_gzip_variants(tmp_path):
+    df = _sources()
+    output = tmp_path / "sources.ndjson"
+
+    written = parse_natcrim_sources.write_records(df, output, "ndjson", ["gzip"])
+
+    assert written == [output, tmp_path / "sources.ndjson.gz"]
+    lines = output.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == parse_natcrim_sources.to_records(df)
+    with gzip.open(written[1], "rt") as fh:
+        assert fh.read() == output.read_text()
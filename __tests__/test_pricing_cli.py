@@ -0,0 +1,54 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+import pricing_cli
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+PROBE = (
+    "import sys; sys.path.insert(0, 'scripts/pricing'); import pricing_cli\n"
+    "try:\n    code = pricing_cli.main(sys.argv[1:])\nexcept SystemExit as exc:\n    code = exc.code\n"
+    "print('pandas' in sys.modules, code)"
+)
+
+
+def _probe(*argv):
+    result = subprocess.run([sys.executable, "-c", PROBE, *argv], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.splitlines()[-1]
+
+
+def test_help_usage_errors_and_validate_never_import_pandas(tmp_path):
+    assert _probe("--help") == "False 0"
+    assert _probe("extrct") == "False 2"
+    assert _probe("batch", "compute", "bogus --input x") == "False 2"
+    assert _probe(
+        "validate",
+        "--input", "data/pricing/samples/informdata_costs_sample.csv",
+        "--dataset-id", "base_costs",
+        "--metrics-json", str(tmp_path / "validate.json"),
+    ) == "False 0"
+
+
+def test_batch_runs_commands_in_one_process_and_stops_on_failure(tmp_path, capsys):
+    internal, table = tmp_path / "internal.csv", tmp_path / "table.csv"
+    compute = f"compute --input {PROJECT_ROOT / 'data/pricing/informdata_costs.csv'} --output {internal} --metrics-json {tmp_path / 'compute.json'}"
+    build = (
+        f"build --costs {PROJECT_ROOT / 'data/pricing/informdata_costs.csv'} --internal {internal}"
+        f" --competitor {PROJECT_ROOT / 'data/pricing/competitor_msps.csv'} --output {table} --metrics-json {tmp_path / 'build.json'}"
+    )
+    steps = tmp_path / "steps.txt"
+    steps.write_text(f"# nightly pricing\n{compute}\n\npricing {build}\n", encoding="utf-8")
+
+    assert pricing_cli.main(["batch", "--file", str(steps)]) == 0
+    assert set(pd.read_csv(internal)["service_id"]) <= set(pd.read_csv(table)["service_id"])
+
+    table.unlink()
+    missing = f"compute --input {tmp_path / 'missing.csv'} --output {internal}"
+    assert pricing_cli.main(["batch", missing, build]) == 1
+    assert not table.exists()
+    assert "skipped 1 remaining batch step(s)" in capsys.readouterr().out
+    assert pricing_cli.main(["batch", "--keep-going", missing, build]) == 1
+    assert table.exists()
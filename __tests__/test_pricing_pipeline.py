@@ -0,0 +1,36 @@
+import pandas as pd
+from pathlib import Path
+
+import build_pricing_table
+import compute_internal_pricing
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = PROJECT_ROOT / "data/pricing"
+
+
+def _in_memory_table():
+    costs = pd.read_csv(DATA_DIR / "informdata_costs.csv")
+    overrides = compute_internal_pricing.load_overrides(DATA_DIR / "internal_cost_overrides.json")
+    internal = compute_internal_pricing.compute_frame(costs, 0.0, "1.0.0", overrides)
+    competitor = pd.read_csv(DATA_DIR / "competitor_msps.csv")
+    return internal, build_pricing_table.build_frame(costs, internal, competitor)
+
+
+def test_compute_frame_returns_typed_columns():
+    internal, _ = _in_memory_table()
+
+    for col in build_pricing_table.INTERNAL_NUMERIC_COLUMNS:
+        assert internal[col].dtype == "float64", col
+    assert internal["pass_through"].dtype == bool
+
+
+def test_in_memory_handoff_matches_csv_round_trip():
+    internal, table = _in_memory_table()
+
+    committed_internal = pd.read_csv(DATA_DIR / "internal_pricing.csv")
+    pd.testing.assert_frame_equal(internal, committed_internal, check_dtype=False)
+
+    committed_table = pd.read_csv(PROJECT_ROOT / "content/pricing/informdata_pricing_table.csv")
+    round_tripped = pd.read_csv(pd.io.common.StringIO(table.to_csv(index=False)))
+    pd.testing.assert_frame_equal(round_tripped, committed_table)
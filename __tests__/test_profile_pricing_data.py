@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import profile_pricing_data as profiler
+
+
+def _sources(rng, n):
+    return pd.DataFrame({
+        "state": rng.choice(["TX", "OH", "KY", None], size=n, p=[0.5, 0.3, 0.15, 0.05]),
+        "source_name": [f"source-{i % 3000}" for i in range(n)],
+        "refresh_date": rng.choice(["2024-05-02", "2025-07-07", "2025-08-04"], size=n),
+        "record_count": rng.lognormal(6, 2, size=n).round().astype(int),
+    })
+
+
+def test_sketches_track_exact_statistics_within_error_bounds(tmp_path):
+    df = _sources(np.random.default_rng(7), 20_000)
+    path = tmp_path / "sources.csv"
+    df.to_csv(path, index=False)
+
+    profile = profiler.profile_file(path, "natcrim_sources", {}, chunk_size=3_000)
+    columns = {name: column.summary() for name, column in profile.columns.items()}
+
+    assert profile.rows == 20_000
+    assert [columns[name]["kind"] for name in df.columns] == ["text", "text", "date", "numeric"]
+    assert columns["state"]["nulls"] == df["state"].isna().sum()
+    assert columns["state"]["top_values"][0] == {"value": "TX", "count": (df["state"] == "TX").sum(), "max_error": 0}
+    assert abs(columns["source_name"]["distinct_estimate"] - 3000) < 3000 * 0.05
+    assert (columns["refresh_date"]["min"], columns["refresh_date"]["max"]) == ("2024-05-02", "2025-08-04")
+
+    counts = df["record_count"]
+    assert (columns["record_count"]["min"], columns["record_count"]["max"]) == (counts.min(), counts.max())
+    for key, q in (("p05", 0.05), ("p50", 0.5), ("p95", 0.95)):
+        # Rank error, not value error, is what the sketch bounds
+        rank = (counts <= columns["record_count"]["quantiles"][key]).mean()
+        assert abs(rank - q) < 0.01
+
+
+def test_merging_chunk_profiles_matches_a_single_pass(tmp_path):
+    df = _sources(np.random.default_rng(3), 6_000)
+    whole, first, second = tmp_path / "whole.csv", tmp_path / "part-1.csv", tmp_path / "part-2.csv"
+    df.to_csv(whole, index=False)
+    df.iloc[:2_500].to_csv(first, index=False)
+    df.iloc[2_500:].drop(columns="state").to_csv(second, index=False)
+
+    single = profiler.profile_file(whole, "sources", {})
+    saved = []
+    for part in (first, second):
+        out = profiler.write_profile(profiler.profile_file(part, "sources", {}), tmp_path / f"{part.stem}_profile.json")
+        saved.append(out)
+    merged = profiler.merge_profiles(saved)
+
+    assert merged.rows == single.rows and len(merged.sources) == 2
+    for name in ("source_name", "record_count", "refresh_date"):
+        left, right = merged.columns[name], single.columns[name]
+        np.testing.assert_array_equal(left.distinct.registers, right.distinct.registers)
+        assert (left.count, left.nulls, left.min, left.max) == (right.count, right.nulls, right.min, right.max)
+    # A column missing from one part counts that part's rows as nulls
+    assert merged.columns["state"].nulls == df["state"].iloc[:2_500].isna().sum() + 3_500
+    assert merged.columns["refresh_date"].summary()["top_values"] == single.columns["refresh_date"].summary()["top_values"]
+
+    with pytest.raises(ValueError, match="already folded"):
+        profiler.merge_profiles([saved[0], saved[0]])
+    assert json.loads(saved[0].read_text())["columns"]["record_count"]["sketch"]["quantiles"]["n"] == 2_500
+
+
+def test_schema_dtypes_override_inference_and_heavy_hitters_bound_error():
+    hitters = profiler.HeavyHitters(capacity=4)
+    hitters.update(pd.Series(["a"] * 50 + ["b"] * 30 + [f"rare-{i}" for i in range(40)], dtype="string"))
+    top = hitters.top(2)
+    assert [entry["value"] for entry in top] == ["a", "b"]
+    assert all(entry["count"] <= true <= entry["count"] + entry["max_error"] for entry, true in zip(top, (50, 30)))
+
+    profile = profiler.DatasetProfile("codes")
+    profile.update(pd.DataFrame({"zip": pd.Series(["01234", "99501", None], dtype="string")}), {"zip": "text"})
+    assert profile.columns["zip"].summary()["min"] == "01234"
+    assert profiler.infer_kind(pd.Series(["01234", "99501"], dtype="string")) == "numeric"
@@ -0,0 +1,50 @@
+import gzip
+import json
+
+import pandas as pd
+
+from publish_natcrim_shards import publish_shards
+
+
+def _sources(counts):
+    return pd.DataFrame(
+        {
+            "standardized_state": ["AK", "AK", "TX"],
+            "state_name": ["Alaska", "Alaska", "Texas"],
+            "source_name": ["Alaska Courts", "Alaska DOC", "Texas DPS"],
+            "record_type": ["COURT", "DOC", "COURT"],
+            "refresh_date": ["2025-09-01", "2025-08-01", "2025-07-15"],
+            "record_count": counts,
+        }
+    )
+
+
+def test_manifest_shards_and_index(tmp_path):
+    manifest_path = publish_shards(_sources([10, 5, 7]), tmp_path, "natcrim_sources", "2025-10-03")
+    manifest = json.loads(manifest_path.read_text())
+
+    assert set(manifest["shards"]) == {"AK", "TX"}
+    ak = manifest["shards"]["AK"]
+    payload = json.loads((tmp_path / ak["file"]).read_text())
+    assert payload["state"] == "AK" and len(payload["rows"]) == 2
+    assert gzip.decompress((tmp_path / f"{ak['file']}.gz").read_bytes()) == (tmp_path / ak["file"]).read_bytes()
+
+    index = json.loads((tmp_path / manifest["index"]["file"]).read_text())
+    assert index["rows"][0][:4] == ["AK", "Alaska", 2, 15]
+    assert index["summary"] == {
+        "rows": 3,
+        "sources": 3,
+        "record_types": [
+            {"record_type": "COURT", "rows": 2, "records": 17, "newest_refresh": "2025-09-01", "states": ["AK", "TX"]},
+            {"record_type": "DOC", "rows": 1, "records": 5, "newest_refresh": "2025-08-01", "states": ["AK"]},
+        ],
+    }
+
+
+def test_republish_only_rehashes_changed_states(tmp_path):
+    first = json.loads(publish_shards(_sources([10, 5, 7]), tmp_path, "natcrim_sources").read_text())
+    second = json.loads(publish_shards(_sources([10, 5, 8]), tmp_path, "natcrim_sources").read_text())
+
+    assert first["shards"]["AK"]["file"] == second["shards"]["AK"]["file"]
+    assert first["shards"]["TX"]["file"] != second["shards"]["TX"]["file"]
+    assert not (tmp_path / first["shards"]["TX"]["file"]).exists()
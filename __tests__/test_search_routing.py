@@ -0,0 +1,60 @@
+import pandas as pd
+
+import search_routing
+
+
+def _fees(rows):
+    return pd.DataFrame(rows, columns=["state", "jurisdiction", "process", "search_cost", "ten_year_surcharge", "court_fee", "access_fee", "state_code", "county_key"])
+
+
+def test_cheapest_compliant_route_per_county():
+    fees = _fees([
+        ["ALABAMA", "Autauga", "Auto FE", 0.0, 0.0, 1.65, 1.65, "AL", "AUTAUGA"],
+        ["ALABAMA", "Jefferson", "Auto FE", 0.0, 0.0, 3.0, 3.0, "AL", "JEFFERSON"],
+        ["ALABAMA", "Jefferson - Bessemer", "Vendor", 4.0, 1.5, 0.0, 0.0, "AL", "JEFFERSON"],
+        ["ARKANSAS", "Ashley", "Vendor", 9.0, 1.5, 0.0, 0.0, "AR", "ASHLEY"],
+        ["NEW HAMPSHIRE", "Belknap", "Processor", 4.9, 1.5, 6.5, 0.0, "NH", "BELKNAP"],
+        ["NEW HAMPSHIRE", "Belknap + District", "Processor", 4.9, 1.5, 13.0, 0.0, "NH", "BELKNAP"],
+        ["NEW HAMPSHIRE", "Laconia District Court", "Processor", 4.9, 1.5, 3.0, 0.0, "NH", "CARROLL"],
+        ["NEW HAMPSHIRE", "Conway District Court", "Processor", 4.9, 1.5, 2.0, 0.0, "NH", "CARROLL"],
+    ])
+    statewide = pd.DataFrame({
+        "service_id": ["STATEWIDE_CRIMINAL_AL", "STATEWIDE_CRIMINAL_AR", "DOMESTIC_CRIMINAL_AL"],
+        "state_code": ["AL", "AR", "AL"],
+        "informdata_cost": [2.55, 1.0, 1.45],
+    })
+    coverage = pd.DataFrame({
+        "state_code": ["US-AL", "US-AR"],
+        "statewide_recommended": ["Yes", "No"],
+        "source_cost_usd": [1.65, 0.0],
+    })
+    routing = search_routing.build_routing(fees, statewide, coverage).set_index(["state_code", "county_key"])
+
+    assert routing.loc[("AL", "AUTAUGA"), ["route", "route_cost"]].tolist() == ["county", 3.3]
+    # Jefferson's county row costs more than the compliant statewide search
+    assert routing.loc[("AL", "JEFFERSON"), ["route", "route_cost", "county_name"]].tolist() == ["statewide", 4.2, "Jefferson"]
+    # District add-on rows are optional: Belknap is priced from its plain row, not the sum with "Belknap + District"
+    assert routing.loc[("NH", "BELKNAP"), ["route_cost", "county_name"]].tolist() == [12.9, "Belknap"]
+    # Without a plain county row the cheapest court row prices the search
+    assert routing.loc[("NH", "CARROLL"), ["route_cost", "county_name"]].tolist() == [8.4, "Conway District Court"]
+    # Arkansas' repository is cheaper but not compliant
+    assert routing.loc[("AR", "ASHLEY"), "route"] == "county"
+    assert ("AR", "*") not in routing.index
+
+    routes = {key: (row.route, row.route_cost) for key, row in routing.iterrows()}
+    assert search_routing.lookup_route(routes, "AL", "BALDWIN") == ("statewide", 4.2)
+    assert search_routing.lookup_route(routes, "AR", "BOONE") is None
+
+    summary = search_routing.fee_summary(fees, routing.reset_index()).set_index("state")
+    assert summary.loc["ALABAMA", ["jurisdictions", "statewide_routed_counties", "county_routed_counties"]].tolist() == [3, 1, 1]
+    assert summary.loc["ALABAMA", "p50_total_fee"] == 5.5
+
+
+def test_committed_outputs_are_current():
+    fees = pd.read_csv(search_routing.FEES_PATH)
+    routing = search_routing.build_routing(fees, pd.read_csv(search_routing.STATEWIDE_PATH), pd.read_csv(search_routing.COVERAGE_PATH))
+    committed = pd.read_csv(search_routing.ROUTING_PATH, dtype={"county_key": str}, keep_default_na=False, na_values={"county_cost": [""], "statewide_cost": [""]})
+    pd.testing.assert_frame_equal(routing, committed, check_dtype=False)
+
+    summary = pd.read_csv(search_routing.SUMMARY_PATH)
+    pd.testing.assert_frame_equal(search_routing.fee_summary(fees, routing), summary, check_dtype=False)
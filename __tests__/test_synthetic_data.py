@@ -0,0 +1,27 @@
+import pandas as pd
+from pathlib import Path
+
+import extract_informdata_costs
+import refresh_natcrim_data
+import synthetic_data
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_court_fee_sheet_at_1x_round_trips_the_committed_schedule():
+    fees = extract_informdata_costs.normalize_court_fee_sheet(synthetic_data.court_fee_sheet(1))
+    committed = pd.read_csv(PROJECT_ROOT / "data/pricing/informdata_court_access_fees.csv")
+    pd.testing.assert_frame_equal(fees.reset_index(drop=True), committed)
+
+
+def test_scaled_source_list_keeps_volume_per_row():
+    raw = synthetic_data.natcrim_source_list(3).rename(columns=refresh_natcrim_data.RAW_COLUMNS)
+    raw["state_code"] = raw["state_code"].astype("string")
+    clean = refresh_natcrim_data.clean_dataframe(raw)
+
+    assert len(clean) == 3 * 12_061
+    seed_sources = pd.read_csv(synthetic_data.NATCRIM_SEED)["source_name"].nunique()
+    assert clean["source_name"].nunique() > seed_sources
+    # Record volume grows with the row count (~715M per 1x snapshot).
+    assert 1_800_000_000 <= clean["record_count"].sum() <= 2_600_000_000
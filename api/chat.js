@@ -2,6 +2,7 @@ import fs from 'fs';
 import path from 'path';
 import * as cheerio from 'cheerio';
 import { extractChunksFromHtml, tokenize } from '../utils/text-processing.js';
+import { loadRetrievalIndex, rankWithIndex } from '../utils/retrieval-index.js';
 import CHAT_CONFIG from '../config/chat.js';
 import { validateChatEnv } from '../utils/env-validation.js';
 
@@ -32,6 +33,9 @@ let chunksCache = null;
 let chunksCacheTimestamp = 0;
 const CACHE_TTL = 5 * 60 * 1000; // 5 minutes
 
+// Prebuilt retrieval index (undefined until first request, null if unavailable)
+let retrievalIndex;
+
 /**
  * Check if a client has exceeded rate limits
  * @param {string} identifier - Client identifier (typically IP address)
@@ -275,12 +279,26 @@ export default async function handler(request) {
   console.log(`[${requestId}] 💬 Query: "${q.substring(0, 100)}${q.length > 100 ? '...' : ''}"`);
 
 
-  // Build chunks (prefer cache, then prebuilt embeddings, then parse HTML)
+  // Prefer the prebuilt retrieval index; it is immutable per deployment, so no TTL
+  if (retrievalIndex === undefined) {
+    try {
+      retrievalIndex = loadRetrievalIndex(path.join(process.cwd(), CHAT_CONFIG.RETRIEVAL_INDEX_FILE));
+      if (retrievalIndex) {
+        console.log(`[${requestId}] 📚 Loaded retrieval index ${retrievalIndex.build_id} (${retrievalIndex.chunks.length} chunks)`);
+      }
+    } catch (err) {
+      console.error('Error loading retrieval index:', err);
+      retrievalIndex = null;
+    }
+  }
+
+  // Otherwise build chunks (prefer cache, then prebuilt embeddings, then parse HTML)
   let chunks = [];
   const now = Date.now();
 
-  // Check cache first
-  if (chunksCache && (now - chunksCacheTimestamp) < CACHE_TTL) {
+  if (retrievalIndex) {
+    chunks = retrievalIndex.chunks;
+  } else if (chunksCache && (now - chunksCacheTimestamp) < CACHE_TTL) {
     chunks = chunksCache;
     console.log(`[${requestId}] ⚡ Using cached chunks (${chunks.length} chunks)`);
   } else {
@@ -325,8 +343,10 @@ export default async function handler(request) {
     return json({ error: 'No documents available for retrieval.' }, 503);
   }
 
-  // Rank via TF-IDF
-  const ranked = tfidfRank(q, chunks).slice(0, CHAT_CONFIG.TOP_K_RESULTS);
+  // Rank via TF-IDF (postings lookup when the index is loaded)
+  const ranked = retrievalIndex
+    ? rankWithIndex(q, retrievalIndex, CHAT_CONFIG.TOP_K_RESULTS)
+    : tfidfRank(q, chunks).slice(0, CHAT_CONFIG.TOP_K_RESULTS);
   const top = ranked.map(({i,score}) => ({ ...chunks[i], score }));
 
   console.log(`[${requestId}] 🎯 Top chunks: ${top.map(c => `${c.url} (${c.score.toFixed(3)})`).join(', ')}`);
@@ -40,6 +40,15 @@ export default async function handler(request) {
       : 'No embeddings file (will parse HTML on-demand)'
   };
 
+  // Check for the prebuilt retrieval index (skips HTML parsing and indexing on cold start)
+  const hasIndex = fs.existsSync(path.join(process.cwd(), 'data', 'retrieval_index.json'));
+  checks.checks.retrievalIndex = {
+    status: hasIndex ? 'pass' : 'warn',
+    message: hasIndex
+      ? 'Retrieval index found (no HTML parsing at cold start)'
+      : 'No retrieval index (run scripts/pricing/build_retrieval_index.py)'
+  };
+
   // Check for HTML source files
   const pages = [
     'mvr_api.html',
@@ -0,0 +1,80 @@
+// Loader for the per-state NatCrim shards written by scripts/pricing/publish_natcrim_shards.py.
+// Usage:
+//   const shards = NatcrimShards('content/pricing/shards/natcrim_sources/');
+//   const totals = await shards.stateTotals();   // [{state, state_name, sources, records, rows, shard}]
+//   const summary = await shards.summary();      // {rows, sources, record_types: [{record_type, rows, records, newest_refresh, states}]}
+//   const rows = await shards.state('TX');       // [{standardized_state, record_type, ...}]
+//   const swl = await shards.recordType('SWL');  // rows of one record type, from only the shards that hold it
+//   const every = await shards.all();            // every shard; only for views that really show all states
+(function() {
+  function toObjects(payload) {
+    return payload.rows.map(row => {
+      const out = {};
+      payload.columns.forEach((col, i) => { out[col] = row[i]; });
+      return out;
+    });
+  }
+
+  function NatcrimShards(baseUrl) {
+    const base = baseUrl.endsWith('/') ? baseUrl : baseUrl + '/';
+    const cache = new Map();
+    let manifest = null;
+
+    async function getJson(url) {
+      if (!cache.has(url)) {
+        cache.set(url, fetch(url).then(res => {
+          if (!res.ok) throw new Error('Failed to load ' + url);
+          return res.json();
+        }));
+      }
+      return cache.get(url);
+    }
+
+    async function loadManifest() {
+      if (!manifest) {
+        manifest = fetch(base + 'manifest.json', { cache: 'no-cache' }).then(res => {
+          if (!res.ok) throw new Error('Failed to load ' + base + 'manifest.json');
+          return res.json();
+        });
+      }
+      return manifest;
+    }
+
+    async function loadIndex() {
+      const m = await loadManifest();
+      return getJson(base + m.index.file);
+    }
+
+    async function loadState(code) {
+      const m = await loadManifest();
+      const entry = m.shards[String(code).toUpperCase()];
+      if (!entry) return [];
+      return toObjects(await getJson(base + entry.file));
+    }
+
+    return {
+      manifest: loadManifest,
+      async stateTotals() {
+        return toObjects(await loadIndex());
+      },
+      async summary() {
+        return (await loadIndex()).summary || {};
+      },
+      state: loadState,
+      async recordType(type) {
+        const summary = (await loadIndex()).summary || {};
+        const entry = (summary.record_types || []).find(r => r.record_type === type);
+        if (!entry) return [];
+        const parts = await Promise.all(entry.states.map(loadState));
+        return parts.flat().filter(r => r.record_type === type);
+      },
+      async all() {
+        const m = await loadManifest();
+        const parts = await Promise.all(Object.keys(m.shards).sort().map(loadState));
+        return parts.flat();
+      },
+    };
+  }
+
+  window.NatcrimShards = NatcrimShards;
+})();
@@ -28,6 +28,7 @@ export const CHAT_CONFIG = {
 
   // Retrieval
   TOP_K_RESULTS: 6, // number of chunks to retrieve
+  RETRIEVAL_INDEX_FILE: 'data/retrieval_index.json', // built by scripts/pricing/build_retrieval_index.py
 
   // LLM settings
   GROK_MODEL: 'grok-4-latest',
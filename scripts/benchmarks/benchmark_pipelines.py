@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Benchmark the pricing and NatCrim pipeline stages on synthetic data at growing scales.
+
+Each stage runs against frames from ``synthetic_data`` (Excel I/O is left out
+so the numbers reflect our code, not openpyxl). Results are compared with the
+stored baseline and the run fails when a stage slows down by more than
+``--threshold``. A missing baseline only warns, unless ``--require-baseline``
+is given (as CI does), in which case it fails the run too.
+
+Usage:
+    python scripts/benchmarks/benchmark_pipelines.py --scales 10,100
+    python scripts/benchmarks/benchmark_pipelines.py --scales 10,100 --require-baseline
+    python scripts/benchmarks/benchmark_pipelines.py --scales 10,100,1000 --save-baseline
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / "scripts/pricing"))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts/validation"))
+
+import build_pricing_table  # noqa: E402
+import compute_internal_pricing  # noqa: E402
+import extract_informdata_costs  # noqa: E402
+import refresh_natcrim_data  # noqa: E402
+import synthetic_data  # noqa: E402
+import validate_pricing_data  # noqa: E402
+
+DEFAULT_BASELINE = PROJECT_ROOT / "reports/benchmarks/baseline.json"
+DEFAULT_THRESHOLD = 0.5
+OVERRIDES_PATH = PROJECT_ROOT / "data/pricing/internal_cost_overrides.json"
+INTERNAL_SCHEMA = PROJECT_ROOT / "docs/data_schemas/schemas/internal_pricing.schema.yaml"
+
+# A stage setup returns (rows processed, zero-arg callable to time).
+StageSetup = Callable[[float, Path], Tuple[int, Callable[[], Any]]]
+
+
+def _setup_clean(scale: float, workdir: Path) -> Tuple[int, Callable[[], Any]]:
+    raw = synthetic_data.natcrim_source_list(scale).rename(columns=refresh_natcrim_data.RAW_COLUMNS)
+    raw["state_code"] = raw["state_code"].astype("string")
+    return len(raw), lambda: refresh_natcrim_data.clean_dataframe(raw)
+
+
+def _setup_classify(scale: float, workdir: Path) -> Tuple[int, Callable[[], Any]]:
+    raw = synthetic_data.natcrim_source_list(scale).rename(columns=refresh_natcrim_data.RAW_COLUMNS)
+    raw["state_code"] = raw["state_code"].astype("string")
+    clean = refresh_natcrim_data.clean_dataframe(raw)
+    overrides = list(refresh_natcrim_data.load_overrides())
+    return len(clean), lambda: refresh_natcrim_data.classify_domains(clean, overrides)
+
+
+def _setup_court_fees(scale: float, workdir: Path) -> Tuple[int, Callable[[], Any]]:
+    sheet = synthetic_data.court_fee_sheet(scale)
+    return len(sheet), lambda: extract_informdata_costs.normalize_court_fee_sheet(sheet)
+
+
+def _setup_compute(scale: float, workdir: Path) -> Tuple[int, Callable[[], Any]]:
+    costs = synthetic_data.pricing_costs(scale)
+    overrides = compute_internal_pricing.load_overrides(OVERRIDES_PATH)
+    return len(costs), lambda: compute_internal_pricing.compute_frame(costs, 0.0, "1.0.0", overrides)
+
+
+def _setup_build(scale: float, workdir: Path) -> Tuple[int, Callable[[], Any]]:
+    costs = synthetic_data.pricing_costs(scale)
+    competitor = synthetic_data.competitor_msrps(costs)
+    overrides = compute_internal_pricing.load_overrides(OVERRIDES_PATH)
+    internal = compute_internal_pricing.compute_frame(costs, 0.0, "1.0.0", overrides)
+    return len(costs), lambda: build_pricing_table.build_frame(costs, internal, competitor)
+
+
+def _setup_validate(scale: float, workdir: Path) -> Tuple[int, Callable[[], Any]]:
+    rows = synthetic_data.internal_pricing_rows(scale)
+    csv_path = workdir / f"internal_pricing_{scale:g}x.csv"
+    rows.to_csv(csv_path, index=False)
+    schema = validate_pricing_data.load_schema(INTERNAL_SCHEMA, None)
+
+    def run() -> bool:
+        return validate_pricing_data.PricingValidator(schema).validate_file(csv_path)
+
+    return len(rows), run
+
+
+STAGES: Dict[str, StageSetup] = {
+    "clean_dataframe": _setup_clean,
+    "classify_domains": _setup_classify,
+    "extract_court_fees": _setup_court_fees,
+    "compute": _setup_compute,
+    "build": _setup_build,
+    "PricingValidator": _setup_validate,
+}
+
+
+def time_stage(fn: Callable[[], Any], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(stages: List[str], scales: List[float], repeat: int) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for stage in stages:
+            for scale in scales:
+                rows, fn = STAGES[stage](scale, workdir)
+                seconds = time_stage(fn, repeat if scale < 1000 else 1)
+                results.append({
+                    "stage": stage,
+                    "scale": scale,
+                    "rows": rows,
+                    "seconds": round(seconds, 6),
+                    "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+                })
+                print(f"[INFO] {stage:<20} {scale:>6g}x {rows:>12,} rows {seconds:>10.4f}s")
+    return results
+
+
+def scaling_exponents(results: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Fit time ~ rows^k between the smallest and largest scale per stage (k≈1 is linear)."""
+    exponents: Dict[str, float] = {}
+    by_stage: Dict[str, List[Dict[str, Any]]] = {}
+    for item in results:
+        by_stage.setdefault(item["stage"], []).append(item)
+    for stage, items in by_stage.items():
+        items = sorted(items, key=lambda r: r["rows"])
+        lo, hi = items[0], items[-1]
+        if hi["rows"] > lo["rows"] and lo["seconds"] > 0 and hi["seconds"] > 0:
+            exponents[stage] = round(math.log(hi["seconds"] / lo["seconds"]) / math.log(hi["rows"] / lo["rows"]), 3)
+    return exponents
+
+
+def _key(item: Dict[str, Any]) -> str:
+    return f"{item['stage']}@{item['scale']:g}x"
+
+
+def compare_to_baseline(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    regressions: List[str] = []
+    recorded = baseline.get("results", {})
+    for item in results:
+        previous = recorded.get(_key(item))
+        if not previous:
+            continue
+        limit = previous["seconds"] * (1 + threshold)
+        if item["seconds"] > limit:
+            regressions.append(
+                f"{_key(item)}: {item['seconds']:.4f}s vs baseline {previous['seconds']:.4f}s (+{threshold:.0%} allowed)"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pricing/NatCrim pipeline stages")
+    parser.add_argument("--scales", default="10,100", help="Comma-separated scale factors (default: 10,100)")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing repeats (scales >= 1000 run once)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown ratio before failing")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument(
+        "--require-baseline",
+        action="store_true",
+        help="Exit non-zero when the baseline file is missing (use in CI)",
+    )
+    parser.add_argument("--output", type=Path, help="Optional path for this run's results JSON")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = sorted(set(stages) - set(STAGES))
+    if unknown:
+        raise SystemExit(f"Unknown stages: {unknown}. Choose from {sorted(STAGES)}")
+    scales = [float(s) for s in args.scales.split(",") if s.strip()]
+
+    results = run_benchmarks(stages, scales, args.repeat)
+    exponents = scaling_exponents(results)
+    for stage, exponent in exponents.items():
+        print(f"[INFO] {stage:<20} scaling exponent {exponent:.2f} (1.0 = linear)")
+
+    payload = {
+        "results": {_key(item): item for item in results},
+        "scaling_exponents": exponents,
+        "python": sys.version.split()[0],
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"[INFO] wrote results to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"[INFO] saved baseline to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        if args.require_baseline:
+            sys.stderr.write(f"[ERROR] no baseline at {args.baseline}; run with --save-baseline to record one\n")
+            return 1
+        print(f"[WARN] no baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    regressions = compare_to_baseline(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+    for line in regressions:
+        sys.stderr.write(f"[ERROR] regression {line}\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Generate scaled synthetic inputs for the pricing and NatCrim pipelines.
+
+Every generator resamples the committed datasets so value distributions
+(states, record types, fee mixes, record counts) stay realistic, then mints
+new source names / jurisdictions so row counts grow by ``scale``.
+
+Usage:
+    python scripts/benchmarks/synthetic_data.py --scales 10,100 --output-dir /tmp/pricing-synth
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+NATCRIM_SEED = PROJECT_ROOT / "content/pricing/natcrim_sources_2025-10-03.csv"
+COURT_FEE_SEED = PROJECT_ROOT / "data/pricing/informdata_court_access_fees.csv"
+COSTS_SEED = PROJECT_ROOT / "data/pricing/informdata_costs.csv"
+COMPETITOR_SEED = PROJECT_ROOT / "data/pricing/competitor_msps.csv"
+INTERNAL_SAMPLE_SEED = PROJECT_ROOT / "data/pricing/samples/internal_pricing_sample.csv"
+PACKAGES_SEED = PROJECT_ROOT / "data/pricing/order_packages.json"
+
+EXCEL_MAX_ROWS = 1_048_576
+ORDERS_PER_SCALE = 1_000
+MAX_ADDRESSES = 5
+NATCRIM_PREAMBLE_ROWS = 8  # refresh_natcrim_data reads the Source List with header=8
+RAW_RECORD_TYPES = {"COURT": "Court", "ARREST": "Arrest", "WARRANT": "Warrant"}
+
+
+def _replicate(seed_df: pd.DataFrame, scale: float, rng: np.random.Generator) -> pd.DataFrame:
+    rows = max(1, int(round(len(seed_df) * scale)))
+    picks = rng.integers(0, len(seed_df), size=rows)
+    picks[: min(rows, len(seed_df))] = np.arange(min(rows, len(seed_df)))
+    out = seed_df.iloc[picks].reset_index(drop=True)
+    out["_replica"] = np.arange(rows) // len(seed_df)
+    return out
+
+
+def _suffix(values: pd.Series, replica: pd.Series, label: str) -> pd.Series:
+    suffix = (" " + label + " " + replica.astype(str)).where(replica > 0, "")
+    return values.astype(str) + suffix
+
+
+def natcrim_source_list(scale: float, seed: int = 0) -> pd.DataFrame:
+    """Raw "Source List" rows (workbook column names) at ``scale`` × the 2025-10-03 snapshot."""
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(NATCRIM_SEED)
+    df = _replicate(base, scale, rng)
+
+    scope = df["coverage_scope"].astype("object").where(df["coverage_scope"] != "STATEWIDE", None)
+    refresh = pd.to_datetime(df["refresh_date"], errors="coerce") + pd.to_timedelta(
+        rng.integers(-180, 1, size=len(df)), unit="D"
+    )
+    jitter = rng.lognormal(mean=-0.35**2 / 2, sigma=0.35, size=len(df))  # mean-preserving
+    counts = (df["record_count"].fillna(0).to_numpy() * jitter).round().astype("int64")
+
+    return pd.DataFrame(
+        {
+            "State": df["standardized_state"],
+            "Data Type": df["record_type"].map(lambda v: RAW_RECORD_TYPES.get(v, v)),
+            "Source Name": _suffix(df["source_name"], df["_replica"], "Division"),
+            "County/Jurisdiction": scope,
+            "Update Date": refresh,
+            "Number of Records": counts,
+        }
+    )
+
+
+def court_fee_sheet(scale: float, seed: int = 0) -> pd.DataFrame:
+    """Raw ClientCostsByProcessWithFees rows: a header row per state followed by its jurisdictions."""
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(COURT_FEE_SEED)
+    df = _replicate(base, scale, rng)
+    df["jurisdiction"] = _suffix(df["jurisdiction"], df["_replica"], "Annex")
+    fee_cols = ["search_cost", "ten_year_surcharge", "court_fee", "access_fee"]
+    df = df.sort_values(["state_header", "jurisdiction", "process"], kind="stable")
+
+    blocks: List[pd.DataFrame] = []
+    for header, group in df.groupby("state_header", sort=True):
+        blocks.append(pd.DataFrame({"Region": [header], "Process": [None]}))
+        blocks.append(
+            pd.DataFrame(
+                {
+                    "Region": group["jurisdiction"].to_numpy(),
+                    "Process": group["process"].to_numpy(),
+                    **{col: group[col].to_numpy() for col in fee_cols},
+                }
+            )
+        )
+    sheet = pd.concat(blocks, ignore_index=True)
+    return sheet.rename(
+        columns={
+            "search_cost": "Search Cost",
+            "ten_year_surcharge": "10 Year Surcharge",
+            "court_fee": "Court Fee",
+            "access_fee": "Access Fee",
+        }
+    )[["Region", "Process", "Search Cost", "10 Year Surcharge", "Court Fee", "Access Fee"]]
+
+
+def pricing_costs(scale: float, seed: int = 0) -> pd.DataFrame:
+    """``informdata_costs.csv``-shaped rows with unique service IDs."""
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(COSTS_SEED)
+    df = _replicate(base, scale, rng)
+    df["service_id"] = _suffix(df["service_id"], df["_replica"], "V").str.replace(" ", "_")
+    df["informdata_cost"] = (df["informdata_cost"] * rng.uniform(0.9, 1.1, size=len(df))).round(2)
+    return df.drop(columns="_replica")
+
+
+def competitor_msrps(costs: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """Competitor MSRP rows keyed to the synthetic ``costs`` service IDs."""
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(COMPETITOR_SEED)
+    picks = rng.integers(0, len(base), size=len(costs))
+    df = base.iloc[picks].reset_index(drop=True)
+    df["service_id"] = costs["service_id"].to_numpy()
+    df["msrp_amount"] = (df["msrp_amount"] * rng.uniform(0.9, 1.1, size=len(df))).round(2)
+    return df
+
+
+def internal_pricing_rows(scale: float, seed: int = 0) -> pd.DataFrame:
+    """Rows that satisfy ``internal_pricing.schema.yaml`` so the validator walks every rule."""
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(INTERNAL_SAMPLE_SEED, dtype=str, keep_default_na=False)
+    target_rows = scale * len(pd.read_csv(COSTS_SEED, usecols=["service_id"]))
+    df = _replicate(base, target_rows / len(base), rng)
+    df["service_id"] = _suffix(df["service_id"], df["_replica"], "V").str.replace(" ", "_")
+    return df.drop(columns="_replica")
+
+
+def order_histories(orders: int, seed: int = 0) -> pd.DataFrame:
+    """``order_cost_engine`` input: packages from the package config, 1-5 fee-sheet counties per order.
+
+    A tenth of the address entries repeat an earlier county and county names
+    are occasionally written with a ``County`` suffix, as real histories are.
+    """
+    import json
+
+    rng = np.random.default_rng(seed)
+    packages = sorted(json.loads(PACKAGES_SEED.read_text(encoding="utf-8"))["packages"])
+    fees = pd.read_csv(COURT_FEE_SEED, usecols=["state_code", "jurisdiction", "county_key"]).dropna()
+    counties = (fees["state_code"] + ":" + fees["jurisdiction"]).to_numpy(dtype=object)
+    suffixed = (fees["state_code"] + ":" + fees["jurisdiction"] + " County").to_numpy(dtype=object)
+
+    lengths = rng.integers(1, MAX_ADDRESSES + 1, size=orders)
+    picks = rng.integers(0, len(counties), size=(orders, MAX_ADDRESSES))
+    repeat = rng.random(picks.shape) < 0.1
+    picks[repeat] = np.broadcast_to(picks[:, :1], picks.shape)[repeat]
+    tokens = np.where(rng.random(picks.shape) < 0.2, suffixed[picks], counties[picks])
+    tokens[np.arange(MAX_ADDRESSES) >= lengths[:, None]] = ""
+    columns = [pd.Series(tokens[:, i]) for i in range(MAX_ADDRESSES)]
+    addresses = columns[0].str.cat(columns[1:], sep=";").str.rstrip(";")
+
+    return pd.DataFrame({
+        "order_id": [f"O{number:09d}" for number in range(orders)],
+        "package": np.asarray(packages, dtype=object)[rng.integers(0, len(packages), size=orders)],
+        "addresses": addresses.to_numpy(),
+    })
+
+
+def write_natcrim_workbook(df: pd.DataFrame, path: Path) -> Path:
+    if len(df) + NATCRIM_PREAMBLE_ROWS + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f"{len(df):,} rows exceed the Excel sheet limit")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with pd.ExcelWriter(path) as writer:
+        df.to_excel(writer, sheet_name="Source List", startrow=NATCRIM_PREAMBLE_ROWS, index=False)
+    return path
+
+
+def write_court_fee_workbook(df: pd.DataFrame, path: Path) -> Path:
+    if len(df) + 2 > EXCEL_MAX_ROWS:
+        raise ValueError(f"{len(df):,} rows exceed the Excel sheet limit")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with pd.ExcelWriter(path) as writer:
+        df.to_excel(writer, startrow=1, index=False)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate scaled synthetic pricing/NatCrim inputs")
+    parser.add_argument("--scales", default="10,100", help="Comma-separated scale factors (default: 10,100)")
+    parser.add_argument("--output-dir", type=Path, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for scale in [float(s) for s in args.scales.split(",") if s.strip()]:
+        label = f"{scale:g}x"
+        out_dir = args.output_dir / label
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        costs = pricing_costs(scale, args.seed)
+        costs.to_csv(out_dir / "informdata_costs.csv", index=False)
+        competitor_msrps(costs, args.seed).to_csv(out_dir / "competitor_msps.csv", index=False)
+        internal_pricing_rows(scale, args.seed).to_csv(out_dir / "internal_pricing_sample.csv", index=False)
+        order_histories(int(scale * ORDERS_PER_SCALE), args.seed).to_csv(out_dir / "orders.csv", index=False)
+
+        for name, frame, writer in (
+            ("natcrim_source_list.xlsx", natcrim_source_list(scale, args.seed), write_natcrim_workbook),
+            ("court_fees.xlsx", court_fee_sheet(scale, args.seed), write_court_fee_workbook),
+        ):
+            try:
+                writer(frame, out_dir / name)
+            except ValueError as exc:
+                print(f"[WARN] skipped {label}/{name}: {exc}")
+        print(f"[INFO] wrote synthetic inputs to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
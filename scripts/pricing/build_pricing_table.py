@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Sequence
 
 import pandas as pd
 
+from frame_writer import log_written, write_frame
+from instrumentation import add_instrumentation_args, instrumented_run, span
+
 USE_CASES: Dict[str, str] = {
     "ESSENTIAL_CHECK": "Pre-employment screening bundle covering SSN trace, national criminal, and sex offender search—mirrors Checkr Basic+ for volume hiring funnels.",
     "SOR_PLUS": "Standalone sex offender registry search for regulated industries (childcare, education, healthcare).",
@@ -86,23 +88,34 @@ def pricing_note(row: pd.Series) -> str:
     return "Recommended price maintains ≥$1 contribution while positioning slightly under competitor MSRP."
 
 
-def build(cost_path: Path, internal_path: Path, competitor_path: Path, output_path: Path) -> None:
-    cost_df = pd.read_csv(cost_path).rename(columns={"notes": "cost_notes"})
-    internal_df = pd.read_csv(internal_path)
-    competitor_df = pd.read_csv(competitor_path)
+INTERNAL_NUMERIC_COLUMNS = [
+    "automation_spend",
+    "platform_overhead",
+    "pass_through_cost",
+    "internal_cost",
+    "total_cost",
+]
 
-    numeric_cols = [
-        "automation_spend",
-        "platform_overhead",
-        "pass_through_cost",
-        "internal_cost",
-        "total_cost",
-    ]
-    for col in numeric_cols:
+
+def load_internal(internal_path: Path) -> pd.DataFrame:
+    """Read ``internal_pricing.csv`` and repair the dtypes lost in the CSV round trip."""
+    internal_df = pd.read_csv(internal_path)
+    for col in INTERNAL_NUMERIC_COLUMNS:
         if col in internal_df.columns:
             internal_df[col] = internal_df[col].fillna(0.0).astype(float)
     if "pass_through" in internal_df.columns:
         internal_df["pass_through"] = internal_df["pass_through"].fillna(False).astype(bool)
+    return internal_df
+
+
+def build_frame(cost_df: pd.DataFrame, internal_df: pd.DataFrame, competitor_df: pd.DataFrame) -> pd.DataFrame:
+    """Merge typed cost, internal and competitor frames into the sales pricing table.
+
+    ``internal_df`` is expected to carry float cost columns and a bool
+    ``pass_through`` column, as produced by ``compute_internal_pricing.compute_frame``
+    or ``load_internal``.
+    """
+    cost_df = cost_df.rename(columns={"notes": "cost_notes"})
 
     internal_subset = internal_df[[
         "service_id",
@@ -222,25 +235,36 @@ def build(cost_path: Path, internal_path: Path, competitor_path: Path, output_pa
     ]
     merged = merged[columns]
     merged.sort_values("service_id", inplace=True)
+    return merged
+
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    merged.to_csv(output_path, index=False)
-    print(f"[INFO] wrote {len(merged)} rows to {output_path}")
+def write_table(merged: pd.DataFrame, output_path: Path) -> None:
+    with span("write", rows_in=len(merged)):
+        log_written(write_frame(merged, {"csv": output_path, "json": output_path.with_suffix(".json")}))
 
-    records = json.loads(merged.to_json(orient="records"))
-    json_output = output_path.with_suffix(".json")
-    json_output.write_text(json.dumps(records, indent=2))
-    print(f"[INFO] wrote {len(records)} rows to {json_output}")
+
+def build(cost_path: Path, internal_path: Path, competitor_path: Path, output_path: Path) -> None:
+    with span("load") as load_span:
+        cost_df = pd.read_csv(cost_path)
+        internal_df = load_internal(internal_path)
+        competitor_df = pd.read_csv(competitor_path)
+        load_span.rows_out = len(cost_df)
+    with span("build", rows_in=len(cost_df)) as build_span:
+        merged = build_frame(cost_df, internal_df, competitor_df)
+        build_span.rows_out = len(merged)
+    write_table(merged, output_path)
 
 
-def main() -> None:
+def main(argv: Optional[Sequence[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Build consolidated pricing table")
     parser.add_argument("--costs", type=Path, default=Path("data/pricing/informdata_costs.csv"))
     parser.add_argument("--internal", type=Path, default=Path("data/pricing/internal_pricing.csv"))
     parser.add_argument("--competitor", type=Path, default=Path("data/pricing/competitor_msps.csv"))
     parser.add_argument("--output", type=Path, default=Path("content/pricing/informdata_pricing_table.csv"))
-    args = parser.parse_args()
-    build(args.costs, args.internal, args.competitor, args.output)
+    add_instrumentation_args(parser)
+    args = parser.parse_args(argv)
+    with instrumented_run("build_pricing_table", args.metrics_json, args.profile):
+        build(args.costs, args.internal, args.competitor, args.output)
 
 
 if __name__ == "__main__":
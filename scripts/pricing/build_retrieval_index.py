@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""Build the precomputed retrieval index the chat endpoint loads at cold start.
+
+``api/chat.js`` used to parse the site pages with cheerio, chunk them and
+recompute TF-IDF weights over every chunk for each query. This stage does all
+of that offline and writes ``data/retrieval_index.json``. The file holds:
+
+* ``chunks``: url/heading/text for every chunk of the site pages
+  (``config/chat.js`` PAGES, chunked like ``utils/text-processing.js``),
+  plus one chunk per pricing-table service, statewide coverage row and
+  county fee summary state from ``content/pricing``;
+* ``dictionary``: sorted stemmed tokens; ``idf`` holds their IDF weights
+  (``log(1 + N / (df + 1))``, as in chat.js). ``postings[t]`` is a flat
+  ``[chunk, tf, chunk, tf, ...]`` list;
+* ``norms``: the TF-IDF vector norm of each chunk, so cosine scores only
+  need the query's postings;
+* ``pricing``: per-service facts from ``informdata_pricing_table.json``.
+
+Tokenization is a port of ``tokenize()`` in ``utils/text-processing.js``
+(same stopwords and suffix stemmer), so query tokens computed in JS look up
+directly. ``format`` is bumped when the layout changes. ``build_id`` hashes
+the content and ``sources`` records the sha256 of every input file; the file
+is left untouched only when both match what is already on disk.
+
+Usage:
+    python scripts/pricing/build_retrieval_index.py [--output data/retrieval_index.json]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from instrumentation import add_instrumentation_args, instrumented_run, span
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CHAT_CONFIG_PATH = PROJECT_ROOT / "config/chat.js"
+CONTENT_DIR = PROJECT_ROOT / "content/pricing"
+PRICING_TABLE_PATH = CONTENT_DIR / "informdata_pricing_table.json"
+COVERAGE_PATH = CONTENT_DIR / "informdata_statewide_coverage.csv"
+FEE_SUMMARY_PATH = CONTENT_DIR / "county_fee_summary.csv"
+INDEX_PATH = PROJECT_ROOT / "data/retrieval_index.json"
+
+INDEX_FORMAT = 1
+CHUNK_LENGTH = 1000
+MIN_CHUNK_LENGTH = 200
+FACT_FIELDS = [
+    "service_name",
+    "category",
+    "unit",
+    "recommended_price",
+    "total_cost",
+    "informdata_cost",
+    "currency",
+    "pass_through",
+    "competitor_name",
+    "msrp_amount",
+]
+
+# Mirrors utils/text-processing.js
+STOPWORDS = frozenset(
+    """a about above after again against all am an and any are aren't as at
+    be because been before being below between both but by can't cannot could
+    couldn't did didn't do does doesn't doing don't down during each few for
+    from further had hadn't has hasn't have haven't having he he'd he'll he's
+    her here here's hers herself him himself his how how's i i'd i'll i'm i've
+    if in into is isn't it it's its itself let's me more most mustn't my myself
+    no nor not of off on once only or other ought our ours ourselves out over
+    own same shan't she she'd she'll she's should shouldn't so some such than
+    that that's the their theirs them themselves then there there's these they
+    they'd they'll they're they've this those through to too under until up
+    very was wasn't we we'd we'll we're we've were weren't what what's when
+    when's where where's which while who who's whom why why's with won't would
+    wouldn't you you'd you'll you're you've your yours yourself yourselves""".split()
+)
+SUFFIXES = [
+    ("ational", "ate"),
+    ("iveness", "ive"),
+    ("fulness", "ful"),
+    ("ousness", "ous"),
+    ("ization", "ize"),
+    ("alism", "al"),
+    ("ement", ""),
+    ("ments", "ment"),
+    ("ness", ""),
+    ("ing", ""),
+    ("ies", "y"),
+    ("ied", "y"),
+    ("ism", ""),
+    ("ist", ""),
+    ("ers", "er"),
+    ("ed", ""),
+    ("es", "e"),
+    ("s", ""),
+    ("ly", ""),
+]
+_NON_TOKEN = re.compile(r"[^a-z0-9\s]")
+_SENTENCE_END = re.compile(r"[.!?]\s")
+_WHITESPACE = re.compile(r"\s+")
+
+Chunk = Dict[str, str]
+
+
+def stem(word: str) -> str:
+    if len(word) <= 3:
+        return word
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix):
+            stemmed = word[: -len(suffix)] + replacement
+            if len(stemmed) >= 3:
+                return stemmed
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    words = _NON_TOKEN.sub(" ", text.lower()).split()
+    return [stem(word) for word in words if len(word) >= 2 and word not in STOPWORDS]
+
+
+def chunk_text(text: str, max_len: int = CHUNK_LENGTH, min_chunk_len: int = MIN_CHUNK_LENGTH) -> List[str]:
+    """Split at the last sentence end past ``min_chunk_len`` within each ``max_len`` window (``chunkText`` in JS)."""
+    chunks: List[str] = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + max_len)
+        if end < len(text):
+            matches = list(_SENTENCE_END.finditer(text, start, end))
+            if matches and matches[-1].start() - start > min_chunk_len:
+                end = matches[-1].start() + 1
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end
+    return chunks
+
+
+class _SectionParser(HTMLParser):
+    """Collect ``(heading, text)`` sections: h1-h3 open a section, p/li/table text is appended to it."""
+
+    HEADINGS = {"h1", "h2", "h3"}
+    BLOCKS = {"p", "li", "table"}
+    SKIP = {"script", "style", "template"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.sections: List[List[str]] = []
+        self.title = ""
+        self.first_h1 = ""
+        self._buffer: Optional[List[str]] = None
+        self._capture: Optional[str] = None
+        self._skip = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag in self.SKIP:
+            self._skip += 1
+        elif tag == "title":
+            self._in_title = True
+        elif self._capture is None and (tag in self.HEADINGS or tag in self.BLOCKS):
+            self._capture, self._buffer = tag, []
+        elif self._buffer is not None:
+            # Cell and line boundaries become spaces so table cells do not run together
+            self._buffer.append(" ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.SKIP:
+            self._skip = max(self._skip - 1, 0)
+        elif tag == "title":
+            self._in_title = False
+        elif tag == self._capture and self._buffer is not None:
+            text = _WHITESPACE.sub(" ", "".join(self._buffer)).strip()
+            if tag in self.HEADINGS:
+                self.sections.append([text, ""])
+                if tag == "h1" and not self.first_h1:
+                    self.first_h1 = text
+            elif text:
+                if not self.sections:
+                    self.sections.append(["", ""])
+                section = self.sections[-1]
+                section[1] = f"{section[1]} {text}" if section[1] else text
+            self._capture, self._buffer = None, None
+
+    def handle_data(self, data: str) -> None:
+        if self._skip:
+            return
+        if self._in_title:
+            self.title += data
+        elif self._buffer is not None:
+            self._buffer.append(data)
+
+
+def html_chunks(html: str, url: str, max_len: int = CHUNK_LENGTH) -> List[Chunk]:
+    """Chunks of one page, headed like ``extractChunksFromHtml`` (first h1, else <title>, else the url)."""
+    parser = _SectionParser()
+    parser.feed(html)
+    parser.close()
+    fallback = parser.first_h1 or parser.title.strip() or url
+    return [
+        {"url": url, "heading": heading or fallback, "text": chunk}
+        for heading, text in parser.sections
+        for chunk in chunk_text(text, max_len)
+    ]
+
+
+def site_pages(config_path: Path = CHAT_CONFIG_PATH) -> List[str]:
+    """``PAGES`` from ``config/chat.js`` so the index covers the same pages as the endpoint."""
+    source = config_path.read_text(encoding="utf-8")
+    match = re.search(r"PAGES:\s*\[(.*?)\]", source, re.S)
+    if not match:
+        raise ValueError(f"No PAGES list in {config_path}")
+    return re.findall(r"['\"]([^'\"]+\.html)['\"]", match.group(1))
+
+
+def _money(value: Any) -> str:
+    return "n/a" if value is None or pd.isna(value) else f"${float(value):,.2f}"
+
+
+def pricing_chunks(table: List[Dict[str, Any]], url: str) -> List[Chunk]:
+    chunks = []
+    for row in table:
+        parts = [
+            f"{row['service_name']} ({row['service_id']}), {row.get('category') or 'Service'}.",
+            f"Recommended price {_money(row.get('recommended_price'))} {str(row.get('unit') or '').replace('_', ' ')};"
+            f" total cost {_money(row.get('total_cost'))}, InformData cost {_money(row.get('informdata_cost'))}.",
+        ]
+        if row.get("competitor_name"):
+            parts.append(f"Competitor {row['competitor_name']} {row.get('analogous_service_name') or ''} MSRP {_money(row.get('msrp_amount'))}.")
+        for label, key in (("Use cases", "use_cases"), ("Compliance", "compliance_notes"), ("Notes", "pricing_notes")):
+            if row.get(key):
+                parts.append(f"{label}: {row[key]}")
+        chunks.append({"url": url, "heading": f"Pricing – {row['service_name']}", "text": " ".join(parts)})
+    return chunks
+
+
+def coverage_chunks(coverage: pd.DataFrame, url: str) -> List[Chunk]:
+    chunks = []
+    for row in coverage.itertuples(index=False):
+        recommended = "recommended" if str(row.statewide_recommended).strip().upper() == "YES" else "not recommended"
+        text = (
+            f"{row.state_name} ({str(row.state_code).replace('US-', '')}) statewide criminal search is {recommended}: "
+            f"{row.recommended_method}. Repository: {row.repository}; courts: {row.courts_sourced}; "
+            f"source cost {_money(row.source_cost_usd)}; {row.details}; performed by {row.performed_by}."
+        )
+        chunks.append({"url": url, "heading": f"Statewide vs county – {row.state_name}", "text": text})
+    return chunks
+
+
+def fee_summary_chunks(summary: pd.DataFrame, url: str) -> List[Chunk]:
+    chunks = []
+    for row in summary.itertuples(index=False):
+        state = str(row.state).title()
+        text = (
+            f"{state} court fees across {row.jurisdictions} jurisdictions: median total fee {_money(row.p50_total_fee)} "
+            f"(p90 {_money(row.p90_total_fee)}), average court fee {_money(row.avg_court_fee)}, average access fee "
+            f"{_money(row.avg_access_fee)}. {row.statewide_routed_counties} counties route to the statewide search "
+            f"({_money(row.statewide_cost)}), {row.county_routed_counties} to county searches."
+        )
+        chunks.append({"url": url, "heading": f"County fees – {state}", "text": text})
+    return chunks
+
+
+def pricing_facts(table: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    def clean(value: Any) -> Any:
+        return None if isinstance(value, float) and math.isnan(value) else value
+
+    return {row["service_id"]: {field: clean(row.get(field)) for field in FACT_FIELDS} for row in table}
+
+
+def build_index(chunks: List[Chunk]) -> Dict[str, Any]:
+    """Dictionary, IDF weights, postings and chunk norms over ``chunks``."""
+    counts = [Counter(tokenize(chunk["text"])) for chunk in chunks]
+    df: Counter = Counter()
+    for tokens in counts:
+        df.update(tokens.keys())
+    dictionary = sorted(df)
+    token_ids = {token: i for i, token in enumerate(dictionary)}
+    n = len(chunks)
+    idf = [math.log(1 + n / (df[token] + 1)) for token in dictionary]
+
+    postings: List[List[int]] = [[] for _ in dictionary]
+    norms = []
+    for chunk_id, tokens in enumerate(counts):
+        weight = 0.0
+        for token, tf in tokens.items():
+            tid = token_ids[token]
+            postings[tid].extend((chunk_id, tf))
+            weight += (tf * idf[tid]) ** 2
+        norms.append(round(math.sqrt(weight), 6))
+    return {
+        "dictionary": dictionary,
+        "idf": [round(value, 6) for value in idf],
+        "postings": postings,
+        "norms": norms,
+    }
+
+
+def collect_chunks(root: Path = PROJECT_ROOT) -> Tuple[List[Chunk], Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """Every chunk, the pricing facts and the sha256 of each input file."""
+    chunks: List[Chunk] = []
+    sources: Dict[str, str] = {}
+
+    def read(path: Path) -> bytes:
+        data = path.read_bytes()
+        sources[str(path.relative_to(root))] = hashlib.sha256(data).hexdigest()
+        return data
+
+    for page in site_pages(root / CHAT_CONFIG_PATH.relative_to(PROJECT_ROOT)):
+        path = root / page
+        if not path.exists():
+            print(f"[WARN] {page} listed in config/chat.js but missing; skipped")
+            continue
+        chunks.extend(html_chunks(read(path).decode("utf-8"), f"/{page}"))
+
+    table_path = root / PRICING_TABLE_PATH.relative_to(PROJECT_ROOT)
+    table = json.loads(read(table_path))
+    chunks.extend(pricing_chunks(table, f"/{table_path.relative_to(root)}"))
+    for path, chunker in ((COVERAGE_PATH, coverage_chunks), (FEE_SUMMARY_PATH, fee_summary_chunks)):
+        path = root / path.relative_to(PROJECT_ROOT)
+        read(path)
+        chunks.extend(chunker(pd.read_csv(path), f"/{path.relative_to(root)}"))
+    return chunks, pricing_facts(table), sources
+
+
+def build_artifact(root: Path = PROJECT_ROOT) -> Dict[str, Any]:
+    chunks, facts, sources = collect_chunks(root)
+    body = {"chunks": chunks, **build_index(chunks), "pricing": facts}
+    digest = hashlib.sha256(json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+    return {"format": INDEX_FORMAT, "build_id": digest[:12], "sources": sources, **body}
+
+
+def write_artifact(artifact: Dict[str, Any], path: Path = INDEX_PATH) -> bool:
+    """Write ``artifact`` atomically; returns False (and leaves the file alone) when the build and sources are unchanged."""
+    if path.exists():
+        try:
+            current = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            current = {}
+        if all(current.get(field) == artifact[field] for field in ("format", "build_id", "sources")):
+            return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(artifact, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+    tmp.replace(path)
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the chat retrieval index from site pages and pricing datasets")
+    parser.add_argument("--output", type=Path, default=INDEX_PATH)
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    with instrumented_run("build_retrieval_index", args.metrics_json, args.profile):
+        with span("build") as build_span:
+            artifact = build_artifact()
+            build_span.rows_out = len(artifact["chunks"])
+        with span("write", rows_in=len(artifact["chunks"])):
+            written = write_artifact(artifact, args.output)
+    status = "wrote" if written else "unchanged"
+    print(
+        f"[INFO] {status} {args.output} (build {artifact['build_id']}): {len(artifact['chunks'])} chunks, "
+        f"{len(artifact['dictionary'])} tokens, {len(artifact['pricing'])} priced services"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,19 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Sequence
 
 import pandas as pd
 
+from frame_writer import log_written, write_outputs
+from instrumentation import add_instrumentation_args, instrumented_run, span
+
 DEFAULT_VERSION = "1.0.0"
 DEFAULT_PLATFORM_COST = 0.0
 DEFAULT_CONFIG_PATH = Path("data/pricing/internal_cost_overrides.json")
 
 
-def _load_overrides(path: Path | None) -> Dict[str, Any]:
+def load_overrides(path: Path | None) -> Dict[str, Any]:
     if path is None:
         return {}
     if not path.exists():
@@ -37,15 +40,53 @@ def _value_for(overrides: Dict[str, Any], service_id: str, key: str, fallback: A
     return fallback
 
 
-def compute(input_path: Path, output_path: Path, default_platform: float, version: str, config_path: Path | None) -> None:
-    df = pd.read_csv(input_path)
-    required = {"service_id", "service_name", "unit", "cost_currency", "informdata_cost", "effective_date", "approval_ref", "source_system"}
-    missing = required - set(df.columns)
+REQUIRED_COLUMNS = {
+    "service_id",
+    "service_name",
+    "unit",
+    "cost_currency",
+    "informdata_cost",
+    "effective_date",
+    "approval_ref",
+    "source_system",
+}
+
+OUTPUT_COLUMNS = [
+    "service_id",
+    "service_name",
+    "unit",
+    "cost_currency",
+    "informdata_cost",
+    "automation_spend",
+    "platform_overhead",
+    "pass_through_cost",
+    "internal_cost",
+    "total_cost",
+    "pass_through",
+    "effective_date",
+    "computation_version",
+    "approval_ref",
+    "source_system",
+    "notes",
+]
+
+
+def compute_frame(
+    costs_df: pd.DataFrame,
+    default_platform: float,
+    version: str,
+    overrides: Dict[str, Any],
+) -> pd.DataFrame:
+    """Return the internal pricing frame for ``costs_df`` without touching disk.
+
+    Cost columns come back as float64 and ``pass_through`` as bool so the
+    frame can be handed straight to ``build_pricing_table.build_frame``.
+    """
+    missing = REQUIRED_COLUMNS - set(costs_df.columns)
     if missing:
         raise SystemExit(f"Input CSV missing required columns: {sorted(missing)}")
 
-    df = df.copy()
-    overrides = _load_overrides(config_path)
+    df = costs_df.copy()
 
     df["automation_spend"] = df["service_id"].apply(
         lambda sid: float(_value_for(overrides, sid, "automation_spend", 0.0))
@@ -58,38 +99,30 @@ def compute(input_path: Path, output_path: Path, default_platform: float, versio
     )
     df["pass_through"] = df["service_id"].apply(
         lambda sid: bool(_value_for(overrides, sid, "pass_through", False))
-    )
+    ).astype(bool)
 
     df["internal_cost"] = (df["informdata_cost"] + df["automation_spend"] + df["platform_overhead"]).round(2)
     df["total_cost"] = (df["internal_cost"] + df["pass_through_cost"]).round(2)
     df["computation_version"] = version
 
-    columns = [
-        "service_id",
-        "service_name",
-        "unit",
-        "cost_currency",
-        "informdata_cost",
-        "automation_spend",
-        "platform_overhead",
-        "pass_through_cost",
-        "internal_cost",
-        "total_cost",
-        "pass_through",
-        "effective_date",
-        "computation_version",
-        "approval_ref",
-        "source_system",
-        "notes",
-    ]
     if "notes" not in df.columns:
         df["notes"] = ""
 
-    df[columns].to_csv(output_path, index=False)
-    print(f"[INFO] wrote {len(df)} rows to {output_path}")
+    return df[OUTPUT_COLUMNS].reset_index(drop=True)
+
+
+def compute(input_path: Path, output_path: Path, default_platform: float, version: str, config_path: Path | None) -> None:
+    with span("load") as load_span:
+        df = pd.read_csv(input_path)
+        load_span.rows_out = len(df)
+    with span("compute", rows_in=len(df)) as compute_span:
+        result = compute_frame(df, default_platform, version, load_overrides(config_path))
+        compute_span.rows_out = len(result)
+    with span("write", rows_in=len(result)):
+        log_written(write_outputs(result, output_path))
 
 
-def main() -> None:
+def main(argv: Optional[Sequence[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Compute InformData total costs including platform overhead")
     parser.add_argument("--input", type=Path, required=True)
     parser.add_argument("--output", type=Path, default=Path("data/pricing/internal_pricing.csv"))
@@ -106,13 +139,15 @@ def main() -> None:
         default=DEFAULT_CONFIG_PATH,
         help="Optional JSON config with per-service automation/platform overrides",
     )
-    args = parser.parse_args()
+    add_instrumentation_args(parser)
+    args = parser.parse_args(argv)
 
     config_path: Path | None = args.config
     if config_path and not config_path.exists():
         config_path = None
 
-    compute(args.input, args.output, args.default_platform, args.version, config_path)
+    with instrumented_run("compute_internal_pricing", args.metrics_json, args.profile):
+        compute(args.input, args.output, args.default_platform, args.version, config_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Diff two court fee schedules and keep a history of fee versions.
+
+Each ClientCostsByProcessWithFees export replaces
+``informdata_court_access_fees.csv`` wholesale. This stage joins the old and
+new schedules on ``(state_code, jurisdiction, process)`` (one hash join via
+``DataFrame.merge``) and classifies every key as ``added``, ``removed`` or
+``changed`` with per-fee-column deltas; unchanged rows are left out of the
+report.
+
+Changes are ranked by expected cost impact: the row's total fee delta times
+the number of orders that search the county (``--orders``, the
+``order_cost_engine`` input format; packages without criminal searches are
+not counted). Counties the routing table sends to a statewide repository
+carry no impact until rerouted, so their ``cost_impact`` is 0. Without order
+volume every county counts once and the ranking is by fee delta.
+
+Fee versions are kept under ``data/pricing/fee_history/`` as gzipped,
+content-addressed snapshots listed in ``manifest.json``; without ``--old``
+the new schedule is compared to the latest recorded version that differs
+from it.
+
+Usage:
+    python scripts/pricing/court_fee_diff.py --new data/pricing/informdata_court_access_fees.csv \
+        --orders orders.csv --output reports/court_fee_changes.csv
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from court_fee_index import FEE_COLUMNS
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from jurisdictions import jurisdiction_keys, state_keys
+from order_cost_engine import ADDRESS_SEPARATOR, ORDER_COLUMNS, PACKAGES_PATH, load_packages
+from search_routing import ROUTE_STATEWIDE, ROUTING_PATH
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FEES_PATH = PROJECT_ROOT / "data/pricing/informdata_court_access_fees.csv"
+HISTORY_DIR = PROJECT_ROOT / "data/pricing/fee_history"
+REPORT_PATH = PROJECT_ROOT / "reports/court_fee_changes.csv"
+
+KEY_COLUMNS = ["state_code", "jurisdiction", "process"]
+ADDED, REMOVED, CHANGED = "added", "removed", "changed"
+HASH_LENGTH = 12
+CHUNK_SIZE = 500_000
+REPORT_COLUMNS = (
+    ["change", "state_code", "county_key", "jurisdiction", "process", "old_total_fee", "new_total_fee"]
+    + [f"delta_{col}" for col in FEE_COLUMNS]
+    + ["total_delta", "route", "orders", "cost_impact"]
+)
+
+
+def load_schedule(path: Path) -> pd.DataFrame:
+    """Fee schedule CSV (``extract_court_fees`` output or a history snapshot)."""
+    fees = pd.read_csv(path, dtype={"state_code": str, "county_key": str, "jurisdiction": str, "process": str})
+    missing = [col for col in KEY_COLUMNS[1:] + list(FEE_COLUMNS) if col not in fees.columns]
+    if missing:
+        raise ValueError(f"Fee schedule {path} is missing columns: {missing}")
+    if "state_code" not in fees.columns:
+        fees["state_code"] = state_keys(fees["state_header"])
+    if "county_key" not in fees.columns:
+        fees["county_key"] = jurisdiction_keys(fees["jurisdiction"])
+    return fees
+
+
+def diff_schedules(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """Added, removed and changed rows between two schedules with per-column fee deltas."""
+    for label, fees in (("old", old), ("new", new)):
+        duplicated = fees.duplicated(KEY_COLUMNS)
+        if duplicated.any():
+            raise ValueError(f"The {label} schedule repeats {int(duplicated.sum())} (state, jurisdiction, process) keys")
+
+    columns = KEY_COLUMNS + ["county_key"] + list(FEE_COLUMNS)
+    joined = old[columns].merge(new[columns], on=KEY_COLUMNS, how="outer", suffixes=("_old", "_new"), indicator=True)
+
+    old_fees = joined[[f"{col}_old" for col in FEE_COLUMNS]].to_numpy(dtype=float)
+    new_fees = joined[[f"{col}_new" for col in FEE_COLUMNS]].to_numpy(dtype=float)
+    deltas = (np.nan_to_num(new_fees) - np.nan_to_num(old_fees)).round(2)
+    side = joined["_merge"].to_numpy()
+    change = np.select([side == "right_only", side == "left_only", (deltas != 0).any(axis=1)], [ADDED, REMOVED, CHANGED], "")
+
+    out = pd.DataFrame({
+        "change": change,
+        "state_code": joined["state_code"],
+        "county_key": joined["county_key_new"].fillna(joined["county_key_old"]),
+        "jurisdiction": joined["jurisdiction"],
+        "process": joined["process"],
+        "old_total_fee": np.where(side == "right_only", np.nan, np.nan_to_num(old_fees).sum(axis=1)),
+        "new_total_fee": np.where(side == "left_only", np.nan, np.nan_to_num(new_fees).sum(axis=1)),
+    })
+    for idx, col in enumerate(FEE_COLUMNS):
+        out[f"delta_{col}"] = deltas[:, idx]
+    out["total_delta"] = deltas.sum(axis=1).round(2)
+    return out[out["change"] != ""].reset_index(drop=True)
+
+
+def order_volume(orders_path: Path, packages_path: Path = PACKAGES_PATH, chunk_size: int = CHUNK_SIZE) -> pd.Series:
+    """Orders searching each ``(state_code, county_key)``; an order counts once per county."""
+    searches = {name.upper() for name, config in load_packages(packages_path).items() if config.get("criminal_searches")}
+    counts: Optional[pd.Series] = None
+    reader = pd.read_csv(orders_path, usecols=ORDER_COLUMNS, dtype=str, chunksize=chunk_size)
+    for chunk in reader:
+        chunk = chunk[chunk["package"].astype("string").str.strip().str.upper().isin(searches).fillna(False).astype(bool)]
+        tokens = chunk["addresses"].astype("string").reset_index(drop=True).str.split(ADDRESS_SEPARATOR).explode().str.strip()
+        parts = tokens[tokens.notna() & tokens.ne("")].str.partition(":")
+        pairs = pd.DataFrame({
+            "order": parts.index,
+            "state_code": state_keys(parts[0]).to_numpy(),
+            "county_key": jurisdiction_keys(parts[2]).to_numpy(),
+        }).dropna().drop_duplicates()
+        part = pairs.groupby(["state_code", "county_key"]).size()
+        counts = part if counts is None else counts.add(part, fill_value=0)
+    if counts is None:
+        return pd.Series(dtype="int64", name="orders")
+    return counts.astype("int64").rename("orders")
+
+
+def rank_changes(changes: pd.DataFrame, volume: Optional[pd.Series] = None, routing: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Attach order volume, route and ``cost_impact``; largest absolute impact first."""
+    keys = pd.MultiIndex.from_frame(changes[["state_code", "county_key"]])
+    ranked = changes.copy()
+    if routing is not None:
+        routes = routing.set_index(["state_code", "county_key"])["route"]
+        ranked["route"] = routes.reindex(keys).to_numpy()
+    else:
+        ranked["route"] = pd.NA
+    if volume is not None:
+        ranked["orders"] = volume.reindex(keys).fillna(0).astype("int64").to_numpy()
+    else:
+        ranked["orders"] = 1
+    statewide = ranked["route"].eq(ROUTE_STATEWIDE).fillna(False).astype(bool)
+    ranked["cost_impact"] = (ranked["total_delta"] * ranked["orders"]).where(~statewide, 0.0).round(2)
+
+    order = np.lexsort((
+        ranked["jurisdiction"].to_numpy(dtype=str),
+        ranked["state_code"].fillna("").to_numpy(dtype=str),
+        -ranked["total_delta"].abs().to_numpy(),
+        -ranked["cost_impact"].abs().to_numpy(),
+    ))
+    return ranked.iloc[order][REPORT_COLUMNS].reset_index(drop=True)
+
+
+def _load_manifest(history_dir: Path) -> Dict[str, Any]:
+    path = history_dir / "manifest.json"
+    if not path.exists():
+        return {"dataset": FEES_PATH.stem, "versions": []}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def record_version(fees_path: Path, history_dir: Path = HISTORY_DIR, recorded: Optional[str] = None) -> Dict[str, Any]:
+    """Snapshot ``fees_path`` into the history unless it matches the latest version; return its manifest entry."""
+    data = fees_path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    manifest = _load_manifest(history_dir)
+    versions: List[Dict[str, Any]] = manifest["versions"]
+    if versions and versions[-1]["sha256"] == digest:
+        return versions[-1]
+
+    history_dir.mkdir(parents=True, exist_ok=True)
+    name = f"{manifest['dataset']}.{digest[:HASH_LENGTH]}.csv.gz"
+    (history_dir / name).write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    entry = {
+        "version": len(versions) + 1,
+        "recorded": recorded or date.today().isoformat(),
+        "file": name,
+        "sha256": digest,
+        "rows": max(data.count(b"\n") - 1, 0),
+    }
+    versions.append(entry)
+    tmp = history_dir / "manifest.json.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    tmp.replace(history_dir / "manifest.json")
+    return entry
+
+
+def snapshot_before_replace(fees_path: Path, history_dir: Path = HISTORY_DIR) -> Optional[Path]:
+    """Record the schedule at ``fees_path`` before it is overwritten and return its snapshot.
+
+    This is the baseline to diff the replacement against, so an identical
+    re-export yields an empty report. Without a current file the latest
+    recorded version is used.
+    """
+    if fees_path.exists():
+        entry: Optional[Dict[str, Any]] = record_version(fees_path, history_dir)
+    else:
+        versions = _load_manifest(history_dir)["versions"]
+        entry = versions[-1] if versions else None
+    return history_dir / entry["file"] if entry else None
+
+
+def previous_version(fees_path: Path, history_dir: Path = HISTORY_DIR) -> Optional[Path]:
+    """Latest recorded snapshot whose content differs from ``fees_path`` (the standalone CLI's default ``--old``)."""
+    digest = hashlib.sha256(fees_path.read_bytes()).hexdigest()
+    for entry in reversed(_load_manifest(history_dir)["versions"]):
+        if entry["sha256"] != digest:
+            return history_dir / entry["file"]
+    return None
+
+
+def run(
+    new_path: Path,
+    old_path: Optional[Path],
+    output_path: Path,
+    history_dir: Path = HISTORY_DIR,
+    orders_path: Optional[Path] = None,
+    routing_path: Optional[Path] = ROUTING_PATH,
+    record: bool = True,
+) -> Optional[pd.DataFrame]:
+    """Diff ``new_path`` against ``old_path`` (default: previous history version), write the report, record history."""
+    old_path = old_path or previous_version(new_path, history_dir)
+    report: Optional[pd.DataFrame] = None
+    if old_path is None:
+        print(f"[INFO] no earlier fee version in {history_dir}; nothing to diff")
+    else:
+        with span("load_schedules") as load_span:
+            old, new = load_schedule(old_path), load_schedule(new_path)
+            load_span.rows_out = len(old) + len(new)
+        with span("diff", rows_in=len(old) + len(new)) as diff_span:
+            changes = diff_schedules(old, new)
+            diff_span.rows_out = len(changes)
+        with span("rank", rows_in=len(changes)):
+            volume = order_volume(orders_path) if orders_path else None
+            routing = pd.read_csv(routing_path, dtype={"county_key": str}, keep_default_na=False) if routing_path and routing_path.exists() else None
+            report = rank_changes(changes, volume, routing)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output_path.with_name(output_path.name + ".tmp")
+        report.to_csv(tmp, index=False)
+        tmp.replace(output_path)
+        counts = report["change"].value_counts()
+        print(
+            f"[INFO] {old_path.name} -> {new_path.name}: {counts.get(ADDED, 0)} added, {counts.get(REMOVED, 0)} removed, "
+            f"{counts.get(CHANGED, 0)} changed rows; net impact {report['cost_impact'].sum():,.2f} -> {output_path}"
+        )
+    if record:
+        entry = record_version(new_path, history_dir)
+        print(f"[INFO] fee version {entry['version']} ({entry['sha256'][:HASH_LENGTH]}) recorded in {history_dir}")
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Diff court fee schedules and record fee versions")
+    parser.add_argument("--new", type=Path, default=FEES_PATH, help="New fee schedule CSV")
+    parser.add_argument("--old", type=Path, help="Old fee schedule CSV (default: previous recorded version)")
+    parser.add_argument("--orders", type=Path, help="Orders CSV (order_cost_engine format) for per-county volume")
+    parser.add_argument("--routing", type=Path, default=ROUTING_PATH, help="Routing table from search_routing.py")
+    parser.add_argument("--history-dir", type=Path, default=HISTORY_DIR)
+    parser.add_argument("--output", type=Path, default=REPORT_PATH, help="Change report CSV")
+    parser.add_argument("--no-record", action="store_true", help="Do not add the new schedule to the fee history")
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    with instrumented_run("court_fee_diff", args.metrics_json, args.profile):
+        try:
+            run(args.new, args.old, args.output, args.history_dir, args.orders, args.routing, not args.no_record)
+        except ValueError as exc:
+            raise SystemExit(str(exc))
+
+
+if __name__ == "__main__":
+    main()
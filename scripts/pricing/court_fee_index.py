@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Compile the court access fee schedule into a memory-mappable lookup index.
+
+The index is a single little-endian file::
+
+    header    magic, version, counts, section offsets, sha256 of the source CSV
+    records   fixed-width rows: state code, jurisdiction/process string refs,
+              search cost, 10-year surcharge, court fee, access fee (int32 cents)
+    keys      (hash, key string ref, record) entries
+    buckets   open-addressing table of key entry numbers (0 = empty)
+    strings   UTF-8 string pool
+
+Every fee row is reachable by ``(state, jurisdiction, process)`` and, when the
+jurisdiction names a county (``"Belknap + District"``), by the canonical county
+key as well. Opening the file only maps it; point lookups hash the key and
+probe a few buckets with ``struct.unpack_from`` (no pandas, no parsing), and
+forked workers share the pages through the page cache. ``lookup_many`` is a
+convenience over the same per-key hash and probe (its cost grows like a loop
+of ``lookup`` calls); only the final fee gather is a NumPy index into a view
+over the mapped records.
+
+Usage:
+    python scripts/pricing/court_fee_index.py build
+    python scripts/pricing/court_fee_index.py lookup --state NH --jurisdiction Belknap --process Processor
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from jurisdictions import county_key, jurisdiction_county, state_code
+
+if TYPE_CHECKING:
+    import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FEES_PATH = PROJECT_ROOT / "data/pricing/informdata_court_access_fees.csv"
+INDEX_PATH = FEES_PATH.with_suffix(".feeidx")
+
+MAGIC = b"CFEEIDX\x00"
+VERSION = 1
+FEE_COLUMNS = ("search_cost", "ten_year_surcharge", "court_fee", "access_fee")
+HEADER = struct.Struct("<8sIIII5Q32s")
+RECORD = struct.Struct("<2s2xIIII4i")
+KEY = struct.Struct("<QIII")
+BUCKET = struct.Struct("<I")
+_SEP = "\x1f"
+_COUNTY_PREFIX = "#"
+
+
+class CourtFee(NamedTuple):
+    state: str
+    jurisdiction: str
+    process: str
+    search_cost: int
+    ten_year_surcharge: int
+    court_fee: int
+    access_fee: int
+
+    @property
+    def total(self) -> int:
+        """All four fee components in cents."""
+        return self.search_cost + self.ten_year_surcharge + self.court_fee + self.access_fee
+
+
+def _text(value: str) -> str:
+    return " ".join(str(value).split()).upper()
+
+
+def _key(state: str, jurisdiction: str, process: str) -> bytes:
+    return _SEP.join((state, jurisdiction, _text(process))).encode("utf-8")
+
+
+def _hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def _cents(value: object) -> int:
+    try:
+        amount = float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return 0
+    return 0 if amount != amount else int(round(amount * 100))
+
+
+def build_index(fees_path: Path = FEES_PATH, output: Path = INDEX_PATH) -> Path:
+    """Compile ``fees_path`` (the extracted court fee CSV) into ``output``; return ``output``."""
+    import csv
+
+    raw = fees_path.read_bytes()
+    rows = list(csv.DictReader(raw.decode("utf-8").splitlines()))
+
+    strings = bytearray()
+    string_refs = {}
+
+    def intern(value: bytes) -> Tuple[int, int]:
+        if value not in string_refs:
+            string_refs[value] = (len(strings), len(value))
+            strings.extend(value)
+        return string_refs[value]
+
+    records = bytearray()
+    exact: List[Tuple[bytes, int]] = []
+    by_county = {}
+    for number, row in enumerate(rows):
+        state = row.get("state_code") or state_code(row.get("state_header")) or state_code(row.get("state")) or ""
+        jurisdiction, process = row["jurisdiction"], row["process"]
+        jur_ref, proc_ref = intern(jurisdiction.encode("utf-8")), intern(process.encode("utf-8"))
+        fees = [_cents(row.get(column)) for column in FEE_COLUMNS]
+        records.extend(RECORD.pack(state.encode("ascii")[:2].ljust(2), *jur_ref, *proc_ref, *fees))
+
+        exact.append((_key(state, _text(jurisdiction), process), number))
+        county = row.get("county_key") or county_key(jurisdiction_county(jurisdiction))
+        if county:
+            alias = _key(state, _COUNTY_PREFIX + county, process)
+            # A plain county row ("Carson City") beats court-specific rows for the same county
+            plain = county_key(jurisdiction) == county
+            if alias not in by_county or plain:
+                by_county[alias] = number
+
+    entries = exact + [(alias, number) for alias, number in by_county.items()]
+    bucket_count = 1
+    while bucket_count < 2 * max(len(entries), 1):
+        bucket_count <<= 1
+    buckets = [0] * bucket_count
+    keys = bytearray()
+    for entry_number, (key, record_number) in enumerate(entries):
+        key_hash = _hash(key)
+        keys.extend(KEY.pack(key_hash, *intern(key), record_number))
+        slot = key_hash & (bucket_count - 1)
+        while buckets[slot]:
+            slot = (slot + 1) & (bucket_count - 1)
+        buckets[slot] = entry_number + 1
+
+    records_off = HEADER.size
+    keys_off = records_off + len(records)
+    buckets_off = keys_off + len(keys)
+    strings_off = buckets_off + bucket_count * BUCKET.size
+    header = HEADER.pack(
+        MAGIC, VERSION, len(rows), len(entries), bucket_count,
+        records_off, keys_off, buckets_off, strings_off, len(strings),
+        hashlib.sha256(raw).digest(),
+    )
+    payload = header + bytes(records) + bytes(keys) + struct.pack(f"<{bucket_count}I", *buckets) + bytes(strings)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + ".tmp")
+    tmp.write_bytes(payload)
+    tmp.replace(output)
+    return output
+
+
+class CourtFeeIndex:
+    """Read-only view over a compiled ``.feeidx`` file."""
+
+    def __init__(self, path: Path = INDEX_PATH) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            self._mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic, version, self.record_count, self.key_count, self.bucket_count,
+            self._records_off, self._keys_off, self._buckets_off, self._strings_off, _,
+            self.source_sha256,
+        ) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} court fee index")
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "CourtFeeIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def is_current(self, fees_path: Path = FEES_PATH) -> bool:
+        """True when the index was compiled from the current contents of ``fees_path``."""
+        return hashlib.sha256(fees_path.read_bytes()).digest() == self.source_sha256
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_off + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _find(self, key: bytes) -> int:
+        key_hash = _hash(key)
+        mask = self.bucket_count - 1
+        slot = key_hash & mask
+        while True:
+            (entry,) = BUCKET.unpack_from(self._mm, self._buckets_off + slot * BUCKET.size)
+            if not entry:
+                return -1
+            stored_hash, key_off, key_len, record = KEY.unpack_from(self._mm, self._keys_off + (entry - 1) * KEY.size)
+            if stored_hash == key_hash:
+                start = self._strings_off + key_off
+                if self._mm[start:start + key_len] == key:
+                    return record
+            slot = (slot + 1) & mask
+
+    def _position(self, state: str, jurisdiction: str, process: str) -> int:
+        code = state_code(state) or _text(state)
+        record = self._find(_key(code, _text(jurisdiction), process))
+        if record < 0:
+            county = county_key(jurisdiction_county(jurisdiction))
+            if county:
+                record = self._find(_key(code, _COUNTY_PREFIX + county, process))
+        return record
+
+    def record(self, position: int) -> CourtFee:
+        state, jur_off, jur_len, proc_off, proc_len, *fees = RECORD.unpack_from(
+            self._mm, self._records_off + position * RECORD.size
+        )
+        return CourtFee(state.decode("ascii").strip(), self._string(jur_off, jur_len), self._string(proc_off, proc_len), *fees)
+
+    def lookup(self, state: str, jurisdiction: str, process: str) -> Optional[CourtFee]:
+        """Fees in cents for one jurisdiction/process, or ``None``.
+
+        ``state`` may be a code or name; ``jurisdiction`` matches the fee sheet
+        text case-insensitively, or any spelling of the county it names.
+        """
+        position = self._position(state, jurisdiction, process)
+        return None if position < 0 else self.record(position)
+
+    def lookup_many(self, keys: Iterable[Tuple[str, str, str]]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Record positions (``-1`` when missing) and an ``(n, 4)`` int32 cents array (zeros when missing).
+
+        Each key is resolved in Python exactly as ``lookup`` does; the fee rows
+        are then gathered in one step from ``fee_matrix``.
+        """
+        import numpy as np
+
+        positions = np.fromiter((self._position(*key) for key in keys), dtype=np.int64)
+        fees = self.fee_matrix()
+        out = np.zeros((len(positions), len(FEE_COLUMNS)), dtype=np.int32)
+        found = positions >= 0
+        out[found] = fees[positions[found]]
+        return positions, out
+
+    def fee_matrix(self) -> "np.ndarray":
+        """Zero-copy ``(records, 4)`` int32 view of every fee row, columns in ``FEE_COLUMNS`` order."""
+        import numpy as np
+
+        dtype = np.dtype({
+            "names": ["fees"],
+            "formats": [("<i4", (len(FEE_COLUMNS),))],
+            "offsets": [RECORD.size - 4 * len(FEE_COLUMNS)],
+            "itemsize": RECORD.size,
+        })
+        return np.frombuffer(self._mm, dtype=dtype, count=self.record_count, offset=self._records_off)["fees"]
+
+    def __iter__(self) -> Iterator[CourtFee]:
+        return (self.record(position) for position in range(self.record_count))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or query the court fee lookup index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Compile the fee CSV into a .feeidx file")
+    build.add_argument("--fees", type=Path, default=FEES_PATH)
+    build.add_argument("--output", type=Path, default=INDEX_PATH)
+    lookup = sub.add_parser("lookup", help="Print the fees for one jurisdiction/process")
+    lookup.add_argument("--index", type=Path, default=INDEX_PATH)
+    lookup.add_argument("--state", required=True)
+    lookup.add_argument("--jurisdiction", required=True)
+    lookup.add_argument("--process", required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        path = build_index(args.fees, args.output)
+        with CourtFeeIndex(path) as index:
+            print(f"[INFO] wrote {len(index)} fee rows ({index.key_count} keys) to {path}")
+        return 0
+
+    with CourtFeeIndex(args.index) as index:
+        fee = index.lookup(args.state, args.jurisdiction, args.process)
+    if fee is None:
+        sys.stderr.write(f"[ERROR] no fee row for {args.state} / {args.jurisdiction} / {args.process}\n")
+        return 1
+    print(", ".join(f"{field}={getattr(fee, field)}" for field in CourtFee._fields) + f", total={fee.total}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Export the pricing and NatCrim outputs that sales works from into one XLSX workbook.
+
+Sheets, in order:
+
+* ``Pricing`` – ``content/pricing/informdata_pricing_table.csv``
+* ``Statewide Pricing`` – ``data/pricing/informdata_statewide.csv``
+* ``Court Fees`` – ``data/pricing/informdata_court_access_fees.csv``
+* ``County Fee Summary`` – ``content/pricing/county_fee_summary.csv``
+* ``NatCrim State Totals`` / ``NatCrim Scope Summary`` / ``NatCrim Sources`` –
+  the ``natcrim_*_<date>.csv`` exports of the chosen snapshot
+
+Each CSV is read with the ``csv`` module and appended row by row to an
+openpyxl ``write_only`` workbook, so memory does not grow with sheet size.
+Column kinds (integer, decimal, currency, date, text) and widths are fixed
+from the header and the first ``WIDTH_SAMPLE_ROWS`` rows before any row is
+written, since write-only sheets emit their column widths up front. Columns
+named like costs, fees and prices get a currency format. Each header is bold,
+frozen and carries an autofilter.
+
+openpyxl stamps the save time into the zip entries and ``docProps/core.xml``,
+so an export is compared part by part (ignoring that one) with the file
+already on disk, and an unchanged export leaves it alone.
+
+Usage:
+    python scripts/pricing/export_sales_workbook.py
+    python scripts/pricing/export_sales_workbook.py --snapshot-date 2025-10-03 \
+        --output content/pricing/informdata_sales_workbook.xlsx
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import math
+import re
+import zipfile
+from contextlib import contextmanager
+from datetime import date
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+
+from instrumentation import add_instrumentation_args, instrumented_run, span
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CONTENT_DIR = PROJECT_ROOT / "content/pricing"
+OUTPUT_PATH = CONTENT_DIR / "informdata_sales_workbook.xlsx"
+SNAPSHOT_PATTERN = re.compile(r"natcrim_sources_(\d{4}-\d{2}-\d{2})\.csv$")
+WIDTH_SAMPLE_ROWS = 1_000
+# Room for the autofilter button next to the header text
+HEADER_PADDING = 3
+CURRENCY_COLUMN = re.compile(r"(cost|fee|price|amount|margin|delta|surcharge|overhead|spend)", re.IGNORECASE)
+INTEGER_VALUE = re.compile(r"-?\d+")
+DECIMAL_VALUE = re.compile(r"-?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?")
+ISO_DATE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+NUMBER_FORMATS: Dict[str, Optional[str]] = {
+    "text": None,
+    "integer": "#,##0",
+    "decimal": "#,##0.00",
+    "currency": '"$"#,##0.00',
+    "date": "yyyy-mm-dd",
+}
+MAX_CELL_CHARS = 32_767
+MAX_WIDTH = 60.0
+MIN_WIDTH = 6.0
+HEADER_FONT = Font(bold=True)
+# Written by openpyxl with the save time; everything else is a function of the data
+VOLATILE_PARTS = frozenset({"docProps/core.xml"})
+
+SHEETS: Tuple[Tuple[str, str], ...] = (
+    ("Pricing", "content/pricing/informdata_pricing_table.csv"),
+    ("Statewide Pricing", "data/pricing/informdata_statewide.csv"),
+    ("Court Fees", "data/pricing/informdata_court_access_fees.csv"),
+    ("County Fee Summary", "content/pricing/county_fee_summary.csv"),
+    ("NatCrim State Totals", "content/pricing/natcrim_state_totals_{snapshot}.csv"),
+    ("NatCrim Scope Summary", "content/pricing/natcrim_scope_summary_{snapshot}.csv"),
+    ("NatCrim Sources", "content/pricing/natcrim_sources_{snapshot}.csv"),
+)
+
+
+class Column(NamedTuple):
+    name: str
+    kind: str = "text"
+    width: float = 10.0
+
+
+def latest_snapshot(content_dir: Path = CONTENT_DIR) -> str:
+    """Newest ``natcrim_sources_<date>.csv`` snapshot date (dates sort lexically)."""
+    stamps = sorted(match.group(1) for match in (SNAPSHOT_PATTERN.search(path.name) for path in content_dir.glob("natcrim_sources_*.csv")) if match)
+    if not stamps:
+        raise ValueError(f"No natcrim_sources_<date>.csv export under {content_dir}")
+    return stamps[-1]
+
+
+def sheet_paths(snapshot: str, root: Path = PROJECT_ROOT) -> List[Tuple[str, Path]]:
+    return [(name, root / template.format(snapshot=snapshot)) for name, template in SHEETS]
+
+
+def column_kind(name: str, values: Sequence[str]) -> str:
+    """Pick a column's number format from its name and sampled values."""
+    present = [value for value in values if value != ""]
+    if not present:
+        return "text"
+    if all(ISO_DATE.match(value) for value in present):
+        return "date"
+    if all(INTEGER_VALUE.fullmatch(value) for value in present):
+        return "currency" if CURRENCY_COLUMN.search(name) else "integer"
+    if all(DECIMAL_VALUE.fullmatch(value) for value in present):
+        return "currency" if CURRENCY_COLUMN.search(name) else "decimal"
+    return "text"
+
+
+def display_width(kind: str, values: Sequence[str]) -> int:
+    if kind == "date":
+        return 10
+    if kind in ("integer", "currency", "decimal"):
+        # Thousands separators, two decimals and a "$" on top of the raw digits
+        longest = max((len(value.split(".")[0].lstrip("-")) for value in values if value), default=1)
+        return longest + longest // 3 + (4 if kind != "integer" else 0) + (1 if kind == "currency" else 0)
+    return max((len(value) for value in values), default=0)
+
+
+def infer_columns(header: Sequence[str], sample: Sequence[Sequence[str]]) -> List[Column]:
+    columns = []
+    for position, name in enumerate(header):
+        values = [row[position] if position < len(row) else "" for row in sample]
+        kind = column_kind(name, values)
+        width = max(len(name) + HEADER_PADDING, display_width(kind, values) + 1)
+        columns.append(Column(name, kind, float(width)))
+    return columns
+
+
+def cell_value(value: str, kind: str) -> Any:
+    """CSV text as the value openpyxl should write for a ``kind`` column; misfits stay text."""
+    if value == "":
+        return None
+    if kind == "date":
+        match = ISO_DATE.match(value)
+        if match:
+            try:
+                return date(*(int(part) for part in match.groups()))
+            except ValueError:
+                pass
+    elif kind != "text":
+        stripped = value.strip()
+        if INTEGER_VALUE.fullmatch(stripped):
+            return int(stripped)
+        try:
+            number = float(stripped)
+        except ValueError:
+            number = math.nan
+        if math.isfinite(number):
+            return number
+    # XML 1.0 forbids most control characters, even escaped
+    return ILLEGAL_CHARACTERS_RE.sub("", value)[:MAX_CELL_CHARS]
+
+
+def add_sheet(book: Workbook, name: str, columns: Sequence[Column], rows: Iterable[Sequence[str]]) -> int:
+    """Append ``rows`` (CSV text, one value per column) to a new write-only sheet after a bold header; return the row count."""
+    if not name or len(name) > 31 or INVALID_SHEET_CHARS.search(name):
+        raise ValueError(f"Invalid sheet name {name!r}: 1-31 characters, none of []:*?/\\")
+    if name.lower() in {existing.lower() for existing in book.sheetnames}:
+        raise ValueError(f"Duplicate sheet name {name!r}")
+    if not columns:
+        raise ValueError(f"Sheet {name!r} needs at least one column")
+    unknown = sorted({column.kind for column in columns} - set(NUMBER_FORMATS))
+    if unknown:
+        raise ValueError(f"Unknown column kinds {unknown}; choose from {sorted(NUMBER_FORMATS)}")
+
+    sheet: WriteOnlyWorksheet = book.create_sheet(name)
+    # Widths and the frozen header are emitted with the first row, so set them first
+    for position, column in enumerate(columns, start=1):
+        sheet.column_dimensions[get_column_letter(position)].width = min(max(column.width, MIN_WIDTH), MAX_WIDTH)
+    sheet.freeze_panes = "A2"
+
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(sheet, value=column.name)
+        cell.font = HEADER_FONT
+        header.append(cell)
+    sheet.append(header)
+
+    kinds = [column.kind for column in columns]
+    formats = [NUMBER_FORMATS[kind] for kind in kinds]
+    count = 0
+    for count, row in enumerate(rows, start=1):
+        cells: List[Any] = []
+        for raw, kind, number_format in zip(row, kinds, formats):
+            value = cell_value(raw, kind)
+            if number_format and value is not None and not isinstance(value, str):
+                cell = WriteOnlyCell(sheet, value=value)
+                cell.number_format = number_format
+                value = cell
+            cells.append(value)
+        sheet.append(cells)
+    sheet.auto_filter.ref = f"A1:{get_column_letter(len(columns))}{count + 1}"
+    return count
+
+
+def same_workbook(left: Path, right: Path) -> bool:
+    """True when two XLSX files hold the same parts, ignoring ``VOLATILE_PARTS``."""
+    if not (left.is_file() and right.is_file()):
+        return False
+    try:
+        with zipfile.ZipFile(left) as a, zipfile.ZipFile(right) as b:
+            names = sorted(set(a.namelist()) - VOLATILE_PARTS)
+            if names != sorted(set(b.namelist()) - VOLATILE_PARTS):
+                return False
+            return all(a.read(name) == b.read(name) for name in names)
+    except zipfile.BadZipFile:
+        return False
+
+
+@contextmanager
+def open_csv(path: Path) -> Iterator[Tuple[List[Column], Iterator[List[str]]]]:
+    """``(columns, rows)`` for ``path``; only the width sample is held in memory."""
+    with path.open(newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"{path} is empty")
+        sample = list(islice(reader, WIDTH_SAMPLE_ROWS))
+        yield infer_columns(header, sample), chain(sample, reader)
+
+
+def export_workbook(sheets: Sequence[Tuple[str, Path]], output: Path = OUTPUT_PATH) -> Dict[str, int]:
+    """Stream every ``(sheet name, csv path)`` into ``output``; return rows written per sheet."""
+    missing = [str(path) for _, path in sheets if not path.exists()]
+    if missing:
+        raise ValueError(f"Missing export inputs: {', '.join(missing)}")
+    rows: Dict[str, int] = {}
+    book = Workbook(write_only=True)
+    for name, path in sheets:
+        with span(f"sheet:{name}") as sheet_span:
+            with open_csv(path) as (columns, records):
+                rows[name] = add_sheet(book, name, columns, records)
+            sheet_span.rows_out = rows[name]
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + ".tmp")
+    with span("save"):
+        book.save(tmp)
+    if same_workbook(tmp, output):
+        tmp.unlink()
+        print(f"[INFO] {output} unchanged; skipped rewrite")
+    else:
+        tmp.replace(output)
+        print(f"[INFO] wrote {len(rows)} sheets ({sum(rows.values()):,} rows) to {output}")
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export pricing and NatCrim outputs to a multi-sheet XLSX workbook")
+    parser.add_argument("--snapshot-date", help="NatCrim snapshot to export (default: newest natcrim_sources_<date>.csv)")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    add_instrumentation_args(parser)
+    args = parser.parse_args(argv)
+
+    with instrumented_run("export_sales_workbook", args.metrics_json, args.profile):
+        try:
+            snapshot = args.snapshot_date or latest_snapshot()
+            rows = export_workbook(sheet_paths(snapshot), args.output)
+        except ValueError as exc:
+            raise SystemExit(f"[ERROR] {exc}")
+    for name, count in rows.items():
+        print(f"  {name:<24} {count:>8,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,9 @@ Outputs
 =======
 1. Core InformData services with vendor cost, unit, and metadata.
 2. Optional statewide criminal pricing table (statewide & "domestic" search pricing).
-3. Optional per-jurisdiction court/access fee schedule (auto/manual/vendor fees).
+3. Optional per-jurisdiction court/access fee schedule (auto/manual/vendor fees),
+   plus its ``.feeidx`` lookup index (see court_fee_index.py) and a change
+   report against the previous fee version (see court_fee_diff.py).
 
 Usage:
     python scripts/pricing/extract_informdata_costs.py \
@@ -23,10 +25,17 @@ from __future__ import annotations
 import argparse
 import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
 import pandas as pd
 
+from court_fee_diff import HISTORY_DIR as FEE_HISTORY_DIR, REPORT_PATH as FEE_CHANGES_PATH
+from court_fee_diff import run as diff_court_fees, snapshot_before_replace
+from court_fee_index import build_index as build_fee_index
+from frame_writer import log_written, write_outputs
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from jurisdictions import jurisdiction_keys, state_code, state_keys
+
 UNIT_MAP: Dict[str, str] = {
     "SOR+": "per_search",
     "MVR": "per_search",
@@ -87,7 +96,9 @@ def _slugify(name: str) -> str:
 
 
 def extract_core_services(source: Path) -> pd.DataFrame:
-    df = pd.read_excel(source, sheet_name="SalesProposalPricingSpreadsheet")
+    with span("load") as load_span:
+        df = pd.read_excel(source, sheet_name="SalesProposalPricingSpreadsheet")
+        load_span.rows_out = len(df)
     df.columns = [c.strip() for c in df.columns]
     df = df[df["Product"].notna()].copy()
     df["Pricing"] = pd.to_numeric(df["Pricing"], errors="coerce")
@@ -137,7 +148,9 @@ def extract_core_services(source: Path) -> pd.DataFrame:
 
 
 def extract_statewide_pricing(source: Path) -> pd.DataFrame:
-    df = pd.read_excel(source, sheet_name="County and State Criminal")
+    with span("load") as load_span:
+        df = pd.read_excel(source, sheet_name="County and State Criminal")
+        load_span.rows_out = len(df)
     df.columns = [c.strip() for c in df.columns]
     df["Criminal Price"] = pd.to_numeric(df["Criminal Price"], errors="coerce")
     df = df[df["Criminal Price"].notna()].copy()
@@ -150,14 +163,18 @@ def extract_statewide_pricing(source: Path) -> pd.DataFrame:
             continue
         price = float(row["Criminal Price"])
 
-        state_code = jurisdiction[:2]
-        service_id = f"{_slugify(product)}_{state_code}"
+        code = state_code(jurisdiction)
+        if code is None:
+            print(f"[WARN] skipping statewide row with unrecognised jurisdiction {jurisdiction!r}")
+            continue
+        service_id = f"{_slugify(product)}_{code}"
         records.append(
             {
                 "service_id": service_id,
                 "service_name": product,
                 "category": "Statewide Criminal",
                 "jurisdiction": jurisdiction,
+                "state_code": code,
                 "unit": "per_search",
                 "informdata_cost": round(price, 2),
                 "cost_currency": "USD",
@@ -174,7 +191,15 @@ def extract_statewide_pricing(source: Path) -> pd.DataFrame:
 
 
 def extract_court_fees(source: Path) -> pd.DataFrame:
-    df = pd.read_excel(source, header=1)
+    with span("load") as load_span:
+        df = pd.read_excel(source, header=1)
+        load_span.rows_out = len(df)
+    return normalize_court_fee_sheet(df)
+
+
+def normalize_court_fee_sheet(df: pd.DataFrame) -> pd.DataFrame:
+    """Flatten the raw fee sheet (state header rows followed by jurisdiction rows) into one row per jurisdiction/process."""
+    df = df.copy()
     df.columns = [
         "region",
         "process",
@@ -211,6 +236,8 @@ def extract_court_fees(source: Path) -> pd.DataFrame:
         )
 
     fees = pd.DataFrame(rows)
+    fees["state_code"] = state_keys(fees["state_header"])
+    fees["county_key"] = jurisdiction_keys(fees["jurisdiction"])
     fees.fillna({"search_cost": 0.0, "ten_year_surcharge": 0.0, "court_fee": 0.0, "access_fee": 0.0}, inplace=True)
     fees.sort_values(["state", "jurisdiction", "process"], inplace=True)
     return fees
@@ -225,31 +252,45 @@ def _to_float(value: Optional[float]) -> float:
         return 0.0
 
 
-def main() -> None:
+def main(argv: Optional[Sequence[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Normalize InformData pricing costs")
     parser.add_argument("--source", type=Path, required=True, help="Path to finance workbook")
     parser.add_argument("--core-output", type=Path, default=Path("data/pricing/informdata_costs.csv"))
     parser.add_argument("--statewide-output", type=Path, help="Optional path to write statewide criminal pricing")
     parser.add_argument("--court-fee-source", type=Path, help="Optional path to ClientCostsByProcessWithFees workbook")
     parser.add_argument("--court-fee-output", type=Path, help="Optional output path for court/access fee schedule")
-    args = parser.parse_args()
-
-    core = extract_core_services(args.source.expanduser())
-    args.core_output.parent.mkdir(parents=True, exist_ok=True)
-    core.to_csv(args.core_output, index=False)
-    print(f"[INFO] wrote {len(core)} core services to {args.core_output}")
-
-    if args.statewide_output:
-        statewide = extract_statewide_pricing(args.source.expanduser())
-        args.statewide_output.parent.mkdir(parents=True, exist_ok=True)
-        statewide.to_csv(args.statewide_output, index=False)
-        print(f"[INFO] wrote {len(statewide)} statewide/state criminal rows to {args.statewide_output}")
-
-    if args.court_fee_source and args.court_fee_output:
-        fees = extract_court_fees(args.court_fee_source.expanduser())
-        args.court_fee_output.parent.mkdir(parents=True, exist_ok=True)
-        fees.to_csv(args.court_fee_output, index=False)
-        print(f"[INFO] wrote {len(fees)} court/access fee rows to {args.court_fee_output}")
+    parser.add_argument("--court-fee-changes", type=Path, default=FEE_CHANGES_PATH, help="Change report against the previous fee version")
+    parser.add_argument("--fee-history-dir", type=Path, default=FEE_HISTORY_DIR)
+    add_instrumentation_args(parser)
+    args = parser.parse_args(argv)
+
+    with instrumented_run("extract_informdata_costs", args.metrics_json, args.profile):
+        with span("core") as core_span:
+            core = extract_core_services(args.source.expanduser())
+            core_span.rows_out = len(core)
+        with span("write_core", rows_in=len(core)):
+            log_written(write_outputs(core, args.core_output))
+
+        if args.statewide_output:
+            with span("statewide") as statewide_span:
+                statewide = extract_statewide_pricing(args.source.expanduser())
+                statewide_span.rows_out = len(statewide)
+            with span("write_statewide", rows_in=len(statewide)):
+                log_written(write_outputs(statewide, args.statewide_output))
+
+        if args.court_fee_source and args.court_fee_output:
+            with span("court_fees") as fees_span:
+                fees = extract_court_fees(args.court_fee_source.expanduser())
+                fees_span.rows_out = len(fees)
+            # Diff against exactly the schedule being replaced, so an identical export reports no changes
+            previous_fees = snapshot_before_replace(args.court_fee_output, args.fee_history_dir)
+            with span("write_court_fees", rows_in=len(fees)):
+                log_written(write_outputs(fees, args.court_fee_output))
+            with span("index_court_fees", rows_in=len(fees)):
+                index_path = build_fee_index(args.court_fee_output, args.court_fee_output.with_suffix(".feeidx"))
+            print(f"[INFO] compiled court fee lookup index {index_path}")
+            with span("diff_court_fees", rows_in=len(fees)):
+                diff_court_fees(args.court_fee_output, previous_fees, args.court_fee_changes, args.fee_history_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+"""Write one frame to several formats atomically, skipping files whose content is unchanged.
+
+``write_frame`` renders each requested format to bytes once (CSV, indented
+JSON records, NDJSON, Parquet), on a thread per format, hashes the bytes and
+compares them with the file already on disk. Unchanged files are left alone,
+so a refresh that reproduces the same data does not touch mtimes, churn git
+or invalidate CDN caches. Changed files go through ``<name>.tmp`` and an
+atomic rename, so readers never see a half-written output. The returned
+entries are the manifest of what was written::
+
+    written = write_frame(table, {"csv": out.with_suffix(".csv"), "json": out.with_suffix(".json")})
+    changed = [entry.path for entry in written if entry.changed]
+
+JSON output matches ``json.dumps(json.loads(df.to_json(orient="records")), indent=2)``
+without the intermediate round trip, except that floats keep their full
+precision (``to_json`` rounds to 10 significant digits) and datetimes are
+written as ISO 8601 strings rather than epoch milliseconds.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import pandas as pd
+
+FORMATS = ("csv", "json", "ndjson", "parquet")
+SUFFIX_FORMATS = {".csv": "csv", ".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson", ".parquet": "parquet"}
+
+
+@dataclass
+class WrittenFile:
+    path: Path
+    format: str
+    rows: int
+    sha256: str
+    bytes: int
+    changed: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file": str(self.path),
+            "format": self.format,
+            "rows": self.rows,
+            "sha256": self.sha256,
+            "bytes": self.bytes,
+            "changed": self.changed,
+        }
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    # object dtype turns numpy scalars into Python ones; missing values become null
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def _json_default(value: Any) -> Any:
+    # datetime64 columns arrive as pd.Timestamp; dates, times and Timedeltas all have isoformat()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _render_csv(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def _render_json(df: pd.DataFrame) -> bytes:
+    return json.dumps(_records(df), indent=2, default=_json_default).encode("utf-8")
+
+
+def _render_ndjson(df: pd.DataFrame) -> bytes:
+    return "".join(json.dumps(record, separators=(",", ":"), default=_json_default) + "\n" for record in _records(df)).encode("utf-8")
+
+
+def _render_parquet(df: pd.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+RENDERERS: Dict[str, Callable[[pd.DataFrame], bytes]] = {
+    "csv": _render_csv,
+    "json": _render_json,
+    "ndjson": _render_ndjson,
+    "parquet": _render_parquet,
+}
+
+
+def format_for(path: Path) -> str:
+    """Infer the output format from ``path``'s suffix."""
+    fmt = SUFFIX_FORMATS.get(path.suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Cannot infer output format for {path}; use one of {sorted(SUFFIX_FORMATS)}")
+    return fmt
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """Return the sha256 of ``path``, or None when it is missing or not a regular file."""
+    if not path.is_file():
+        return None
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_bytes(path: Path, data: bytes, fmt: str = "", rows: int = 0) -> WrittenFile:
+    """Atomically replace ``path`` with ``data`` unless it already holds exactly those bytes."""
+    digest = hashlib.sha256(data).hexdigest()
+    changed = file_digest(path) != digest
+    if changed:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+    return WrittenFile(path, fmt, rows, digest, len(data), changed)
+
+
+def write_frame(df: pd.DataFrame, targets: Mapping[str, Path]) -> List[WrittenFile]:
+    """Write ``df`` to every ``{format: path}`` in ``targets``; see the module docstring."""
+    unknown = sorted(set(targets) - set(FORMATS))
+    if unknown:
+        raise ValueError(f"Unsupported output formats {unknown}; choose from {FORMATS}")
+
+    def write_one(fmt: str) -> WrittenFile:
+        return write_bytes(Path(targets[fmt]), RENDERERS[fmt](df), fmt, len(df))
+
+    if len(targets) == 1:
+        return [write_one(next(iter(targets)))]
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        return list(pool.map(write_one, targets))
+
+
+def write_outputs(df: pd.DataFrame, *paths: Path) -> List[WrittenFile]:
+    """``write_frame`` with each format inferred from the path suffix."""
+    targets = {format_for(path): path for path in paths}
+    if len(targets) != len(paths):
+        raise ValueError(f"More than one output per format in {[str(path) for path in paths]}")
+    return write_frame(df, targets)
+
+
+def log_written(written: List[WrittenFile]) -> None:
+    for entry in written:
+        if entry.changed:
+            print(f"[INFO] wrote {entry.rows} rows to {entry.path}")
+        else:
+            print(f"[INFO] {entry.path} unchanged; skipped rewrite")
@@ -0,0 +1,192 @@
+"""Lightweight run instrumentation shared by the pricing and validation scripts.
+
+Each script wraps its ``main`` body in ``instrumented_run`` and marks stages
+with ``span``::
+
+    with instrumented_run("refresh_natcrim_data", args.metrics_json, args.profile):
+        with span("load") as s:
+            df = load_raw_dataframe(path)
+            s.rows_out = len(df)
+
+Spans record wall time, rows in/out/rejected and the process peak RSS when the
+span closes. ``span`` is a no-op outside an instrumented run, so library
+callers (tests, the combined runners) pay nothing for it.
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+METRICS_DIR = PROJECT_ROOT / "reports/metrics"
+HOT_FUNCTION_LIMIT = 15
+
+_ACTIVE_RUN: Optional["RunMetrics"] = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Return the peak resident set size of this process in MiB, if the platform exposes it."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+@dataclass
+class SpanMetrics:
+    name: str
+    seconds: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    rows_rejected: Optional[int] = None
+    peak_rss_mb: Optional[float] = None
+
+    @property
+    def rows_per_sec(self) -> Optional[float]:
+        rows = self.rows_in if self.rows_in is not None else self.rows_out
+        if rows is None or self.seconds <= 0:
+            return None
+        return round(rows / self.seconds, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in {
+            "name": self.name,
+            "seconds": round(self.seconds, 6),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rows_rejected": self.rows_rejected,
+            "rows_per_sec": self.rows_per_sec,
+            "peak_rss_mb": self.peak_rss_mb,
+        }.items() if v is not None}
+
+
+@dataclass
+class RunMetrics:
+    run_name: str
+    started_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    spans: List[SpanMetrics] = field(default_factory=list)
+    hot_functions: List[Dict[str, Any]] = field(default_factory=list)
+    total_seconds: float = 0.0
+    _stack: List[str] = field(default_factory=list, repr=False)
+
+    @contextmanager
+    def span(self, name: str, rows_in: Optional[int] = None) -> Iterator[SpanMetrics]:
+        self._stack.append(name)
+        metrics = SpanMetrics(name="/".join(self._stack), rows_in=rows_in)
+        start = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            metrics.seconds = time.perf_counter() - start
+            metrics.peak_rss_mb = peak_rss_mb()
+            self._stack.pop()
+            self.spans.append(metrics)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "run_name": self.run_name,
+            "started_at": self.started_at,
+            "total_seconds": round(self.total_seconds, 6),
+            "peak_rss_mb": peak_rss_mb(),
+            "spans": [s.to_dict() for s in self.spans],
+        }
+        if self.hot_functions:
+            payload["hot_functions"] = self.hot_functions
+        return payload
+
+    def write(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        return path
+
+
+@contextmanager
+def span(name: str, rows_in: Optional[int] = None) -> Iterator[SpanMetrics]:
+    """Time ``name`` against the active run, or hand back a throwaway span when none is active."""
+    if _ACTIVE_RUN is None:
+        yield SpanMetrics(name=name, rows_in=rows_in)
+        return
+    with _ACTIVE_RUN.span(name, rows_in=rows_in) as metrics:
+        yield metrics
+
+
+def _hot_functions(profiler: cProfile.Profile, limit: int = HOT_FUNCTION_LIMIT) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    entries = []
+    for (filename, lineno, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():  # type: ignore[attr-defined]
+        entries.append({
+            "function": f"{Path(filename).name}:{lineno}({func})",
+            "calls": ncalls,
+            "tottime": round(tottime, 6),
+            "cumtime": round(cumtime, 6),
+        })
+    entries.sort(key=lambda item: item["cumtime"], reverse=True)
+    return entries[:limit]
+
+
+def default_metrics_path(run_name: str) -> Path:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return METRICS_DIR / f"{run_name}_{stamp}.json"
+
+
+@contextmanager
+def instrumented_run(
+    run_name: str,
+    metrics_path: Optional[Path] = None,
+    profile_path: Optional[Path] = None,
+) -> Iterator[RunMetrics]:
+    """Collect spans for one script run and write the metrics JSON (and optional profile) on exit.
+
+    ``profile_path`` receives a ``pstats`` dump that snakeviz, flameprof or
+    ``python -m pstats`` can open; the top functions by cumulative time are
+    also embedded in the metrics JSON.
+    """
+    global _ACTIVE_RUN
+    previous = _ACTIVE_RUN
+    metrics = RunMetrics(run_name)
+    _ACTIVE_RUN = metrics
+    profiler = cProfile.Profile() if profile_path else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler:
+            profiler.disable()
+        metrics.total_seconds = time.perf_counter() - start
+        _ACTIVE_RUN = previous
+        if profiler and profile_path:
+            profile_path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(profile_path))
+            metrics.hot_functions = _hot_functions(profiler)
+            print(f"[INFO] wrote cProfile stats to {profile_path}")
+        written = metrics.write(metrics_path or default_metrics_path(run_name))
+        print(f"[INFO] wrote run metrics to {written}")
+
+
+def add_instrumentation_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--metrics-json",
+        type=Path,
+        help="Where to write the run metrics JSON (default: reports/metrics/<script>_<timestamp>.json)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        help="Write cProfile stats for the run to this path (pstats format)",
+    )
@@ -0,0 +1,231 @@
+"""Canonical state and county keys for pricing and NatCrim jurisdictions.
+
+Jurisdictions arrive as free text in several shapes:
+
+* court fee headers and rows: ``"ALABAMA | Circuit, District ( F/M )"``, ``"Belknap + District"``
+* statewide pricing: ``"AK - All Counties"``
+* statewide coverage guidance: ``"US-AL"``
+* NatCrim coverage scopes: ``"St. John''S County"``, ``"Butts, Lamar & Monroe"``
+
+Everything here maps those strings to ``(state_code, county_key)`` pairs so
+datasets can be joined on exact keys. The normalizers are memoized (the same
+few thousand strings repeat across every refresh), and the ``*_keys`` helpers
+apply them to the unique values of a Series only. pandas is only imported
+when the county universe is loaded, so point lookups stay lightweight.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+COURT_FEES_PATH = PROJECT_ROOT / "data/pricing/informdata_court_access_fees.csv"
+STATEWIDE_SCOPE = "STATEWIDE"
+NATIONAL_CODE = "US"
+
+STATE_MAP: Dict[str, str] = {
+    "AL": "Alabama",
+    "AK": "Alaska",
+    "AZ": "Arizona",
+    "AR": "Arkansas",
+    "CA": "California",
+    "CO": "Colorado",
+    "CT": "Connecticut",
+    "DE": "Delaware",
+    "FL": "Florida",
+    "GA": "Georgia",
+    "HI": "Hawaii",
+    "ID": "Idaho",
+    "IL": "Illinois",
+    "IN": "Indiana",
+    "IA": "Iowa",
+    "KS": "Kansas",
+    "KY": "Kentucky",
+    "LA": "Louisiana",
+    "ME": "Maine",
+    "MD": "Maryland",
+    "MA": "Massachusetts",
+    "MI": "Michigan",
+    "MN": "Minnesota",
+    "MS": "Mississippi",
+    "MO": "Missouri",
+    "MT": "Montana",
+    "NE": "Nebraska",
+    "NV": "Nevada",
+    "NH": "New Hampshire",
+    "NJ": "New Jersey",
+    "NM": "New Mexico",
+    "NY": "New York",
+    "NC": "North Carolina",
+    "ND": "North Dakota",
+    "OH": "Ohio",
+    "OK": "Oklahoma",
+    "OR": "Oregon",
+    "PA": "Pennsylvania",
+    "RI": "Rhode Island",
+    "SC": "South Carolina",
+    "SD": "South Dakota",
+    "TN": "Tennessee",
+    "TX": "Texas",
+    "UT": "Utah",
+    "VT": "Vermont",
+    "VA": "Virginia",
+    "WA": "Washington",
+    "WV": "West Virginia",
+    "WI": "Wisconsin",
+    "WY": "Wyoming",
+    "DC": "District of Columbia",
+    "PR": "Puerto Rico",
+    "GU": "Guam",
+    "VI": "U.S. Virgin Islands",
+    "AS": "American Samoa",
+    "MP": "Northern Mariana Islands",
+    "UK": "United Kingdom",
+}
+
+# Upper-cased names, codes and aliases -> state code
+STATE_CODES: Dict[str, str] = {
+    **{code: code for code in STATE_MAP},
+    **{name.upper(): code for code, name in STATE_MAP.items()},
+    "US VIRGIN ISLANDS": "VI",
+    "VIRGIN ISLANDS": "VI",
+    "WASHINGTON DC": "DC",
+    "WASHINGTON D C": "DC",
+    "UNITED STATES": NATIONAL_CODE,
+    NATIONAL_CODE: NATIONAL_CODE,
+}
+
+COUNTY_ALIASES = {"MIAMIDADE": "DADE"}
+
+_STATE_PREFIX = re.compile(r"^(?:US-)?([A-Z .]+?)\s*(?:\||,|\s-\s|$)")
+_SCOPE_SEPARATORS = re.compile(r"\s*(?:/|&|,|\bAND\b)\s*", re.IGNORECASE)
+_COUNTY_SUFFIX = re.compile(r"\s+(?:CITY AND BOROUGH|CENSUS AREA|COUNTY|PARISH|BOROUGH|MUNICIPALITY)$")
+_NON_ALNUM = re.compile(r"[^A-Z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+_JURISDICTION_COURT_SUFFIX = re.compile(
+    r"\s+(?:All\s+|County\s+|Vegas\s+)?(?:District|Superior|Circuit|Justice|Magistrate|Lower)\b.*$", re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=None)
+def state_code(raw: object) -> Optional[str]:
+    """State code for ``"AL"``, ``"US-AL"``, ``"Alabama"``, ``"ALABAMA | Circuit ..."``, ``"AL - All Counties"`` or ``"AL, Statewide"``."""
+    if not isinstance(raw, str):
+        return None
+    match = _STATE_PREFIX.match(raw.strip().upper())
+    if not match:
+        return None
+    return STATE_CODES.get(match.group(1).replace(".", "").strip())
+
+
+def parse_state_header(header: object) -> Tuple[Optional[str], str]:
+    """Split a court fee header (``"ALABAMA | Circuit, District ( F/M )"``) into state code and court description."""
+    if not isinstance(header, str) or "|" not in header:
+        return None, ""
+    _, _, courts = header.partition("|")
+    return state_code(header), courts.strip()
+
+
+@lru_cache(maxsize=None)
+def county_key(name: object) -> Optional[str]:
+    """Canonical county key: ASCII upper case with no punctuation, spaces or ``County``/``Parish`` suffix.
+
+    ``De Kalb``/``DeKalb`` and ``Saint Johns``/``St. Johns`` collapse to one key.
+    ``City`` is kept so Virginia's independent cities (``Bedford City``) stay
+    distinct from the county of the same name.
+    """
+    if not isinstance(name, str):
+        return None
+    key = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").upper()
+    key = _SPACES.sub(" ", _NON_ALNUM.sub(" ", key.replace("'", ""))).strip()
+    key = re.sub(r"^SAINT ", "ST ", _COUNTY_SUFFIX.sub("", key)).replace(" ", "")
+    return COUNTY_ALIASES.get(key, key) or None
+
+
+@lru_cache(maxsize=None)
+def jurisdiction_county(jurisdiction: object) -> Optional[str]:
+    """County named by a court fee jurisdiction, dropping court qualifiers.
+
+    ``"Belknap + District"`` -> ``Belknap``, ``"Barnstable All District"`` ->
+    ``Barnstable``, ``"Ashley and Hamburg District Court"`` -> ``Ashley``,
+    ``"Clark and Justice Courts"`` -> ``Clark``.
+    Statewide jurisdictions return ``None``.
+    """
+    if not isinstance(jurisdiction, str) or STATEWIDE_SCOPE in jurisdiction.upper():
+        return None
+    name = re.split(r"\s+[+-]\s+", jurisdiction.strip(), maxsplit=1)[0]
+    stripped = _JURISDICTION_COURT_SUFFIX.sub("", name)
+    if stripped != name:
+        # "<County> and <City> District Court": the second name is the court's seat
+        stripped = re.split(r"\s+and(?:\s+|$)", stripped, maxsplit=1, flags=re.IGNORECASE)[0]
+    return stripped.strip() or None
+
+
+def jurisdiction_key(jurisdiction: object) -> Optional[str]:
+    return county_key(jurisdiction_county(jurisdiction))
+
+
+@lru_cache(maxsize=None)
+def scope_counties(scope: object, known: FrozenSet[str] = frozenset()) -> Tuple[str, ...]:
+    """County keys named by a NatCrim coverage scope.
+
+    A scope that is itself a ``known`` county key (``Lewis and Clark``) wins
+    over splitting it into parts (``"Butts, Lamar & Monroe"`` -> three keys).
+    """
+    if not isinstance(scope, str) or scope.strip().upper() == STATEWIDE_SCOPE:
+        return ()
+    whole = county_key(scope)
+    if whole in known:
+        return (whole,)
+    keys = (county_key(part) for part in _SCOPE_SEPARATORS.split(scope))
+    return tuple(key for key in keys if key)
+
+
+@lru_cache(maxsize=None)
+def county_universe(path: Path = COURT_FEES_PATH) -> pd.DataFrame:
+    """``state``/``county_key``/``county_name`` for every county jurisdiction in the court fee schedule."""
+    import pandas as pd
+
+    if not path.exists():
+        return pd.DataFrame(columns=["state", "county_key", "county_name"])
+    fees = pd.read_csv(path, usecols=["state", "jurisdiction"])
+    universe = pd.DataFrame({
+        "state": state_keys(fees["state"]),
+        "county_name": fees["jurisdiction"].map(jurisdiction_county),
+    })
+    universe["county_key"] = county_keys(universe["county_name"])
+    universe = universe.dropna(subset=["state", "county_key"])
+    universe = universe[universe["state"] != NATIONAL_CODE]
+    return universe[["state", "county_key", "county_name"]].drop_duplicates(["state", "county_key"]).reset_index(drop=True)
+
+
+@lru_cache(maxsize=None)
+def known_counties(path: Path = COURT_FEES_PATH) -> Dict[str, FrozenSet[str]]:
+    universe = county_universe(path)
+    return {state: frozenset(keys) for state, keys in universe.groupby("state")["county_key"]}
+
+
+def _map_unique(values: pd.Series, fn: Callable[[object], Optional[str]]) -> pd.Series:
+    uniques = values.dropna().unique()
+    return values.map({value: fn(value) for value in uniques})
+
+
+def state_keys(values: pd.Series) -> pd.Series:
+    """Vectorised :func:`state_code` over the distinct values of ``values``."""
+    return _map_unique(values, state_code)
+
+
+def county_keys(values: pd.Series) -> pd.Series:
+    """Vectorised :func:`county_key` over the distinct values of ``values``."""
+    return _map_unique(values, county_key)
+
+
+def jurisdiction_keys(values: pd.Series) -> pd.Series:
+    """Vectorised :func:`jurisdiction_key` over the distinct values of ``values``."""
+    return _map_unique(values, jurisdiction_key)
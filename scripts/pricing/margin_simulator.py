@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Monte Carlo per-order margin for packages with county criminal searches.
+
+``build_pricing_table`` prices each service against one flat cost, but a
+package that includes criminal searches pays the court and access fees of
+whichever counties the applicant lived in. This simulator samples orders:
+
+* package – uniformly over the configured packages (or ``--package``);
+* search count – the package's ``search_counts`` distribution in
+  ``order_packages.json``, or the empirical one from ``--history``;
+* counties – a home county drawn from the county mix (uniform over the court
+  fee schedule, or address frequencies from ``--history``), and each further
+  address in the home state with ``--same-state`` probability.
+
+Orders are priced with the ``search_routing`` table (one statewide search
+per state for statewide-routed counties, otherwise the county's search cost)
+against the package price: the sum of ``recommended_price`` for its
+``price_services`` in the pricing table. Everything is NumPy arrays of shape ``(orders, searches)``;
+there is no per-order Python.
+
+Usage:
+    python scripts/pricing/margin_simulator.py --orders 1000000 --seed 7 --output reports/margin_simulation.csv
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from jurisdictions import jurisdiction_key, state_code
+from order_cost_engine import ADDRESS_SEPARATOR, ORDER_COLUMNS, PACKAGES_PATH, OrderCostEngine, load_packages
+from search_routing import ROUTE_STATEWIDE, STATEWIDE_KEY, lookup_route
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+PRICING_TABLE_PATH = PROJECT_ROOT / "content/pricing/informdata_pricing_table.csv"
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+DEFAULT_ORDERS = 1_000_000
+DEFAULT_SAME_STATE = 0.7
+HISTORY_CHUNK_SIZE = 500_000
+
+
+@dataclass
+class CountyMix:
+    """Sampling weights and search cost per county; statewide states share one unit per state."""
+
+    states: List[str]
+    county_state: np.ndarray
+    county_unit: np.ndarray
+    unit_cost: np.ndarray
+    weights: np.ndarray
+
+    def __post_init__(self) -> None:
+        order = np.argsort(self.county_state, kind="stable")
+        if not np.array_equal(order, np.arange(len(order))):
+            raise ValueError("CountyMix counties must be grouped by state")
+        self.weights = self.weights / self.weights.sum()
+        self._cdf = np.cumsum(self.weights)
+        state_weight = np.bincount(self.county_state, weights=self.weights, minlength=len(self.states))
+        self._state_start = np.concatenate([[0.0], np.cumsum(state_weight)[:-1]])
+        self._state_weight = state_weight
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return np.minimum(np.searchsorted(self._cdf, rng.random(size) * self._cdf[-1], side="right"), len(self._cdf) - 1)
+
+    def sample_within(self, rng: np.random.Generator, states: np.ndarray) -> np.ndarray:
+        """One county per entry of ``states``, drawn from that state's share of the mix."""
+        target = self._state_start[states] + rng.random(states.shape) * self._state_weight[states]
+        counties = np.minimum(np.searchsorted(self._cdf, target, side="right"), len(self._cdf) - 1)
+        # Guard against float drift across a state boundary
+        return np.where(self.county_state[counties] == states, counties, self._first_county[states])
+
+    @property
+    def _first_county(self) -> np.ndarray:
+        return np.searchsorted(self.county_state, np.arange(len(self.states)))
+
+
+def county_mix(engine: OrderCostEngine, weights: Optional[Dict[Tuple[str, str], float]] = None) -> CountyMix:
+    """Mix over the routing table's counties; ``weights`` keyed by ``(state, county_key)`` (missing counties get 0)."""
+    counties = sorted(key for key in engine.routes if key[1] != STATEWIDE_KEY)
+    if weights:
+        counties = sorted(set(counties) | {key for key in weights if lookup_route(engine.routes, *key)})
+    states = sorted({state for state, _ in counties})
+    state_pos = {state: i for i, state in enumerate(states)}
+
+    unit_keys: Dict[str, int] = {}
+    unit_cost: List[float] = []
+    county_unit = np.empty(len(counties), dtype=np.int64)
+    for i, (state, key) in enumerate(counties):
+        route, cost = lookup_route(engine.routes, state, key)
+        unit = f"{state}:*" if route == ROUTE_STATEWIDE else f"{state}:{key}"
+        if unit not in unit_keys:
+            unit_keys[unit] = len(unit_cost)
+            unit_cost.append(cost)
+        county_unit[i] = unit_keys[unit]
+
+    mix_weights = np.ones(len(counties)) if not weights else np.array([weights.get(key, 0.0) for key in counties], dtype=float)
+    if mix_weights.sum() <= 0:
+        raise ValueError("County mix has no weight on any priced county")
+    return CountyMix(
+        states=states,
+        county_state=np.array([state_pos[state] for state, _ in counties], dtype=np.int64),
+        county_unit=county_unit,
+        unit_cost=np.asarray(unit_cost, dtype=float),
+        weights=mix_weights,
+    )
+
+
+def history_distributions(orders_path: Path, chunk_size: int = HISTORY_CHUNK_SIZE) -> Tuple[Dict[Tuple[str, str], float], Dict[str, Dict[int, float]]]:
+    """County frequencies and per-package distinct-county counts from an ``order_cost_engine`` input file."""
+    county_counts: Dict[Tuple[str, str], float] = {}
+    search_counts: Dict[str, Dict[int, float]] = {}
+    resolved: Dict[str, Optional[Tuple[str, str]]] = {}
+    for chunk in pd.read_csv(orders_path, usecols=ORDER_COLUMNS, dtype=str, chunksize=chunk_size):
+        chunk = chunk.reset_index(drop=True)
+        tokens = chunk["addresses"].astype("string").str.split(ADDRESS_SEPARATOR).explode().str.strip().dropna()
+        tokens = tokens[tokens.ne("")]
+        for token in tokens.unique():
+            if token not in resolved:
+                state_part, _, county_part = token.partition(":")
+                state, county = state_code(state_part), jurisdiction_key(county_part)
+                resolved[token] = (state, county) if state and county else None
+        keys = pd.DataFrame({"row": tokens.index, "key": tokens.map(resolved).to_numpy()}).dropna().drop_duplicates()
+        for key, count in keys["key"].value_counts().items():
+            county_counts[key] = county_counts.get(key, 0.0) + float(count)
+        per_order = keys.groupby("row").size().reindex(chunk.index, fill_value=0)
+        package = chunk["package"].astype("string").str.strip().str.upper()
+        for (name, searches), count in per_order.groupby([package, per_order]).size().items():
+            if searches:
+                package_counts = search_counts.setdefault(name, {})
+                package_counts[int(searches)] = package_counts.get(int(searches), 0.0) + float(count)
+    return county_counts, search_counts
+
+
+def package_prices(packages: Dict[str, dict], pricing_table: pd.DataFrame) -> Dict[str, float]:
+    """Sell price per package: summed ``recommended_price`` of its ``price_services`` (default: its services)."""
+    price = pricing_table.set_index("service_id")["recommended_price"].astype(float)
+    prices: Dict[str, float] = {}
+    for name, config in packages.items():
+        services = list(config.get("price_services") or config.get("services", []))
+        unknown = sorted(set(services) - set(price.index))
+        if unknown:
+            raise ValueError(f"Package {name} prices unknown services: {unknown}")
+        prices[name] = round(float(price[services].sum()), 2)
+    return prices
+
+
+def _count_cdf(distribution: Dict, max_searches: int) -> np.ndarray:
+    pmf = np.zeros(max_searches + 1)
+    for searches, weight in distribution.items():
+        pmf[int(searches)] += float(weight)
+    if pmf.sum() <= 0:
+        pmf[0] = 1.0
+    return np.cumsum(pmf / pmf.sum())
+
+
+@dataclass
+class Simulation:
+    packages: List[str]
+    states: List[str]
+    package: np.ndarray
+    searches: np.ndarray
+    search_cost: np.ndarray
+    margin: np.ndarray
+    price: np.ndarray
+    order_states: Tuple[np.ndarray, np.ndarray]
+
+
+def simulate(
+    engine: OrderCostEngine,
+    mix: CountyMix,
+    prices: Dict[str, float],
+    search_counts: Dict[str, Dict],
+    orders: int = DEFAULT_ORDERS,
+    same_state: float = DEFAULT_SAME_STATE,
+    seed: int = 0,
+    packages: Optional[Sequence[str]] = None,
+) -> Simulation:
+    """Sample and price ``orders`` orders; identical arguments and ``seed`` give identical results."""
+    names = sorted(packages or prices)
+    missing = sorted(set(names) - (set(prices) & set(engine.package_cost)))
+    if missing:
+        raise ValueError(f"Unknown packages: {missing}")
+    rng = np.random.default_rng(seed)
+
+    max_searches = max([int(k) for name in names for k in search_counts.get(name, {})] + [0])
+    cdfs = np.stack([
+        _count_cdf(search_counts.get(name, {}) if engine.package_searches.get(name) else {}, max_searches) for name in names
+    ])
+    package = rng.integers(0, len(names), size=orders)
+    count = (rng.random(orders)[:, None] >= cdfs[package]).sum(axis=1)
+    count = np.minimum(count, max_searches)
+
+    counties = np.empty((orders, max(max_searches, 1)), dtype=np.int64)
+    counties[:, 0] = mix.sample(rng, orders)
+    if max_searches > 1:
+        home = np.repeat(mix.county_state[counties[:, :1]], max_searches - 1, axis=1)
+        stay = rng.random(home.shape) < same_state
+        elsewhere = mix.sample(rng, home.size).reshape(home.shape)
+        counties[:, 1:] = np.where(stay, mix.sample_within(rng, home), elsewhere)
+    valid = np.arange(counties.shape[1]) < count[:, None]
+
+    # One search per distinct unit per order: sort units per row and keep first occurrences
+    sentinel = len(mix.unit_cost)
+    units = np.sort(np.where(valid, mix.county_unit[counties], sentinel), axis=1)
+    first = units != sentinel
+    first[:, 1:] &= units[:, 1:] != units[:, :-1]
+    unit_cost = np.append(mix.unit_cost, 0.0)
+    search_cost = (unit_cost[units] * first).sum(axis=1)
+
+    price = np.array([prices[name] for name in names])[package]
+    component = np.array([engine.package_cost[name] for name in names])[package]
+    margin = price - component - search_cost
+
+    states = np.where(valid, mix.county_state[counties], -1)
+    pairs = np.unique((np.arange(orders)[:, None] * len(mix.states) + states)[valid])
+    return Simulation(
+        packages=names,
+        states=mix.states,
+        package=package,
+        searches=first.sum(axis=1),
+        search_cost=search_cost,
+        margin=margin,
+        price=price,
+        order_states=(pairs // len(mix.states), pairs % len(mix.states)),
+    )
+
+
+def group_quantiles(groups: np.ndarray, values: np.ndarray, n_groups: int, quantiles: Sequence[float] = QUANTILES) -> np.ndarray:
+    """``(n_groups, len(quantiles))`` linear-interpolated quantiles of ``values`` per group (NaN for empty groups)."""
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    out = np.full((n_groups, len(quantiles)), np.nan)
+    present = counts > 0
+    for j, q in enumerate(quantiles):
+        position = q * (counts[present] - 1)
+        low = np.floor(position).astype(np.int64)
+        high = np.minimum(low + 1, counts[present] - 1)
+        frac = position - low
+        base = starts[present]
+        out[present, j] = ordered[base + low] * (1 - frac) + ordered[base + high] * frac
+    return out
+
+
+def _group_report(kind: str, labels: Sequence[str], groups: np.ndarray, sim: Simulation, orders: np.ndarray) -> pd.DataFrame:
+    n = len(labels)
+    margin = sim.margin[orders]
+    count = np.bincount(groups, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        report = pd.DataFrame({
+            "group_type": kind,
+            "group": labels,
+            "orders": count,
+            "mean_searches": np.bincount(groups, weights=sim.searches[orders], minlength=n) / count,
+            "mean_search_cost": np.bincount(groups, weights=sim.search_cost[orders], minlength=n) / count,
+            "mean_price": np.bincount(groups, weights=sim.price[orders], minlength=n) / count,
+            "mean_margin": np.bincount(groups, weights=margin, minlength=n) / count,
+        })
+        quantiles = group_quantiles(groups, margin, n)
+        for j, q in enumerate(QUANTILES):
+            report[f"margin_p{int(round(q * 100)):02d}"] = quantiles[:, j]
+        report["loss_probability"] = np.bincount(groups, weights=margin < 0, minlength=n) / count
+        report["mean_margin_pct"] = report["mean_margin"] / report["mean_price"]
+    return report[report["orders"] > 0]
+
+
+def summarize(sim: Simulation) -> pd.DataFrame:
+    """Margin distribution per package and per state (an order counts once in every state it searches)."""
+    orders = np.arange(len(sim.margin))
+    by_package = _group_report("package", sim.packages, sim.package, sim, orders)
+    order_index, state_index = sim.order_states
+    by_state = _group_report("state", sim.states, state_index, sim, order_index)
+    return pd.concat([by_package, by_state], ignore_index=True).round(4)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate per-order margin distributions for search packages")
+    parser.add_argument("--orders", type=int, default=DEFAULT_ORDERS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--package", action="append", default=[], help="Restrict to package; repeatable")
+    parser.add_argument("--same-state", type=float, default=DEFAULT_SAME_STATE, help="Probability a further address stays in the home state")
+    parser.add_argument("--history", type=Path, help="Orders CSV (order_cost_engine input) to take county mix and search counts from")
+    parser.add_argument("--pricing-table", type=Path, default=PRICING_TABLE_PATH)
+    parser.add_argument("--packages", type=Path, default=PACKAGES_PATH)
+    parser.add_argument("--output", type=Path, help="Report CSV (default: stdout)")
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    with instrumented_run("margin_simulator", args.metrics_json, args.profile):
+        with span("load"):
+            packages = load_packages(args.packages)
+            try:
+                engine = OrderCostEngine.from_files(packages_path=args.packages)
+                prices = package_prices(packages, pd.read_csv(args.pricing_table))
+            except ValueError as exc:
+                raise SystemExit(str(exc))
+            weights, search_counts = None, {name: config.get("search_counts", {}) for name, config in packages.items()}
+            if args.history:
+                weights, observed = history_distributions(args.history)
+                search_counts.update(observed)
+            mix = county_mix(engine, weights)
+        with span("simulate", rows_in=args.orders):
+            try:
+                sim = simulate(engine, mix, prices, search_counts, args.orders, args.same_state, args.seed, args.package)
+            except ValueError as exc:
+                raise SystemExit(str(exc))
+        report = summarize(sim)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        report.to_csv(args.output, index=False)
+        print(f"[INFO] wrote {len(report)} margin rows for {args.orders:,} simulated orders to {args.output}")
+    else:
+        report.to_csv(sys.stdout, index=False)
+
+
+if __name__ == "__main__":
+    main()
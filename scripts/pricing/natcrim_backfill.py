@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""Rebuild NatCrim history from an archive of SecureShare workbooks, several snapshots at a time.
+
+Each workbook's snapshot date comes from its file name (``..._2025-10-03.xlsx``
+or SecureShare's ``... as of 10.3.25.xlsx``). Snapshots run in a process pool
+and go through the same ``refresh_snapshot`` as refresh_natcrim_data.py, except
+that shards are never published: the shard manifest tracks the latest
+snapshot only.
+
+A worker writes its outputs into a private staging directory and then renames
+each file into ``content/pricing`` / ``reports``. Readers see either the old or
+the new file, never a partial one; the Parquet dataset directory is swapped with
+two renames. The manifest ``reports/backfill/natcrim_<date>.json`` goes last.
+It records a fingerprint of the workbook, the refresh code and reference inputs,
+the legacy export and the options, plus a hash of every output. A snapshot whose
+manifest fingerprint still matches and whose outputs are intact is skipped,
+so an interrupted backfill picks up where it stopped (``--force`` reruns everything).
+
+Usage:
+    python scripts/pricing/natcrim_backfill.py --input ~/archive/secureshare/ --workers 4
+    python scripts/pricing/natcrim_backfill.py --input "data/pricing/informdata_natcrim_raw_*.xlsx" --force
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from natcrim_parquet import COMPRESSION_CODECS, DEFAULT_COMPRESSION
+from natcrim_reconcile import export_paths
+from refresh_natcrim_data import CONTENT_DIR, PROJECT_ROOT, REPORTS_DIR, refresh_snapshot, snapshot_date_from_name
+
+MANIFEST_DIR = REPORTS_DIR / "backfill"
+STAGING_DIRNAME = ".staging"
+WORKBOOK_SUFFIXES = (".xlsx", ".xlsm", ".xls")
+PIPELINE_ENTRY = Path(__file__).with_name("refresh_natcrim_data.py")
+# Reference data that changes what a refresh writes; the code inputs come from pipeline_modules()
+PIPELINE_DATA = [
+    "config/natcrim_scope_overrides.csv",
+    "content/pricing/informdata_statewide_coverage.csv",
+    "data/pricing/informdata_court_access_fees.csv",
+]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    workbook: Path
+    stamp: str
+
+
+@dataclass(frozen=True)
+class BackfillOptions:
+    parquet_compression: str = DEFAULT_COMPRESSION
+    reconcile_abs_tolerance: float = 0
+    reconcile_rel_tolerance: float = 0.0
+
+
+@dataclass(frozen=True)
+class BackfillJob:
+    snapshot: Snapshot
+    fingerprint: str
+    options: BackfillOptions
+    content_dir: Path
+    reports_dir: Path
+    manifest_dir: Path
+
+
+@dataclass
+class BackfillResult:
+    stamp: str
+    status: str  # "done" | "skipped" | "failed"
+    workbook: str = ""
+    sources: int = 0
+    total_records: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    outputs: Dict[str, str] = field(default_factory=dict)
+
+
+def discover_workbooks(inputs: Sequence[str]) -> List[Snapshot]:
+    """Workbooks named by ``inputs`` (files, directories or glob patterns), one per snapshot date, oldest first."""
+    paths: List[Path] = []
+    for item in inputs:
+        path = Path(item).expanduser()
+        if path.is_dir():
+            paths.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in WORKBOOK_SUFFIXES))
+        elif glob.has_magic(item):
+            paths.extend(sorted(Path(p) for p in glob.glob(str(path), recursive=True)))
+        elif path.exists():
+            paths.append(path)
+        else:
+            raise ValueError(f"Workbook not found: {item}")
+
+    by_stamp: Dict[str, Path] = {}
+    undated: List[str] = []
+    for path in dict.fromkeys(p.resolve() for p in paths if not p.name.startswith("~$")):
+        snapshot = snapshot_date_from_name(path)
+        if snapshot is None:
+            undated.append(path.name)
+            continue
+        stamp = snapshot.isoformat()
+        if stamp in by_stamp:
+            raise ValueError(f"Two workbooks for snapshot {stamp}: {by_stamp[stamp].name} and {path.name}")
+        by_stamp[stamp] = path
+    if undated:
+        raise ValueError(f"Cannot infer a snapshot date from: {', '.join(sorted(undated))}")
+    if not by_stamp:
+        raise ValueError(f"No workbooks found in {list(inputs)}")
+    return [Snapshot(by_stamp[stamp], stamp) for stamp in sorted(by_stamp)]
+
+
+def _digest(path: Path) -> str:
+    """SHA-256 of a file, or of the relative names and contents of every file under a directory."""
+    digest = hashlib.sha256()
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    for file in files:
+        if path.is_dir():
+            digest.update(str(file.relative_to(path)).encode("utf-8") + b"\0")
+        with file.open("rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def pipeline_modules(entry: Path = PIPELINE_ENTRY) -> List[Path]:
+    """``entry`` plus every sibling module it imports, directly or through other siblings."""
+    found: Dict[str, Path] = {}
+    pending = [entry]
+    while pending:
+        path = pending.pop()
+        if path.stem in found:
+            continue
+        found[path.stem] = path
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+            # Function-level imports count too: the refresh imports some modules lazily
+            pending.extend(sibling for sibling in (path.with_name(name.split(".")[0] + ".py") for name in names) if sibling.exists())
+    return sorted(found.values())
+
+
+def pipeline_inputs(root: Path = PROJECT_ROOT) -> List[str]:
+    """Everything besides the workbook that changes what a refresh writes, relative to ``root``."""
+    return [path.resolve().relative_to(root).as_posix() for path in pipeline_modules()] + PIPELINE_DATA
+
+
+def pipeline_digest(root: Path = PROJECT_ROOT) -> str:
+    digest = hashlib.sha256()
+    for relative in pipeline_inputs(root):
+        path = root / relative
+        digest.update(f"{relative}:{_digest(path) if path.exists() else 'missing'}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def fingerprint(snapshot: Snapshot, options: BackfillOptions, pipeline: str) -> str:
+    legacy = export_paths(snapshot.stamp, CONTENT_DIR)
+    payload = {
+        "workbook": _digest(snapshot.workbook),
+        "pipeline": pipeline,
+        "legacy": {name: _digest(legacy[name]) for name in ("legacy_sources", "legacy_totals") if legacy[name].exists()},
+        "options": asdict(options),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def manifest_path(stamp: str, manifest_dir: Path = MANIFEST_DIR) -> Path:
+    return manifest_dir / f"natcrim_{stamp}.json"
+
+
+def _display(path: Path) -> str:
+    return str(path.relative_to(PROJECT_ROOT)) if path.is_relative_to(PROJECT_ROOT) else str(path)
+
+
+def is_current(job: BackfillJob) -> bool:
+    """True when the manifest fingerprint matches and every recorded output is unchanged on disk."""
+    path = manifest_path(job.snapshot.stamp, job.manifest_dir)
+    if not path.exists():
+        return False
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("fingerprint") != job.fingerprint:
+        return False
+    for output in manifest.get("outputs", {}).values():
+        target = Path(output["path"])
+        target = target if target.is_absolute() else PROJECT_ROOT / target
+        if not target.exists() or _digest(target) != output["sha256"]:
+            return False
+    return True
+
+
+def _replace(staged: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not staged.is_dir():
+        os.replace(staged, target)
+        return
+    retired = target.with_name(target.name + ".old")
+    shutil.rmtree(retired, ignore_errors=True)
+    if target.exists():
+        os.replace(target, retired)
+    os.replace(staged, target)
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def run_job(job: BackfillJob) -> BackfillResult:
+    """Refresh one snapshot into staging, move the outputs into place and write its manifest."""
+    snapshot = job.snapshot
+    start = time.perf_counter()
+    staging = job.manifest_dir / STAGING_DIRNAME / f"{snapshot.stamp}-{os.getpid()}"
+    staged_content, staged_reports = staging / "content", staging / "reports"
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        outputs, clean_df = refresh_snapshot(
+            snapshot.workbook,
+            snapshot.stamp,
+            job.options.parquet_compression,
+            reconcile_abs_tolerance=job.options.reconcile_abs_tolerance,
+            reconcile_rel_tolerance=job.options.reconcile_rel_tolerance,
+            content_dir=staged_content,
+            reports_dir=staged_reports,
+        )
+        recorded: Dict[str, Dict[str, str]] = {}
+        for label, staged in outputs.items():
+            if staged.is_relative_to(staged_content):
+                target = job.content_dir / staged.relative_to(staged_content)
+            else:
+                target = job.reports_dir / staged.relative_to(staged_reports)
+            digest = _digest(staged)
+            _replace(staged, target)
+            recorded[label] = {"path": _display(target), "sha256": digest}
+
+        result = BackfillResult(
+            snapshot.stamp,
+            "done",
+            snapshot.workbook.name,
+            sources=len(clean_df),
+            total_records=int(clean_df["record_count"].sum()),
+            seconds=round(time.perf_counter() - start, 3),
+            outputs={label: entry["path"] for label, entry in recorded.items()},
+        )
+        manifest = {
+            "snapshot": snapshot.stamp,
+            "workbook": _display(snapshot.workbook),
+            "fingerprint": job.fingerprint,
+            "options": asdict(job.options),
+            "completed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "sources": result.sources,
+            "total_records": result.total_records,
+            "outputs": recorded,
+        }
+        # The manifest is the commit marker: written last, so a crash before this point reruns the snapshot
+        path = manifest_path(snapshot.stamp, job.manifest_dir)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+        tmp.replace(path)
+        return result
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def backfill(
+    snapshots: Sequence[Snapshot],
+    workers: int = 1,
+    options: BackfillOptions = BackfillOptions(),
+    force: bool = False,
+    content_dir: Path = CONTENT_DIR,
+    reports_dir: Path = REPORTS_DIR,
+    manifest_dir: Path = MANIFEST_DIR,
+) -> List[BackfillResult]:
+    """Refresh every snapshot not already current; ``workers`` > 1 runs them in a process pool."""
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    (manifest_dir / STAGING_DIRNAME).mkdir(parents=True, exist_ok=True)
+    pipeline = pipeline_digest()
+    results: List[BackfillResult] = []
+    pending: List[BackfillJob] = []
+    for snapshot in snapshots:
+        job = BackfillJob(snapshot, fingerprint(snapshot, options, pipeline), options, content_dir, reports_dir, manifest_dir)
+        if not force and is_current(job):
+            print(f"[INFO] {snapshot.stamp}: outputs match fingerprint; skipping")
+            results.append(BackfillResult(snapshot.stamp, "skipped", snapshot.workbook.name))
+        else:
+            pending.append(job)
+
+    def report(result: BackfillResult) -> None:
+        results.append(result)
+        done = sum(1 for r in results if r.status != "skipped")
+        if result.status == "failed":
+            print(f"[ERROR] [{done}/{len(pending)}] {result.stamp} ({result.workbook}): {result.error}")
+        else:
+            print(
+                f"[INFO] [{done}/{len(pending)}] {result.stamp}: {result.sources:,} sources, "
+                f"{result.total_records:,} records in {result.seconds:.1f}s"
+            )
+
+    if workers == 1 or len(pending) <= 1:
+        for job in pending:
+            try:
+                report(run_job(job))
+            except Exception as exc:  # noqa: BLE001 - keep going with the other snapshots
+                report(BackfillResult(job.snapshot.stamp, "failed", job.snapshot.workbook.name, error=str(exc)))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            futures = {pool.submit(run_job, job): job for job in pending}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    report(future.result())
+                except Exception as exc:  # noqa: BLE001
+                    report(BackfillResult(job.snapshot.stamp, "failed", job.snapshot.workbook.name, error=str(exc)))
+    return sorted(results, key=lambda r: r.stamp)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill NatCrim snapshots from archived SecureShare workbooks in parallel")
+    parser.add_argument("--input", nargs="+", required=True, help="Workbook files, directories or glob patterns")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="Worker processes (default: up to 4)")
+    parser.add_argument("--force", action="store_true", help="Rerun snapshots even when their outputs match the fingerprint")
+    parser.add_argument("--parquet-compression", choices=COMPRESSION_CODECS, default=DEFAULT_COMPRESSION)
+    parser.add_argument("--reconcile-abs-tolerance", type=float, default=0)
+    parser.add_argument("--reconcile-rel-tolerance", type=float, default=0.0)
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    options = BackfillOptions(args.parquet_compression, args.reconcile_abs_tolerance, args.reconcile_rel_tolerance)
+    with instrumented_run("natcrim_backfill", args.metrics_json, args.profile):
+        try:
+            snapshots = discover_workbooks(args.input)
+            print(f"[INFO] {len(snapshots)} snapshot(s) from {snapshots[0].stamp} to {snapshots[-1].stamp}; {args.workers} worker(s)")
+            with span("backfill", rows_in=len(snapshots)) as backfill_span:
+                results = backfill(snapshots, args.workers, options, args.force)
+                backfill_span.rows_out = sum(1 for r in results if r.status == "done")
+                backfill_span.rows_rejected = sum(1 for r in results if r.status == "failed")
+        except ValueError as exc:
+            raise SystemExit(str(exc))
+
+    counts = {status: sum(1 for r in results if r.status == status) for status in ("done", "skipped", "failed")}
+    print(f"[INFO] backfill finished: {counts['done']} refreshed, {counts['skipped']} skipped, {counts['failed']} failed")
+    if counts["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""County-level coverage index over the classified NatCrim source list.
+
+Every source row's ``coverage_scope`` is resolved to canonical county IDs
+(``<STATE>:<COUNTY KEY>``, e.g. ``TX:HARRIS``) with the shared ``jurisdictions``
+canonicalizer. The county universe per state is the court access fee schedule,
+which lists every county jurisdiction we can order, plus any county named in
+NatCrim scopes for states the fee schedule does not cover.
+
+Per county the index keeps:
+
+* ``type_mask`` – bitset of record types with a county-scoped source
+* ``sources`` – bitset (Python int) of covering source IDs
+* ``newest`` – newest refresh date per record type
+
+Statewide sources are kept per state and OR-ed in on request, so queries such
+as "TX counties with COURT but no DOC" are a couple of vectorised mask
+operations over a few thousand counties instead of a rescan of the rows.
+
+Usage:
+    python scripts/pricing/natcrim_coverage_index.py \
+        --sources content/pricing/natcrim_sources_2025-10-03.csv \
+        --state TX --has COURT --lacks DOC
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from jurisdictions import STATEWIDE_SCOPE, county_universe, scope_counties
+
+RECORD_TYPES = ["ARREST", "COURT", "DOC", "SOR", "SWL", "WARRANT"]
+
+
+def _bits(values: Iterable[str], vocabulary: Sequence[str]) -> int:
+    mask = 0
+    for value in values:
+        mask |= 1 << vocabulary.index(value)
+    return mask
+
+
+@dataclass
+class CoverageIndex:
+    county_ids: List[str]
+    county_names: List[str]
+    states: np.ndarray
+    record_types: List[str]
+    type_mask: np.ndarray
+    newest: np.ndarray
+    sources: List[int]
+    source_names: List[str]
+    statewide_mask: Dict[str, int]
+    unresolved: pd.DataFrame
+    positions: Dict[str, int]
+
+    def __len__(self) -> int:
+        return len(self.county_ids)
+
+    def mask_for(self, record_types: Sequence[str]) -> int:
+        unknown = sorted(set(record_types) - set(self.record_types))
+        if unknown:
+            raise ValueError(f"Unknown record types: {unknown}")
+        return _bits(record_types, self.record_types)
+
+    def coverage_mask(self, include_statewide: bool = False) -> np.ndarray:
+        if not include_statewide:
+            return self.type_mask
+        statewide = np.array([self.statewide_mask.get(state, 0) for state in self.states], dtype=self.type_mask.dtype)
+        return self.type_mask | statewide
+
+    def select(
+        self,
+        states: Optional[Sequence[str]] = None,
+        has: Sequence[str] = (),
+        lacks: Sequence[str] = (),
+        include_statewide: bool = False,
+    ) -> np.ndarray:
+        """Positions of counties in ``states`` covered for every type in ``has`` and none in ``lacks``.
+
+        With no ``has``/``lacks`` an empty ``has`` selects all counties; use
+        :meth:`uncovered` for counties with no county-level source at all.
+        """
+        coverage = self.coverage_mask(include_statewide)
+        selected = np.ones(len(self), dtype=bool)
+        if states:
+            selected &= np.isin(self.states, [s.upper() for s in states])
+        need, avoid = self.mask_for(has), self.mask_for(lacks)
+        if need:
+            selected &= (coverage & need) == need
+        if avoid:
+            selected &= (coverage & avoid) == 0
+        return np.flatnonzero(selected)
+
+    def uncovered(self, states: Optional[Sequence[str]] = None, include_statewide: bool = False) -> np.ndarray:
+        positions = self.select(states)
+        return positions[self.coverage_mask(include_statewide)[positions] == 0]
+
+    def covering_sources(self, county_id: str) -> List[str]:
+        position = self.positions.get(county_id)
+        if position is None:
+            raise ValueError(f"Unknown county id: {county_id}")
+        bitmap, names = self.sources[position], []
+        while bitmap:
+            low = bitmap & -bitmap
+            names.append(self.source_names[low.bit_length() - 1])
+            bitmap ^= low
+        return names
+
+    def frame(self, positions: Optional[np.ndarray] = None, include_statewide: bool = False) -> pd.DataFrame:
+        """Tabular view: one row per county with covered types, source count and newest refresh per type."""
+        positions = np.arange(len(self)) if positions is None else positions
+        coverage = self.coverage_mask(include_statewide)[positions]
+        out = pd.DataFrame({
+            "county_id": [self.county_ids[i] for i in positions],
+            "state": self.states[positions],
+            "county_name": [self.county_names[i] for i in positions],
+            "record_types": [
+                ",".join(t for bit, t in enumerate(self.record_types) if mask >> bit & 1) for mask in coverage
+            ],
+            "source_count": [bin(self.sources[i]).count("1") for i in positions],
+        })
+        for bit, record_type in enumerate(self.record_types):
+            newest = self.newest[positions, bit]
+            out[f"newest_{record_type.lower()}"] = pd.Series(newest).dt.strftime("%Y-%m-%d").where(~np.isnat(newest), None)
+        return out
+
+
+def build_index(
+    scoped_df: pd.DataFrame,
+    universe: Optional[pd.DataFrame] = None,
+    record_types: Sequence[str] = RECORD_TYPES,
+) -> CoverageIndex:
+    """Resolve every row's ``coverage_scope`` to counties and aggregate per-county bitsets."""
+    record_types = list(record_types) + sorted(set(scoped_df["record_type"].dropna()) - set(record_types))
+    if universe is None:
+        universe = county_universe()
+
+    rows = scoped_df.dropna(subset=["standardized_state"])
+    is_statewide = rows["coverage_scope"].astype("string").str.strip().str.upper().eq(STATEWIDE_SCOPE).fillna(False)
+
+    statewide_mask: Dict[str, int] = {}
+    for (state, record_type), _ in rows[is_statewide].groupby(["standardized_state", "record_type"]):
+        statewide_mask[state] = statewide_mask.get(state, 0) | (1 << record_types.index(record_type))
+
+    known_keys = {state: frozenset(keys) for state, keys in universe.groupby("state")["county_key"]}
+    scopes = rows.loc[~is_statewide, ["standardized_state", "coverage_scope"]].drop_duplicates()
+    scopes["county_key"] = [
+        list(scope_counties(scope, known_keys.get(state, frozenset()))) for state, scope in zip(scopes["standardized_state"], scopes["coverage_scope"])
+    ]
+    scoped = rows[~is_statewide].merge(scopes, on=["standardized_state", "coverage_scope"], how="left")
+    scoped = scoped.explode("county_key").dropna(subset=["county_key"])
+
+    in_universe = np.array(
+        [key in known_keys.get(state, ()) for state, key in zip(scoped["standardized_state"], scoped["county_key"])], dtype=bool
+    )
+    # States missing from the fee sheet fall back to the counties named in NatCrim itself
+    fallback = ~in_universe & ~scoped["standardized_state"].isin(known_keys).to_numpy()
+    unresolved = scoped[~in_universe & ~fallback][["standardized_state", "record_type", "source_name", "coverage_scope"]]
+    resolved = scoped[in_universe | fallback]
+    extra = scoped[fallback][["standardized_state", "county_key"]].drop_duplicates()
+
+    names = universe.set_index(["state", "county_key"])["county_name"].to_dict()
+    counties = pd.concat(
+        [universe[["state", "county_key"]], extra.rename(columns={"standardized_state": "state"})], ignore_index=True
+    ).drop_duplicates().sort_values(["state", "county_key"]).reset_index(drop=True)
+    county_ids = (counties["state"] + ":" + counties["county_key"]).tolist()
+    position = {county_id: i for i, county_id in enumerate(county_ids)}
+
+    source_names = sorted(resolved["source_name"].dropna().unique().tolist())
+    source_position = {name: i for i, name in enumerate(source_names)}
+
+    type_mask = np.zeros(len(county_ids), dtype=np.uint32)
+    newest = np.full((len(county_ids), len(record_types)), np.datetime64("NaT"), dtype="datetime64[D]")
+    sources = [0] * len(county_ids)
+
+    resolved = resolved.assign(
+        county_pos=(resolved["standardized_state"] + ":" + resolved["county_key"]).map(position),
+        type_pos=resolved["record_type"].map({t: i for i, t in enumerate(record_types)}),
+        refresh=pd.to_datetime(resolved["refresh_date"], errors="coerce"),
+    )
+    cells = resolved.groupby(["county_pos", "type_pos"]).agg(refresh=("refresh", "max")).reset_index()
+    np.bitwise_or.at(type_mask, cells["county_pos"].to_numpy(), (1 << cells["type_pos"].to_numpy()).astype(np.uint32))
+    newest[cells["county_pos"].to_numpy(), cells["type_pos"].to_numpy()] = cells["refresh"].to_numpy().astype("datetime64[D]")
+    for county_pos, names_in_county in resolved.dropna(subset=["source_name"]).groupby("county_pos")["source_name"]:
+        bitmap = 0
+        for name in set(names_in_county):
+            bitmap |= 1 << source_position[name]
+        sources[county_pos] = bitmap
+
+    county_names = [
+        names.get((state, key), key.title()) for state, key in zip(counties["state"], counties["county_key"])
+    ]
+    return CoverageIndex(
+        county_ids=county_ids,
+        county_names=county_names,
+        states=counties["state"].to_numpy(dtype=object),
+        record_types=record_types,
+        type_mask=type_mask,
+        newest=newest,
+        sources=sources,
+        source_names=source_names,
+        statewide_mask=statewide_mask,
+        unresolved=unresolved.reset_index(drop=True),
+        positions=position,
+    )
+
+
+def main() -> None:
+    from publish_natcrim_shards import read_sources
+    from refresh_natcrim_data import scope_dataframe  # imports this module; keep lazy
+
+    parser = argparse.ArgumentParser(description="Query county-level NatCrim coverage")
+    parser.add_argument("--sources", type=Path, required=True, help="natcrim_sources CSV/Parquet export")
+    parser.add_argument("--state", action="append", default=[], help="Restrict to state code; repeatable")
+    parser.add_argument("--has", default="", help="Comma-separated record types every county must have")
+    parser.add_argument("--lacks", default="", help="Comma-separated record types counties must not have")
+    parser.add_argument("--uncovered", action="store_true", help="Counties with no county-level source of any type")
+    parser.add_argument("--include-statewide", action="store_true", help="Count statewide sources as covering every county")
+    args = parser.parse_args()
+
+    index = build_index(scope_dataframe(read_sources(args.sources)))
+    has = [t.strip().upper() for t in args.has.split(",") if t.strip()]
+    lacks = [t.strip().upper() for t in args.lacks.split(",") if t.strip()]
+    try:
+        if args.uncovered:
+            positions = index.uncovered(args.state, args.include_statewide)
+        else:
+            positions = index.select(args.state, has, lacks, args.include_statewide)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    index.frame(positions, args.include_statewide).to_csv(sys.stdout, index=False)
+
+
+if __name__ == "__main__":
+    main()
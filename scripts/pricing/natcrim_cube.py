@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Single-pass rollup cube over the classified NatCrim source list.
+
+The cube groups the scoped frame once by state, record type, coverage domain,
+court level and refresh-age bucket. Each cell keeps the record sum, row count,
+oldest/newest refresh date and the sorted list of distinct source names, so
+any coarser slice (state totals, state × domain source counts, stale sources
+per state, ...) can be rolled up with exact distinct counts without going back
+to row-level data.
+
+Usage (ad-hoc slices from a persisted cube):
+    python scripts/pricing/natcrim_cube.py \
+        --cube content/pricing/natcrim_rollup_cube_2025-10-03.parquet \
+        --by standardized_state,coverage_domain --where coverage_domain=COUNTY
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+CUBE_DIMENSIONS = [
+    "standardized_state",
+    "state_name",
+    "record_type",
+    "coverage_domain",
+    "court_level",
+    "refresh_age",
+]
+AGE_BUCKETS = ["0-3m", "3-6m", "6-12m", "12m+", "unknown"]
+STALE_BUCKET = "12m+"
+CUBE_METADATA_KEY = b"natcrim_cube"
+
+
+def months_before(reference: date, months: int) -> date:
+    """``reference`` shifted back by whole months, clamping Feb 29 and month ends like ``DateOffset``."""
+    return (pd.Timestamp(reference) - pd.DateOffset(months=months)).date()
+
+
+def refresh_age_bucket(refresh_date: pd.Series, reference: date) -> pd.Series:
+    """Bucket refresh dates by age relative to ``reference``; ``12m+`` is strictly older than 12 months."""
+    dates = pd.to_datetime(refresh_date, errors="coerce")
+    buckets = pd.Series("unknown", index=refresh_date.index, dtype="object")
+    known = dates.notna()
+    buckets[known] = STALE_BUCKET
+    for label, months in (("6-12m", 12), ("3-6m", 6), ("0-3m", 3)):
+        buckets[known & (dates >= pd.Timestamp(months_before(reference, months)))] = label
+    return buckets
+
+
+def build_cube(scoped_df: pd.DataFrame, reference: Optional[date] = None) -> pd.DataFrame:
+    """Aggregate ``scoped_df`` (clean NatCrim rows with ``coverage_domain``) into cube cells in one groupby."""
+    reference = reference or date.today()
+    frame = scoped_df.assign(refresh_age=refresh_age_bucket(scoped_df["refresh_date"], reference))
+    refresh = frame["refresh_date"].astype("object").where(frame["refresh_date"].notna(), None)
+    frame = frame.assign(refresh_date=refresh)
+
+    grouped = frame.groupby(CUBE_DIMENSIONS, dropna=False, sort=True)
+    cube = grouped.agg(
+        record_count=("record_count", "sum"),
+        row_count=("record_count", "size"),
+        oldest_refresh=("refresh_date", "min"),
+        newest_refresh=("refresh_date", "max"),
+    )
+    cube["source_names"] = grouped["source_name"].agg(lambda s: sorted(s.dropna().unique().tolist()))
+    cube = cube.reset_index()
+    cube["record_count"] = cube["record_count"].astype("int64")
+    cube["row_count"] = cube["row_count"].astype("int64")
+    cube.attrs["reference_date"] = reference.isoformat()
+    return cube
+
+
+def rollup(cube: pd.DataFrame, by: Sequence[str]) -> pd.DataFrame:
+    """Roll ``cube`` up to ``by`` with summed records/rows and exact distinct source counts.
+
+    Rows whose ``by`` keys are null are dropped, matching ``DataFrame.groupby`` defaults.
+    """
+    grouped = cube.groupby(list(by), sort=True)
+    out = grouped.agg(
+        record_count=("record_count", "sum"),
+        row_count=("row_count", "sum"),
+        oldest_refresh=("oldest_refresh", lambda s: s.dropna().min() if s.notna().any() else None),
+        newest_refresh=("newest_refresh", lambda s: s.dropna().max() if s.notna().any() else None),
+    )
+    out["source_count"] = grouped["source_names"].agg(lambda cells: len(set().union(*cells)))
+    return out.reset_index()
+
+
+def filter_cube(cube: pd.DataFrame, where: Dict[str, Sequence[str]]) -> pd.DataFrame:
+    mask = pd.Series(True, index=cube.index)
+    for column, values in where.items():
+        mask &= cube[column].isin(list(values))
+    return cube[mask]
+
+
+def write_cube(cube: pd.DataFrame, path: Path) -> Path:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(cube, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[CUBE_METADATA_KEY] = json.dumps(
+        {"dimensions": CUBE_DIMENSIONS, "reference_date": cube.attrs.get("reference_date")}
+    ).encode("utf-8")
+    pq.write_table(table.replace_schema_metadata(meta), path, compression="zstd")
+    return path
+
+
+def read_cube(path: Path) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    cube = table.to_pandas()
+    cube["source_names"] = cube["source_names"].map(list)
+    raw_meta = (table.schema.metadata or {}).get(CUBE_METADATA_KEY)
+    if raw_meta:
+        cube.attrs["reference_date"] = json.loads(raw_meta).get("reference_date")
+    return cube
+
+
+def _parse_where(values: List[str]) -> Dict[str, List[str]]:
+    where: Dict[str, List[str]] = {}
+    for item in values:
+        column, _, raw = item.partition("=")
+        if column not in CUBE_DIMENSIONS or not raw:
+            raise SystemExit(f"--where expects <dimension>=<value>[,<value>...]; got {item!r}")
+        where[column] = raw.split(",")
+    return where
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Roll up a persisted NatCrim cube")
+    parser.add_argument("--cube", type=Path, required=True, help="Path to natcrim_rollup_cube_<date>.parquet")
+    parser.add_argument("--by", required=True, help=f"Comma-separated dimensions from {CUBE_DIMENSIONS}")
+    parser.add_argument("--where", action="append", default=[], help="Filter as dimension=value[,value]; repeatable")
+    args = parser.parse_args()
+
+    by = [c.strip() for c in args.by.split(",") if c.strip()]
+    unknown = sorted(set(by) - set(CUBE_DIMENSIONS))
+    if unknown:
+        raise SystemExit(f"Unknown dimensions: {unknown}")
+    cube = filter_cube(read_cube(args.cube), _parse_where(args.where))
+    rollup(cube, by).to_csv(sys.stdout, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Exact and near-duplicate detection for NatCrim source rows.
+
+Exact duplicates are found by hashing the key columns row-wise with
+``pd.util.hash_pandas_object`` and confirming hash hits with a real
+``duplicated`` check, so no per-row string joins are needed.
+
+Near duplicates ("Office Of The Courts" vs "Office of the Courts.",
+"Dept" vs "Department") are resolved per (state, record_type) block:
+names are normalized into token sets, candidate pairs are generated with
+prefix filtering on the rarest tokens (any pair above the Jaccard threshold
+must share one), and matches are merged into clusters with union-find. The
+work is proportional to the candidate pairs, not all pairs in a block.
+"""
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import pandas as pd
+
+DUPLICATE_KEY_COLUMNS = ["standardized_state", "record_type", "source_name", "coverage_scope"]
+BLOCK_COLUMNS = ["standardized_state", "record_type"]
+DEFAULT_SIMILARITY = 0.85
+
+ABBREVIATIONS: Dict[str, str] = {
+    "admin": "administrative",
+    "assn": "association",
+    "cnty": "county",
+    "co": "county",
+    "corr": "corrections",
+    "ct": "court",
+    "cts": "courts",
+    "dept": "department",
+    "dist": "district",
+    "div": "division",
+    "doc": "corrections",
+    "govt": "government",
+    "muni": "municipal",
+    "ofc": "office",
+    "pd": "police",
+    "twp": "township",
+}
+STOPWORDS = frozenset({"of", "the", "and", "for", "in", "at"})
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+REPORT_PREFIX_COLUMNS = ["match_type", "cluster_id", "canonical_name", "similarity", "duplicate_key"]
+
+
+def exact_duplicate_mask(df: pd.DataFrame, columns: Sequence[str] = DUPLICATE_KEY_COLUMNS) -> pd.Series:
+    """Boolean mask of rows whose ``columns`` values occur more than once (nulls compare equal)."""
+    hashes = pd.util.hash_pandas_object(df[list(columns)], index=False)
+    candidates = hashes.duplicated(keep=False)
+    mask = pd.Series(False, index=df.index)
+    if candidates.any():
+        subset = df.loc[candidates.to_numpy(), list(columns)]
+        mask.loc[subset.index] = subset.duplicated(keep=False).to_numpy()
+    return mask
+
+
+def duplicate_key(df: pd.DataFrame, columns: Sequence[str] = DUPLICATE_KEY_COLUMNS) -> pd.Series:
+    parts = [df[col].astype("string").fillna("nan") for col in columns]
+    return parts[0].str.cat(parts[1:], sep="|")
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Lower-case, strip punctuation, expand common abbreviations and drop stopwords."""
+    cleaned = (
+        names.astype("string")
+        .str.lower()
+        .str.replace(_PUNCTUATION, " ", regex=True)
+        .str.replace(_WHITESPACE, " ", regex=True)
+        .str.strip()
+    )
+
+    def tokens(value: object) -> str:
+        if not isinstance(value, str):
+            return ""
+        words = (ABBREVIATIONS.get(word, word) for word in value.split())
+        return " ".join(word for word in words if word not in STOPWORDS)
+
+    unique = cleaned.dropna().unique()
+    lookup = {value: tokens(value) for value in unique}
+    return cleaned.map(lookup).fillna("")
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _UnionFind:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def _candidate_pairs(token_sets: List[frozenset], threshold: float) -> Iterable[Tuple[int, int]]:
+    frequency = Counter(token for tokens in token_sets for token in tokens)
+    index: Dict[str, List[int]] = defaultdict(list)
+    seen = set()
+    for i, tokens in enumerate(token_sets):
+        ordered = sorted(tokens, key=lambda t: (frequency[t], t))
+        prefix = len(ordered) - math.ceil(threshold * len(ordered)) + 1
+        for token in ordered[: max(prefix, 1)]:
+            for j in index[token]:
+                if (j, i) not in seen:
+                    seen.add((j, i))
+                    yield j, i
+            index[token].append(i)
+
+
+def near_duplicate_clusters(df: pd.DataFrame, threshold: float = DEFAULT_SIMILARITY) -> pd.DataFrame:
+    """Cluster distinct source names per (state, record_type) block.
+
+    Returns one row per clustered name with ``cluster_id``, ``canonical_name``
+    (the member covering the most rows) and its Jaccard ``similarity`` to the
+    canonical name. Only clusters with two or more distinct raw names are kept.
+    """
+    names = (
+        df.dropna(subset=["source_name"])
+        .groupby(BLOCK_COLUMNS + ["source_name"], dropna=False, sort=True)
+        .size()
+        .rename("rows")
+        .reset_index()
+    )
+    names["normalized"] = normalize_names(names["source_name"])
+
+    clusters: List[Dict[str, object]] = []
+    cluster_seq = 0
+    for block, group in names.groupby(BLOCK_COLUMNS, dropna=False, sort=True):
+        if len(group) < 2:
+            continue
+        raw_names = group["source_name"].tolist()
+        row_counts = group["rows"].tolist()
+        normalized = group["normalized"].tolist()
+
+        distinct = sorted(set(normalized))
+        position = {value: i for i, value in enumerate(distinct)}
+        token_sets = [frozenset(value.split()) for value in distinct]
+        uf = _UnionFind(len(distinct))
+        for i, j in _candidate_pairs(token_sets, threshold):
+            if _jaccard(token_sets[i], token_sets[j]) >= threshold:
+                uf.union(i, j)
+
+        members: Dict[int, List[int]] = defaultdict(list)
+        for k, value in enumerate(normalized):
+            members[uf.find(position[value])].append(k)
+        for root in sorted(members):
+            rows = members[root]
+            if len(rows) < 2:
+                continue
+            cluster_seq += 1
+            canonical = max(rows, key=lambda k: (row_counts[k], raw_names[k]))
+            canonical_tokens = frozenset(normalized[canonical].split())
+            for k in rows:
+                clusters.append({
+                    "standardized_state": block[0],
+                    "record_type": block[1],
+                    "source_name": raw_names[k],
+                    "cluster_id": f"N{cluster_seq:05d}",
+                    "canonical_name": raw_names[canonical],
+                    "similarity": round(_jaccard(frozenset(normalized[k].split()), canonical_tokens), 3),
+                })
+    columns = BLOCK_COLUMNS + ["source_name", "cluster_id", "canonical_name", "similarity"]
+    return pd.DataFrame(clusters, columns=columns)
+
+
+def duplicates_report(scoped_df: pd.DataFrame, threshold: float = DEFAULT_SIMILARITY) -> pd.DataFrame:
+    """Rows involved in duplicate keys or near-duplicate name clusters.
+
+    ``match_type`` is ``exact`` for repeated key rows, ``normalized`` when the
+    name equals its cluster's canonical name after normalization and ``fuzzy``
+    for token-similarity matches.
+    """
+    exact = scoped_df[exact_duplicate_mask(scoped_df)].copy()
+    exact["duplicate_key"] = duplicate_key(exact)
+    exact["match_type"] = "exact"
+    exact["cluster_id"] = "E" + pd.Series(pd.factorize(exact["duplicate_key"])[0] + 1, index=exact.index).astype(str).str.zfill(5)
+    exact["canonical_name"] = exact["source_name"]
+    exact["similarity"] = 1.0
+
+    clusters = near_duplicate_clusters(scoped_df, threshold)
+    near = scoped_df.merge(clusters, on=BLOCK_COLUMNS + ["source_name"], how="inner")
+    near["match_type"] = near["similarity"].map(lambda value: "normalized" if value >= 1.0 else "fuzzy")
+    near["duplicate_key"] = duplicate_key(near)
+
+    report = pd.concat([exact, near], ignore_index=True, sort=False)
+    columns = REPORT_PREFIX_COLUMNS + [c for c in scoped_df.columns]
+    return report[columns].sort_values(["match_type", "cluster_id", "source_name"], kind="stable").reset_index(drop=True)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Partitioned Parquet layout for the NatCrim source list.
+
+``natcrim_sources_<date>/`` is a Hive-style dataset directory with one
+partition per state (``natcrim_sources_<date>.parquet`` next to it is the
+single-file download)::
+
+    natcrim_sources_2025-10-03/
+        standardized_state=AK/part-0.parquet
+        standardized_state=AL/part-0.parquet
+        standardized_state=UNKNOWN/part-0.parquet   # rows without a state
+
+Inside a partition rows are sorted by ``record_type`` then ``source_name`` and
+no row group spans two record types. The text columns (including the
+optional ``coverage_domain`` the refresh adds) are dictionary-encoded.
+``refresh_date`` is stored as a Parquet ``DATE``. ``record_type``,
+``source_name``, ``coverage_domain``, ``court_level``, ``refresh_date`` and
+``record_count`` carry min/max statistics. Readers can
+therefore skip whole states by directory and record types or refresh windows
+by row group, for example ``pd.read_parquet(path, filters=...)``, or
+:func:`read_sources_dataset` here.
+
+Usage:
+    python scripts/pricing/natcrim_parquet.py --input content/pricing/natcrim_sources_2025-10-03.csv \
+        --output content/pricing/natcrim_sources_2025-10-03 --compression zstd
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from instrumentation import add_instrumentation_args, instrumented_run, span
+
+PARTITION_COLUMN = "standardized_state"
+SORT_COLUMNS = ["record_type", "source_name"]
+DICTIONARY_COLUMNS = ["state_name", "record_type", "source_name", "coverage_scope", "court_level", "coverage_domain"]
+STATISTICS_COLUMNS = ["record_type", "source_name", "coverage_domain", "court_level", "refresh_date", "record_count"]
+SOURCE_COLUMNS = [
+    "standardized_state",
+    "state_name",
+    "record_type",
+    "source_name",
+    "coverage_scope",
+    "court_level",
+    "refresh_date",
+    "record_count",
+]
+OPTIONAL_COLUMNS = ["coverage_domain"]
+NULL_PARTITION = "UNKNOWN"
+COMPRESSION_CODECS = ("zstd", "snappy", "gzip", "brotli", "lz4", "none")
+DEFAULT_COMPRESSION = "zstd"
+DEFAULT_ROW_GROUP_SIZE = 4096
+
+
+def _schema(optional: Sequence[str] = ()):
+    import pyarrow as pa
+
+    text = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("state_name", text),
+        ("record_type", text),
+        ("source_name", text),
+        ("coverage_scope", text),
+        ("court_level", text),
+        ("refresh_date", pa.date32()),
+        ("record_count", pa.int64()),
+    ] + [(col, text) for col in optional])
+
+
+def write_sources_dataset(
+    df: pd.DataFrame,
+    path: Path,
+    compression: str = DEFAULT_COMPRESSION,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> Path:
+    """Write ``df`` (the clean source list) as a state-partitioned dataset at ``path``; replaces any previous output."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if compression not in COMPRESSION_CODECS:
+        raise ValueError(f"Unknown Parquet compression {compression!r}; expected one of {COMPRESSION_CODECS}")
+    missing = [col for col in SOURCE_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Source list is missing columns: {missing}")
+
+    optional = [col for col in OPTIONAL_COLUMNS if col in df.columns]
+    frame = df[SOURCE_COLUMNS + optional].copy()
+    frame["refresh_date"] = pd.to_datetime(frame["refresh_date"], errors="coerce").dt.date
+    frame = frame.sort_values([PARTITION_COLUMN] + SORT_COLUMNS, kind="stable", na_position="last")
+    partitions = frame[PARTITION_COLUMN].astype("string").fillna(NULL_PARTITION)
+    schema = _schema(optional)
+
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    for state, group in frame.groupby(partitions, sort=True):
+        part_dir = tmp / f"{PARTITION_COLUMN}={state}"
+        part_dir.mkdir(parents=True)
+        table = pa.Table.from_pandas(group.drop(columns=PARTITION_COLUMN), schema=schema, preserve_index=False)
+        with pq.ParquetWriter(
+            part_dir / "part-0.parquet",
+            schema,
+            compression=compression,
+            use_dictionary=[col for col in DICTIONARY_COLUMNS if col in schema.names],
+            write_statistics=[col for col in STATISTICS_COLUMNS if col in schema.names],
+        ) as writer:
+            # One record type per row group, so record_type statistics prune exactly
+            types = group["record_type"].astype("string").fillna("").to_numpy()
+            start = 0
+            for end in list((types[1:] != types[:-1]).nonzero()[0] + 1) + [len(group)]:
+                writer.write_table(table.slice(start, end - start), row_group_size=row_group_size)
+                start = end
+
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+    tmp.replace(path)
+    return path
+
+
+def read_sources_dataset(
+    path: Path,
+    states: Optional[Sequence[str]] = None,
+    record_types: Optional[Sequence[str]] = None,
+    refreshed_since: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    filters: Sequence[Tuple[str, str, Any]] = (),
+) -> pd.DataFrame:
+    """Read the dataset back with the clean frame's dtypes, pruning partitions and row groups by filter.
+
+    ``filters`` are extra ``(column, op, value)`` conjuncts in ``pyarrow.parquet`` form.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    filters = list(filters)
+    if states is not None:
+        filters.append((PARTITION_COLUMN, "in", [NULL_PARTITION if pd.isna(state) else state for state in states]))
+    if record_types is not None:
+        filters.append(("record_type", "in", list(record_types)))
+    if refreshed_since is not None:
+        filters.append(("refresh_date", ">=", date.fromisoformat(refreshed_since)))
+
+    table = pq.read_table(path, columns=columns, filters=filters or None, partitioning="hive")
+    # Per-file dictionaries (and the partition key) differ; decode before handing the rows to pandas
+    table = table.cast(pa.schema([
+        field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field for field in table.schema
+    ]))
+    df = table.to_pandas()
+    if "refresh_date" in df.columns:
+        df["refresh_date"] = pd.to_datetime(df["refresh_date"]).dt.strftime("%Y-%m-%d").astype("string")
+    for col in ("standardized_state", "coverage_scope"):
+        if col in df.columns:
+            df[col] = df[col].astype("string")
+    if PARTITION_COLUMN in df.columns:
+        df[PARTITION_COLUMN] = df[PARTITION_COLUMN].mask(df[PARTITION_COLUMN] == NULL_PARTITION)
+    return df[[col for col in (columns or SOURCE_COLUMNS + OPTIONAL_COLUMNS) if col in df.columns]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write the NatCrim source list as a state-partitioned Parquet dataset")
+    parser.add_argument("--input", type=Path, required=True, help="natcrim_sources_<date>.csv")
+    parser.add_argument("--output", type=Path, required=True, help="Dataset directory (natcrim_sources_<date>)")
+    parser.add_argument("--compression", choices=COMPRESSION_CODECS, default=DEFAULT_COMPRESSION)
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    with instrumented_run("natcrim_parquet", args.metrics_json, args.profile):
+        with span("load") as load_span:
+            df = pd.read_csv(args.input, dtype={"standardized_state": "string", "coverage_scope": "string", "refresh_date": "string"}, keep_default_na=False, na_values=[""])
+            load_span.rows_out = len(df)
+        with span("write_parquet", rows_in=len(df)):
+            write_sources_dataset(df, args.output, args.compression, args.row_group_size)
+    partitions = sum(1 for _ in args.output.iterdir())
+    print(f"[INFO] wrote {len(df):,} sources in {partitions} state partitions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""Preview a NatCrim workbook from a stratified sample before committing to a full refresh.
+
+The workbook is streamed row by row (openpyxl read-only mode, values only).
+Each row is counted in its stratum and offered to a fixed-size reservoir
+for that stratum, so memory stays bounded whatever the sheet size. Strata
+are state x data type x the order of magnitude of the raw record count.
+Record counts are heavy-tailed (the largest 100 sources hold over 40% of
+all records), and splitting by magnitude keeps a handful of huge sources
+from swinging the estimate. Only the sampled rows go through the refresh's
+clean, classify and aggregate steps. Record totals are then extrapolated
+per stratum into state, record type and overall estimates with 95% bounds.
+A moved or renamed header stops the preview at the header row.
+
+Usage:
+    python scripts/pricing/natcrim_preview.py --source data/pricing/informdata_natcrim_raw_2025-10-03.xlsx
+    python scripts/pricing/refresh_natcrim_data.py --source <workbook> --preview
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from jurisdictions import STATE_MAP
+from refresh_natcrim_data import RAW_COLUMNS, clean_dataframe, scope_dataframe
+
+SHEET_NAME = "Source List"
+HEADER_ROW = 9  # 1-based; load_raw_dataframe reads with header=8
+HEADER_SEARCH_ROWS = 30
+DEFAULT_PER_STRATUM = 5
+DEFAULT_SEED = 0
+Z_95 = 1.96
+# Same band as test_total_record_volume_is_within_expected_band
+EXPECTED_RECORD_BAND = (700_000_000, 900_000_000)
+MAX_UNPARSED_COUNT_SHARE = 0.01
+MAX_UNPARSED_DATE_SHARE = 0.05
+
+StratumKey = Tuple[str, str, int]
+
+
+@dataclass
+class Stratum:
+    rows: int = 0
+    sample: List[Tuple[Any, ...]] = field(default_factory=list)
+
+    def offer(self, row: Tuple[Any, ...], capacity: int, rng: random.Random) -> None:
+        # Reservoir sampling: every row seen so far is kept with probability capacity / rows
+        self.rows += 1
+        if len(self.sample) < capacity:
+            self.sample.append(row)
+            return
+        slot = rng.randrange(self.rows)
+        if slot < capacity:
+            self.sample[slot] = row
+
+
+@dataclass
+class Estimate:
+    value: float
+    bound: float
+
+    @property
+    def low(self) -> float:
+        return self.value - self.bound
+
+    @property
+    def high(self) -> float:
+        return self.value + self.bound
+
+
+@dataclass
+class Preview:
+    rows_scanned: int
+    strata: int
+    sampled: int
+    seconds: float
+    total_records: Estimate
+    by_state: pd.DataFrame
+    by_record_type: pd.DataFrame
+    domains: pd.DataFrame
+    warnings: List[str]
+    problems: List[str]
+
+
+def count_magnitude(value: Any) -> int:
+    """Decade of a raw record count (0 for 1-9, 3 for 1,000-9,999); -1 for zero/blank, -2 if unparseable."""
+    if value is None or value == "":
+        return -1
+    try:
+        count = float(str(value).replace(",", "")) if isinstance(value, str) else float(value)
+    except ValueError:
+        return -2
+    if not math.isfinite(count) or count < 1:
+        return -1
+    return int(math.log10(count))
+
+
+def _stratum_key(row: Tuple[Any, ...]) -> StratumKey:
+    state, record_type = row[0], row[1]
+    return (
+        str(state).strip().upper() if state is not None else "",
+        str(record_type).strip().upper() if record_type is not None else "",
+        count_magnitude(row[5]),
+    )
+
+
+def _header_error(found: Sequence[Any], rows: List[Tuple[Any, ...]]) -> str:
+    expected = list(RAW_COLUMNS)
+    for offset, row in enumerate(rows, start=1):
+        if [str(cell).strip() if cell is not None else None for cell in row] == expected:
+            return f"Header moved to row {offset} (expected row {HEADER_ROW})"
+    return f"Header drift on row {HEADER_ROW}: expected {expected}, found {list(found)}"
+
+
+def stream_sample(
+    source: Path,
+    per_stratum: int = DEFAULT_PER_STRATUM,
+    seed: int = DEFAULT_SEED,
+) -> Tuple[Dict[StratumKey, Stratum], int]:
+    """Stream the Source List sheet into per-stratum reservoirs; return ``(strata, rows_scanned)``."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        if SHEET_NAME not in workbook.sheetnames:
+            raise ValueError(f"{source.name} has no '{SHEET_NAME}' sheet (found {workbook.sheetnames})")
+        rows = workbook[SHEET_NAME].iter_rows(max_col=len(RAW_COLUMNS), values_only=True)
+        preamble: List[Tuple[Any, ...]] = []
+        for row in rows:
+            preamble.append(row)
+            if len(preamble) == HEADER_ROW:
+                break
+        header = [str(cell).strip() if cell is not None else None for cell in preamble[-1]] if preamble else []
+        if header != list(RAW_COLUMNS):
+            # Look a little further so the error says where the header went
+            for row in rows:
+                preamble.append(row)
+                if len(preamble) >= HEADER_SEARCH_ROWS:
+                    break
+            raise ValueError(_header_error(header, preamble))
+
+        rng = random.Random(seed)
+        strata: Dict[StratumKey, Stratum] = {}
+        scanned = 0
+        for row in rows:
+            if all(cell is None for cell in row):
+                continue
+            scanned += 1
+            key = _stratum_key(row)
+            stratum = strata.get(key)
+            if stratum is None:
+                stratum = strata[key] = Stratum()
+            stratum.offer(row, per_stratum, rng)
+    finally:
+        workbook.close()
+    return strata, scanned
+
+
+def sample_frame(strata: Dict[StratumKey, Stratum]) -> pd.DataFrame:
+    """The sampled raw rows, renamed like ``load_raw_dataframe``, with stratum id and size columns."""
+    records = [row for stratum in strata.values() for row in stratum.sample]
+    df = pd.DataFrame.from_records(records, columns=list(RAW_COLUMNS))
+    df["State"] = df["State"].astype("string")
+    df = df.rename(columns=RAW_COLUMNS)
+    ids, sizes = [], []
+    for position, stratum in enumerate(strata.values()):
+        ids.extend([position] * len(stratum.sample))
+        sizes.extend([stratum.rows] * len(stratum.sample))
+    return df.assign(stratum=ids, stratum_rows=sizes)
+
+
+def estimate_totals(sample: pd.DataFrame, by: Sequence[str]) -> pd.DataFrame:
+    """Stratified estimate of total ``record_count`` per ``by`` group, with a 95% bound.
+
+    Strata are nested in states and record types, so group estimates are the
+    sums of their strata's ``N_h * mean_h`` and variances
+    ``N_h^2 (1 - n_h/N_h) s_h^2 / n_h``.
+    """
+    per_stratum = sample.groupby("stratum", sort=False).agg(
+        **{col: (col, "first") for col in by},
+        n=("record_count", "size"),
+        N=("stratum_rows", "first"),
+        mean=("record_count", "mean"),
+        var=("record_count", "var"),
+    )
+    per_stratum["estimate"] = per_stratum["N"] * per_stratum["mean"]
+    finite_population = 1 - per_stratum["n"] / per_stratum["N"]
+    per_stratum["variance"] = (per_stratum["N"] ** 2 * finite_population * per_stratum["var"].fillna(0) / per_stratum["n"]).clip(lower=0)
+    if not by:
+        per_stratum["_all"] = "total"
+        by = ["_all"]
+    grouped = per_stratum.groupby(list(by), dropna=False).agg(
+        sources=("N", "sum"),
+        sampled=("n", "sum"),
+        estimated_records=("estimate", "sum"),
+        variance=("variance", "sum"),
+    )
+    grouped["bound"] = Z_95 * grouped.pop("variance") ** 0.5
+    grouped["estimated_records"] = grouped["estimated_records"].round()
+    grouped["bound"] = grouped["bound"].round()
+    return grouped.reset_index().sort_values("estimated_records", ascending=False, ignore_index=True)
+
+
+def drift_checks(raw: pd.DataFrame, clean: pd.DataFrame) -> Tuple[List[str], List[str]]:
+    """Warnings and problems about the sample's values (unparseable counts or dates, unknown states)."""
+    warnings: List[str] = []
+    problems: List[str] = []
+    counts = raw["record_count"]
+    unparsed_counts = (counts.notna() & pd.to_numeric(counts, errors="coerce").isna()).mean()
+    if unparsed_counts > MAX_UNPARSED_COUNT_SHARE:
+        problems.append(f"{unparsed_counts:.1%} of sampled 'Number of Records' values are not numbers")
+    dates = raw["refresh_date"]
+    unparsed_dates = (dates.notna() & pd.to_datetime(dates, errors="coerce").isna()).mean()
+    if unparsed_dates > MAX_UNPARSED_DATE_SHARE:
+        problems.append(f"{unparsed_dates:.1%} of sampled 'Update Date' values are not dates")
+    states = clean["standardized_state"].dropna()
+    unknown = sorted(set(states[~states.isin(list(STATE_MAP))]))
+    if unknown:
+        warnings.append(f"Unrecognized state codes in sample: {', '.join(unknown[:10])}")
+    return warnings, problems
+
+
+def run_preview(
+    source: Path,
+    per_stratum: int = DEFAULT_PER_STRATUM,
+    seed: int = DEFAULT_SEED,
+    expected_band: Optional[Tuple[float, float]] = EXPECTED_RECORD_BAND,
+) -> Preview:
+    if per_stratum < 2:
+        raise ValueError("Sample at least 2 rows per stratum to estimate variance")
+    start = time.perf_counter()
+    with span("stream_sample") as stream_span:
+        strata, scanned = stream_sample(source, per_stratum, seed)
+        stream_span.rows_in = scanned
+    if not scanned:
+        raise ValueError(f"No data rows below the header in {source.name}")
+
+    with span("clean_sample") as clean_span:
+        raw = sample_frame(strata)
+        clean = clean_dataframe(raw).assign(stratum=raw["stratum"], stratum_rows=raw["stratum_rows"])
+        scoped = scope_dataframe(clean)
+        clean_span.rows_out = len(scoped)
+
+    with span("estimate", rows_in=len(scoped)):
+        total = estimate_totals(scoped, []).iloc[0]
+        by_state = estimate_totals(scoped, ["standardized_state", "state_name"])
+        by_record_type = estimate_totals(scoped, ["record_type"])
+        # Each sampled source stands for N_h / n_h sources of its stratum
+        weights = scoped["stratum_rows"] / scoped.groupby("stratum")["stratum"].transform("size")
+        domains = (
+            weights.groupby(scoped["coverage_domain"]).sum().round().astype("int64")
+            .rename("estimated_sources").sort_values(ascending=False).reset_index()
+        )
+
+    warnings, problems = drift_checks(raw, clean)
+    estimate = Estimate(float(total["estimated_records"]), float(total["bound"]))
+    if expected_band:
+        low, high = expected_band
+        if estimate.high < low or estimate.low > high:
+            problems.append(f"Estimated records {estimate.value:,.0f} ± {estimate.bound:,.0f} fall outside the expected band {low:,.0f}–{high:,.0f}")
+        elif not low <= estimate.value <= high:
+            warnings.append(f"Estimated records {estimate.value:,.0f} are outside the expected band {low:,.0f}–{high:,.0f} (bounds still overlap it)")
+
+    return Preview(
+        rows_scanned=scanned,
+        strata=len(strata),
+        sampled=len(scoped),
+        seconds=time.perf_counter() - start,
+        total_records=estimate,
+        by_state=by_state,
+        by_record_type=by_record_type,
+        domains=domains,
+        warnings=warnings,
+        problems=problems,
+    )
+
+
+def print_preview(preview: Preview, states: int = 10) -> None:
+    print(f"[INFO] Preview scanned {preview.rows_scanned:,} rows in {preview.seconds:.2f}s; sampled {preview.sampled:,} rows from {preview.strata:,} strata")
+    total = preview.total_records
+    print(f"[INFO] Estimated total records: {total.value:,.0f} ± {total.bound:,.0f} (95%)")
+    print("")
+    print("  Record type       Sources   Estimated records")
+    for row in preview.by_record_type.itertuples():
+        print(f"  {row.record_type:<14} {row.sources:>10,}   {row.estimated_records:>15,.0f} ± {row.bound:,.0f}")
+    print("")
+    print(f"  Top {states} states by estimated records")
+    for row in preview.by_state.head(states).itertuples():
+        print(f"  {str(row.standardized_state):<14} {row.sources:>10,}   {row.estimated_records:>15,.0f} ± {row.bound:,.0f}")
+    print("")
+    print("  Coverage domains (estimated sources): " + ", ".join(f"{row.coverage_domain} {row.estimated_sources:,}" for row in preview.domains.itertuples()))
+    print("")
+    for message in preview.warnings:
+        print(f"[WARN] {message}")
+    for message in preview.problems:
+        print(f"[ERROR] {message}")
+
+
+def preview_exit_code(preview: Preview) -> int:
+    return 1 if preview.problems else 0
+
+
+def add_preview_args(parser: argparse.ArgumentParser, prefix: str = "") -> None:
+    """Sampling options; refresh_natcrim_data adds them as ``--preview-*`` (``prefix="preview-"``)."""
+    parser.add_argument(f"--{prefix}per-stratum", type=int, default=DEFAULT_PER_STRATUM, help="Rows sampled per stratum")
+    parser.add_argument(f"--{prefix}seed", type=int, default=DEFAULT_SEED, help="Sampling seed")
+    parser.add_argument(
+        f"--{prefix}expected-records",
+        type=int,
+        nargs=2,
+        metavar=("MIN", "MAX"),
+        default=EXPECTED_RECORD_BAND,
+        help="Fail the preview when the estimate's bounds fall outside this band",
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Preview a NatCrim workbook from a stratified sample")
+    parser.add_argument("--source", type=Path, required=True, help="Path to the raw InformData NatCrim workbook")
+    add_preview_args(parser)
+    add_instrumentation_args(parser)
+    args = parser.parse_args(argv)
+
+    source = args.source.expanduser()
+    if not source.exists():
+        raise SystemExit(f"Source workbook not found: {source}")
+    with instrumented_run("natcrim_preview", args.metrics_json, args.profile):
+        try:
+            preview = run_preview(source, args.per_stratum, args.seed, tuple(args.expected_records))
+        except ValueError as exc:
+            raise SystemExit(f"[ERROR] {exc}")
+    print_preview(preview)
+    return preview_exit_code(preview)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Filter and project the NatCrim source exports without loading them whole.
+
+Queries run against the state-partitioned ``natcrim_sources_<date>/``
+dataset (see natcrim_parquet.py). State filters pick partition directories.
+Filters on ``record_type``, ``coverage_domain``, ``court_level``,
+``refresh_date`` and ``record_count`` are pushed down to the Parquet reader,
+which skips row groups by their min/max statistics. Only the requested
+columns are decoded.
+
+Results of recent queries are kept in an in-process LRU cache keyed by the
+query and the dataset's file fingerprint (names, sizes, mtimes). A dashboard
+that repeats a query gets the cached frame, and a refreshed export is never
+served stale.
+
+Usage:
+    python scripts/pricing/natcrim_query.py --state TX --record-type COURT \
+        --refreshed-since 2025-01-01 --min-records 1000000 \
+        --columns source_name,coverage_scope,refresh_date,record_count --format table
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from jurisdictions import state_code
+from natcrim_parquet import NULL_PARTITION, OPTIONAL_COLUMNS, SOURCE_COLUMNS, read_sources_dataset
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CONTENT_DIR = PROJECT_ROOT / "content/pricing"
+DATASET_GLOB = "natcrim_sources_*"
+QUERY_COLUMNS = SOURCE_COLUMNS + OPTIONAL_COLUMNS
+OUTPUT_FORMATS = ("csv", "json", "table")
+CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class SourceQuery:
+    """Conjunctive filters plus a column projection; hashable so it can key the result cache."""
+
+    states: Optional[Tuple[str, ...]] = None
+    record_types: Optional[Tuple[str, ...]] = None
+    coverage_domains: Optional[Tuple[str, ...]] = None
+    court_levels: Optional[Tuple[str, ...]] = None
+    refreshed_since: Optional[str] = None
+    refreshed_before: Optional[str] = None
+    min_records: Optional[int] = None
+    max_records: Optional[int] = None
+    columns: Optional[Tuple[str, ...]] = None
+
+    def filters(self) -> List[Tuple[str, str, Any]]:
+        """``pyarrow.parquet`` filter conjuncts (state filtering is done by the partition reader)."""
+        filters: List[Tuple[str, str, Any]] = []
+        for column, values in (
+            ("record_type", self.record_types),
+            ("coverage_domain", self.coverage_domains),
+            ("court_level", self.court_levels),
+        ):
+            if values is not None:
+                filters.append((column, "in", list(values)))
+        if self.refreshed_since:
+            filters.append(("refresh_date", ">=", date.fromisoformat(self.refreshed_since)))
+        if self.refreshed_before:
+            filters.append(("refresh_date", "<", date.fromisoformat(self.refreshed_before)))
+        if self.min_records is not None:
+            filters.append(("record_count", ">=", self.min_records))
+        if self.max_records is not None:
+            filters.append(("record_count", "<=", self.max_records))
+        return filters
+
+
+def make_query(
+    states: Optional[Sequence[str]] = None,
+    record_types: Optional[Sequence[str]] = None,
+    coverage_domains: Optional[Sequence[str]] = None,
+    court_levels: Optional[Sequence[str]] = None,
+    refreshed_since: Optional[str] = None,
+    refreshed_before: Optional[str] = None,
+    min_records: Optional[int] = None,
+    max_records: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> SourceQuery:
+    """Normalise user input (state names, case, dates) into a :class:`SourceQuery`; raises ValueError on bad input."""
+
+    def upper(values: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+        return None if values is None else tuple(sorted({value.strip().upper() for value in values}))
+
+    codes = None
+    if states is not None:
+        codes = []
+        for state in states:
+            code = NULL_PARTITION if state.strip().upper() == NULL_PARTITION else state_code(state)
+            if code is None:
+                raise ValueError(f"Unknown state {state!r}")
+            codes.append(code)
+    for label, value in (("refreshed_since", refreshed_since), ("refreshed_before", refreshed_before)):
+        if value:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"{label} must be YYYY-MM-DD; got {value!r}") from None
+    if columns is not None:
+        unknown = sorted(set(columns) - set(QUERY_COLUMNS))
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown}; expected some of {QUERY_COLUMNS}")
+    return SourceQuery(
+        states=upper(codes),
+        record_types=upper(record_types),
+        coverage_domains=upper(coverage_domains),
+        court_levels=upper(court_levels),
+        refreshed_since=refreshed_since or None,
+        refreshed_before=refreshed_before or None,
+        min_records=min_records,
+        max_records=max_records,
+        columns=None if columns is None else tuple(columns),
+    )
+
+
+def latest_dataset(content_dir: Path = CONTENT_DIR) -> Path:
+    """Newest ``natcrim_sources_<date>/`` dataset directory (snapshot dates sort lexically)."""
+    datasets = sorted(path for path in content_dir.glob(DATASET_GLOB) if path.is_dir())
+    if not datasets:
+        raise ValueError(f"No {DATASET_GLOB} dataset under {content_dir}")
+    return datasets[-1]
+
+
+def _fingerprint(path: Path) -> Tuple[Tuple[str, int, int], ...]:
+    files = sorted(path.rglob("*.parquet")) if path.is_dir() else [path]
+    return tuple((str(f.relative_to(path)) if path.is_dir() else f.name, f.stat().st_size, f.stat().st_mtime_ns) for f in files)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached(path: str, fingerprint: Tuple[Tuple[str, int, int], ...], query: SourceQuery) -> pd.DataFrame:
+    return _execute(Path(path), query)
+
+
+def _execute(path: Path, query: SourceQuery) -> pd.DataFrame:
+    columns = list(query.columns) if query.columns else None
+    return read_sources_dataset(path, states=query.states, columns=columns, filters=query.filters()).reset_index(drop=True)
+
+
+def run_query(query: SourceQuery, path: Optional[Path] = None, cache: bool = True) -> pd.DataFrame:
+    """Rows of the dataset at ``path`` (default: latest export) matching ``query``."""
+    path = (path or latest_dataset()).resolve()
+    if not cache:
+        return _execute(path, query)
+    # Copy so callers can mutate the result without corrupting the cache
+    return _cached(str(path), _fingerprint(path), query).copy()
+
+
+def cache_info():
+    return _cached.cache_info()
+
+
+def clear_cache() -> None:
+    _cached.cache_clear()
+
+
+def render(df: pd.DataFrame, fmt: str) -> str:
+    if fmt == "csv":
+        return df.to_csv(index=False)
+    if fmt == "json":
+        return df.to_json(orient="records", indent=2) + "\n"
+    if fmt == "table":
+        return (df.to_string(index=False) if len(df) else "(no matching sources)") + "\n"
+    raise ValueError(f"Unknown format {fmt!r}; expected one of {OUTPUT_FORMATS}")
+
+
+def _split(values: Optional[List[str]]) -> Optional[List[str]]:
+    if not values:
+        return None
+    return [item.strip() for value in values for item in value.split(",") if item.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the NatCrim source Parquet export with pushed-down filters")
+    parser.add_argument("--dataset", type=Path, help=f"Dataset directory (default: latest {DATASET_GLOB} in content/pricing)")
+    parser.add_argument("--state", action="append", help="State code or name; comma-separated or repeatable (UNKNOWN = no state)")
+    parser.add_argument("--record-type", action="append", help="COURT, DOC, SOR, ...; comma-separated or repeatable")
+    parser.add_argument("--domain", action="append", help="coverage_domain (COUNTY, STATEWIDE, ...)")
+    parser.add_argument("--court-level", action="append", help="STATEWIDE, COUNTY, NATIONAL or N/A")
+    parser.add_argument("--refreshed-since", help="refresh_date on or after YYYY-MM-DD")
+    parser.add_argument("--refreshed-before", help="refresh_date before YYYY-MM-DD")
+    parser.add_argument("--min-records", type=int)
+    parser.add_argument("--max-records", type=int)
+    parser.add_argument("--columns", help=f"Comma-separated subset of {QUERY_COLUMNS}")
+    parser.add_argument("--sort", help="Comma-separated sort columns")
+    parser.add_argument("--descending", action="store_true", help="Sort descending")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv")
+    parser.add_argument("--output", type=Path, help="Write results here instead of stdout")
+    args = parser.parse_args()
+
+    try:
+        query = make_query(
+            states=_split(args.state),
+            record_types=_split(args.record_type),
+            coverage_domains=_split(args.domain),
+            court_levels=_split(args.court_level),
+            refreshed_since=args.refreshed_since,
+            refreshed_before=args.refreshed_before,
+            min_records=args.min_records,
+            max_records=args.max_records,
+            columns=_split([args.columns]) if args.columns else None,
+        )
+        result = run_query(query, args.dataset, cache=False)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+
+    if args.sort:
+        keys = _split([args.sort])
+        missing = [key for key in keys if key not in result.columns]
+        if missing:
+            raise SystemExit(f"Cannot sort by {missing}: not in the selected columns")
+        result = result.sort_values(keys, ascending=not args.descending, kind="stable")
+    if args.limit is not None:
+        result = result.head(args.limit)
+
+    text = render(result, args.format)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+        print(f"[INFO] wrote {len(result)} sources to {args.output}")
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Reconcile the legacy InformData NatCrim exports against the refresh outputs.
+
+The legacy ``informdata_natcrim_state_totals_<date>.csv`` /
+``informdata_natcrim_sources_<date>.csv`` and the ``natcrim_state_totals_<date>.csv`` /
+``natcrim_sources_<date>.csv`` written by refresh_natcrim_data.py are mapped onto
+the same normalized keys (state code, upper-case record type, source name
+normalized like natcrim_duplicates). Each side is summed per key with one groupby
+and the two sides are aligned with an outer hash join at four levels:
+
+* ``totals``      – the published state totals files, as a sales sheet reads them
+* ``state``       – state totals recomputed from each source list
+* ``record_type`` – state × record type
+* ``source``      – state × record type × source, the full source-list grain
+
+A key is a mismatch when its record delta exceeds the tolerance
+(``max(abs_tolerance, rel_tolerance × legacy records)``) or when the sides list
+a different number of source rows for it. Keys found on only one side are
+reported separately. refresh_natcrim_data.py runs this after every refresh
+when a legacy export exists for the snapshot.
+
+Usage:
+    python scripts/pricing/natcrim_reconcile.py --snapshot-date 2025-10-03 --rel-tolerance 0.001
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from jurisdictions import state_keys
+from natcrim_duplicates import normalize_names
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CONTENT_DIR = PROJECT_ROOT / "content/pricing"
+REPORTS_DIR = PROJECT_ROOT / "reports"
+UNKNOWN_STATE = "UNKNOWN"
+LEVELS: Dict[str, List[str]] = {
+    "totals": ["state"],
+    "state": ["state"],
+    "record_type": ["state", "record_type"],
+    "source": ["state", "record_type", "source_key"],
+}
+LEGACY_SOURCE_COLUMNS = {
+    "State": "standardized_state",
+    "Record Type": "record_type",
+    "Source Name": "source_name",
+    "Record Count": "record_count",
+}
+LEGACY_TOTAL_COLUMNS = {"State": "standardized_state", "Total Records": "record_count"}
+STATUSES = ["mismatch", "legacy_only", "new_only", "within_tolerance", "match"]
+REPORT_COLUMNS = [
+    "level", "state", "record_type", "source_key", "source_name", "status",
+    "legacy_records", "new_records", "record_delta", "relative_delta",
+    "legacy_sources", "new_sources", "source_delta",
+]
+
+
+def export_paths(snapshot_stamp: str, content_dir: Path = CONTENT_DIR, legacy_dir: Optional[Path] = None) -> Dict[str, Path]:
+    legacy_dir = legacy_dir or content_dir
+    return {
+        "legacy_sources": legacy_dir / f"informdata_natcrim_sources_{snapshot_stamp}.csv",
+        "legacy_totals": legacy_dir / f"informdata_natcrim_state_totals_{snapshot_stamp}.csv",
+        "new_sources": content_dir / f"natcrim_sources_{snapshot_stamp}.csv",
+        "new_totals": content_dir / f"natcrim_state_totals_{snapshot_stamp}.csv",
+    }
+
+
+def _read(path: Path, rename: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    if not path.exists():
+        raise ValueError(f"Export not found: {path}")
+    df = pd.read_csv(path, dtype="string", keep_default_na=False, na_values=[""])
+    if rename:
+        missing = sorted(set(rename) - set(df.columns))
+        if missing:
+            raise ValueError(f"{path.name} is missing columns {missing}")
+        df = df.rename(columns=rename)
+    return df
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Key columns (``state``, ``record_type``, ``source_key``) plus numeric ``record_count`` for either export."""
+    states = state_keys(df["standardized_state"]).fillna(UNKNOWN_STATE) if "standardized_state" in df.columns else UNKNOWN_STATE
+    out = pd.DataFrame({"state": states}, index=df.index)
+    if "record_type" in df.columns:
+        out["record_type"] = df["record_type"].astype("string").str.strip().str.upper().fillna("")
+    if "source_name" in df.columns:
+        out["source_key"] = normalize_names(df["source_name"])
+        out["source_name"] = df["source_name"].astype("string").fillna("")
+    out["record_count"] = pd.to_numeric(df["record_count"], errors="coerce").fillna(0).astype("int64")
+    return out
+
+
+def aggregate(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """Records and source rows per key; ``source_name`` keeps the most common raw spelling for the report."""
+    grouped = df.groupby(keys, sort=False, dropna=False)
+    agg = grouped["record_count"].agg(records="sum", sources="size")
+    if "source_name" in df.columns and "source_key" in keys:
+        spellings = df.groupby(keys + ["source_name"], sort=False, dropna=False).size().rename("rows").reset_index()
+        spellings = spellings.sort_values(["rows", "source_name"], ascending=[False, True], kind="stable")
+        agg["source_name"] = spellings.drop_duplicates(keys).set_index(keys)["source_name"]
+    return agg
+
+
+def reconcile_level(
+    legacy: pd.DataFrame,
+    new: pd.DataFrame,
+    keys: List[str],
+    abs_tolerance: float = 0,
+    rel_tolerance: float = 0.0,
+    count_sources: bool = True,
+) -> pd.DataFrame:
+    """Outer-join per-key aggregates of the two normalized exports and classify every key."""
+    left = aggregate(legacy, keys).add_prefix("legacy_")
+    right = aggregate(new, keys).add_prefix("new_")
+    joined = left.join(right, how="outer").reset_index()
+
+    legacy_present = joined["legacy_records"].notna()
+    new_present = joined["new_records"].notna()
+    for col in ("legacy_records", "new_records", "legacy_sources", "new_sources"):
+        joined[col] = joined[col].fillna(0).astype("int64")
+    joined["record_delta"] = joined["new_records"] - joined["legacy_records"]
+    joined["relative_delta"] = (joined["record_delta"] / joined["legacy_records"].where(joined["legacy_records"] != 0)).round(6)
+    joined["source_delta"] = joined["new_sources"] - joined["legacy_sources"]
+    if not count_sources:
+        joined[["legacy_sources", "new_sources", "source_delta"]] = pd.NA
+    if "legacy_source_name" in joined.columns:
+        joined["source_name"] = joined["legacy_source_name"].fillna(joined["new_source_name"])
+
+    allowed = (joined["legacy_records"].abs() * rel_tolerance).clip(lower=abs_tolerance)
+    delta = joined["record_delta"].abs()
+    sources_differ = joined["source_delta"].fillna(0) != 0 if count_sources else False
+    status = pd.Series("match", index=joined.index, dtype="object")
+    status[(delta > 0) & (delta <= allowed)] = "within_tolerance"
+    status[(delta > allowed) | sources_differ] = "mismatch"
+    status[legacy_present & ~new_present] = "legacy_only"
+    status[~legacy_present & new_present] = "new_only"
+    joined["status"] = status
+    return joined
+
+
+def reconcile(
+    legacy_sources: pd.DataFrame,
+    new_sources: pd.DataFrame,
+    legacy_totals: Optional[pd.DataFrame] = None,
+    new_totals: Optional[pd.DataFrame] = None,
+    abs_tolerance: float = 0,
+    rel_tolerance: float = 0.0,
+) -> pd.DataFrame:
+    """All levels stacked into one frame with ``REPORT_COLUMNS``, mismatches first, largest deltas first."""
+    if abs_tolerance < 0 or rel_tolerance < 0:
+        raise ValueError("Tolerances must be non-negative")
+    legacy_rows, new_rows = normalize(legacy_sources), normalize(new_sources)
+    frames = []
+    for level, keys in LEVELS.items():
+        if level == "totals":
+            if legacy_totals is None or new_totals is None:
+                continue
+            left, right, count_sources = normalize(legacy_totals), normalize(new_totals), False
+        else:
+            left, right, count_sources = legacy_rows, new_rows, True
+        with span(f"reconcile:{level}", rows_in=len(left) + len(right)) as level_span:
+            frame = reconcile_level(left, right, keys, abs_tolerance, rel_tolerance, count_sources)
+            level_span.rows_out = len(frame)
+        frames.append(frame.assign(level=level))
+    report = pd.concat(frames, ignore_index=True).reindex(columns=REPORT_COLUMNS)
+    report["status"] = pd.Categorical(report["status"], STATUSES, ordered=True)
+    report["level"] = pd.Categorical(report["level"], list(LEVELS), ordered=True)
+    order = report.assign(magnitude=report["record_delta"].abs()).sort_values(
+        ["level", "status", "magnitude", "state"], ascending=[True, True, False, True], kind="stable"
+    )
+    return order.drop(columns="magnitude").reset_index(drop=True)
+
+
+def summarize(report: pd.DataFrame) -> Dict[str, Any]:
+    """Per-level key counts by status plus the record totals on each side."""
+    summary: Dict[str, Any] = {}
+    for level, frame in report.groupby("level", observed=True, sort=True):
+        counts = frame["status"].value_counts()
+        summary[str(level)] = {
+            "keys": len(frame),
+            **{status: int(counts.get(status, 0)) for status in STATUSES},
+            "legacy_records": int(frame["legacy_records"].sum()),
+            "new_records": int(frame["new_records"].sum()),
+            "abs_record_delta": int(frame["record_delta"].abs().sum()),
+        }
+    return summary
+
+
+def run(
+    snapshot_stamp: str,
+    content_dir: Path = CONTENT_DIR,
+    reports_dir: Path = REPORTS_DIR,
+    abs_tolerance: float = 0,
+    rel_tolerance: float = 0.0,
+    legacy_dir: Optional[Path] = None,
+) -> Dict[str, Path]:
+    """Reconcile the exports for ``snapshot_stamp``; writes the discrepancy CSV and the summary JSON.
+
+    The legacy exports are read from ``legacy_dir`` when it differs from ``content_dir``.
+    """
+    paths = export_paths(snapshot_stamp, content_dir, legacy_dir)
+    with span("load") as load_span:
+        legacy_sources = _read(paths["legacy_sources"], LEGACY_SOURCE_COLUMNS)
+        new_sources = _read(paths["new_sources"])
+        legacy_totals = _read(paths["legacy_totals"], LEGACY_TOTAL_COLUMNS) if paths["legacy_totals"].exists() else None
+        new_totals = _read(paths["new_totals"]) if paths["new_totals"].exists() else None
+        load_span.rows_out = len(legacy_sources) + len(new_sources)
+    report = reconcile(legacy_sources, new_sources, legacy_totals, new_totals, abs_tolerance, rel_tolerance)
+    summary = {
+        "snapshot": snapshot_stamp,
+        "abs_tolerance": abs_tolerance,
+        "rel_tolerance": rel_tolerance,
+        "sources": {name: path.name for name, path in paths.items()},
+        "levels": summarize(report),
+    }
+
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    report_path = reports_dir / f"natcrim_reconciliation_{snapshot_stamp}.csv"
+    summary_path = reports_dir / f"natcrim_reconciliation_{snapshot_stamp}.json"
+    with span("write", rows_in=len(report)):
+        # Only discrepancies go to the CSV; matching keys are counted in the summary
+        report[report["status"] != "match"].to_csv(report_path, index=False)
+        summary_path.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+    return {"report": report_path, "summary": summary_path}
+
+
+def print_summary(summary_path: Path) -> None:
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    for level, stats in summary["levels"].items():
+        flagged = stats["mismatch"] + stats["legacy_only"] + stats["new_only"]
+        tag = "[WARN]" if flagged else "[INFO]"
+        print(
+            f"{tag} {level:<12} {stats['keys']:>6,} keys: {stats['mismatch']:,} mismatched, "
+            f"{stats['legacy_only']:,} legacy-only, {stats['new_only']:,} new-only, "
+            f"{stats['within_tolerance']:,} within tolerance; records {stats['legacy_records']:,} -> {stats['new_records']:,}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconcile legacy InformData NatCrim exports against the refresh outputs")
+    parser.add_argument("--snapshot-date", required=True, help="Snapshot stamp shared by both exports (YYYY-MM-DD)")
+    parser.add_argument("--content-dir", type=Path, default=CONTENT_DIR)
+    parser.add_argument("--reports-dir", type=Path, default=REPORTS_DIR)
+    parser.add_argument("--abs-tolerance", type=float, default=0, help="Record delta always accepted per key")
+    parser.add_argument("--rel-tolerance", type=float, default=0.0, help="Record delta accepted as a fraction of the legacy count")
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    with instrumented_run("natcrim_reconcile", args.metrics_json, args.profile):
+        try:
+            outputs = run(args.snapshot_date, args.content_dir, args.reports_dir, args.abs_tolerance, args.rel_tolerance)
+        except ValueError as exc:
+            raise SystemExit(str(exc))
+    print_summary(outputs["summary"])
+    print(f"[INFO] wrote discrepancies to {outputs['report']} and summary to {outputs['summary']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Cost batches of orders (package + applicant address history) in chunks.
+
+Each input row is one order::
+
+    order_id,package,addresses
+    A-1001,ESSENTIAL_COUNTY,TX:Harris;TX:Fort Bend County;AL:Jefferson
+
+An order costs its package components (``order_packages.json``; vendor cost
+from ``informdata_costs.csv``, loaded cost from ``internal_pricing.csv``)
+plus, for packages with criminal searches, the searches for its address
+history. Each county is looked up in the precomputed routing table
+(``search_routing.py``): counties routed to a statewide repository share one
+statewide search per state per order, every other county is one county
+search at its county fee row's cost.
+
+Address histories are exploded into a long frame of ``(order row, token)``
+pairs; distinct tokens are factorized and resolved once (memoized across
+chunks) to a jurisdiction unit, and per-order sums are ``np.bincount`` over
+the de-duplicated pairs. Input is streamed with ``chunksize`` so memory stays
+bounded by the chunk, not the file.
+
+Usage:
+    python scripts/pricing/order_cost_engine.py --orders orders.csv --output reports/order_costs.csv \
+        --summary reports/order_cost_summary.csv
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from build_pricing_table import load_internal
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from jurisdictions import jurisdiction_key, state_code
+from search_routing import ROUTE_STATEWIDE, ROUTING_PATH, Route, load_routes, lookup_route
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+COSTS_PATH = PROJECT_ROOT / "data/pricing/informdata_costs.csv"
+INTERNAL_PATH = PROJECT_ROOT / "data/pricing/internal_pricing.csv"
+PACKAGES_PATH = PROJECT_ROOT / "data/pricing/order_packages.json"
+
+ORDER_COLUMNS = ["order_id", "package", "addresses"]
+DEFAULT_CHUNK_SIZE = 500_000
+ADDRESS_SEPARATOR = ";"
+
+COUNTY, STATEWIDE, UNPRICED = 0, 1, 2
+
+OUTPUT_COLUMNS = [
+    "order_id",
+    "package",
+    "county_searches",
+    "statewide_searches",
+    "unpriced_searches",
+    "component_cost",
+    "county_fee_cost",
+    "statewide_cost",
+    "total_cost",
+]
+SUMMARY_SUM_COLUMNS = OUTPUT_COLUMNS[2:]
+
+
+def load_packages(path: Path = PACKAGES_PATH) -> Dict[str, dict]:
+    with path.open("r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    packages = data.get("packages") if isinstance(data, dict) else None
+    if not isinstance(packages, dict):
+        raise ValueError(f"Package config at {path} must contain a 'packages' object")
+    return packages
+
+
+@dataclass
+class OrderCostEngine:
+    """Pricing tables plus the memoized token -> jurisdiction unit resolution."""
+
+    package_cost: Dict[str, float]
+    package_searches: Dict[str, bool]
+    routes: Dict[Tuple[str, str], Route]
+    _units: Dict[str, int] = field(default_factory=dict, repr=False)
+    _unit_route: List[int] = field(default_factory=list, repr=False)
+    _unit_cost: List[float] = field(default_factory=list, repr=False)
+    _token_units: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_files(
+        cls,
+        costs_path: Path = COSTS_PATH,
+        internal_path: Path = INTERNAL_PATH,
+        routing_path: Path = ROUTING_PATH,
+        packages_path: Path = PACKAGES_PATH,
+    ) -> "OrderCostEngine":
+        costs = pd.read_csv(costs_path)
+        internal = load_internal(internal_path)
+        service_cost = costs.set_index("service_id")["informdata_cost"].astype(float)
+        # Loaded cost (automation + platform) where computed, vendor cost otherwise
+        service_cost.update(internal.set_index("service_id")["total_cost"])
+
+        package_cost: Dict[str, float] = {}
+        package_searches: Dict[str, bool] = {}
+        for name, config in load_packages(packages_path).items():
+            services = list(config.get("services", []))
+            unknown = sorted(set(services) - set(service_cost.index))
+            if unknown:
+                raise ValueError(f"Package {name} references unknown services: {unknown}")
+            package_cost[name] = round(float(service_cost[services].sum()), 2)
+            package_searches[name] = bool(config.get("criminal_searches", False))
+
+        return cls(
+            package_cost=package_cost,
+            package_searches=package_searches,
+            routes=load_routes(routing_path),
+        )
+
+    def _unit(self, key: str, route: int, cost: float) -> int:
+        if key not in self._units:
+            self._units[key] = len(self._unit_route)
+            self._unit_route.append(route)
+            self._unit_cost.append(cost)
+        return self._units[key]
+
+    def resolve(self, token: str) -> int:
+        """Jurisdiction unit for one ``STATE:County`` address token (memoized)."""
+        unit = self._token_units.get(token)
+        if unit is not None:
+            return unit
+        state_part, _, county_part = token.partition(":")
+        state = state_code(state_part)
+        county = jurisdiction_key(county_part) if county_part.strip() else None
+        route = lookup_route(self.routes, state, county)
+        if route is None:
+            unit = self._unit(f"{state or '?'}:{county or token.upper()}", UNPRICED, 0.0)
+        elif route[0] == ROUTE_STATEWIDE:
+            unit = self._unit(f"{state}:*", STATEWIDE, route[1])
+        else:
+            unit = self._unit(f"{state}:{county}", COUNTY, route[1])
+        self._token_units[token] = unit
+        return unit
+
+    def cost_orders(self, orders: pd.DataFrame) -> pd.DataFrame:
+        """Cost one chunk of orders; returns ``OUTPUT_COLUMNS`` in input order."""
+        n = len(orders)
+        package = orders["package"].astype("string").str.strip().str.upper()
+        component = package.map(self.package_cost).astype(float).to_numpy()
+        searches = package.map(self.package_searches).fillna(False).astype(bool).to_numpy()
+
+        addresses = orders["addresses"].astype("string").reset_index(drop=True).where(searches)
+        tokens = addresses.str.split(ADDRESS_SEPARATOR).explode().str.strip()
+        tokens = tokens[tokens.notna() & tokens.ne("")]
+        codes, uniques = pd.factorize(tokens)
+        token_units = np.fromiter((self.resolve(token) for token in uniques), dtype=np.int64, count=len(uniques))
+
+        # One search per distinct jurisdiction per order
+        pairs = np.unique(tokens.index.to_numpy(dtype=np.int64) << 32 | token_units[codes])
+        rows, units = pairs >> 32, pairs & 0xFFFFFFFF
+        route = np.asarray(self._unit_route, dtype=np.int8)[units]
+        cost = np.asarray(self._unit_cost, dtype=float)[units]
+
+        def per_order(mask: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+            return np.bincount(rows[mask], weights=None if weights is None else weights[mask], minlength=n)
+
+        county, statewide = route == COUNTY, route == STATEWIDE
+        out = pd.DataFrame({
+            "order_id": orders["order_id"].to_numpy(),
+            "package": package.to_numpy(),
+            "county_searches": per_order(county),
+            "statewide_searches": per_order(statewide),
+            "unpriced_searches": per_order(route == UNPRICED),
+            "component_cost": component,
+            "county_fee_cost": per_order(county, cost).round(2),
+            "statewide_cost": per_order(statewide, cost).round(2),
+        })
+        out["total_cost"] = (out["component_cost"] + out["county_fee_cost"] + out["statewide_cost"]).round(2)
+        return out
+
+
+def summarize(costed: pd.DataFrame) -> pd.DataFrame:
+    """Per-package order counts and cost sums; chunk summaries add up to the file summary."""
+    summary = costed.groupby("package", dropna=False)[SUMMARY_SUM_COLUMNS].sum(min_count=1)
+    summary.insert(0, "orders", costed.groupby("package", dropna=False).size())
+    return summary
+
+
+def run(
+    orders_path: Path,
+    output_path: Path,
+    summary_path: Optional[Path],
+    engine: OrderCostEngine,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output_path.with_name(output_path.name + ".tmp")
+    summary: Optional[pd.DataFrame] = None
+    reader = pd.read_csv(orders_path, usecols=ORDER_COLUMNS, dtype=str, chunksize=chunk_size)
+    with tmp.open("w", encoding="utf-8", newline="") as out:
+        for number, chunk in enumerate(reader):
+            with span("cost_chunk", rows_in=len(chunk)) as chunk_span:
+                costed = engine.cost_orders(chunk)
+                costed.to_csv(out, index=False, header=number == 0, float_format="%.2f")
+                part = summarize(costed)
+                summary = part if summary is None else summary.add(part, fill_value=0)
+                chunk_span.rows_out = len(costed)
+        if summary is None:
+            out.write(",".join(OUTPUT_COLUMNS) + "\n")
+    tmp.replace(output_path)
+
+    summary = (summary if summary is not None else pd.DataFrame(columns=["orders"] + SUMMARY_SUM_COLUMNS)).reset_index()
+    summary["orders"] = summary["orders"].astype("int64")
+    summary = summary.round(2)
+    unknown = summary.loc[summary["component_cost"].isna(), "orders"].sum()
+    if unknown:
+        print(f"[WARN] {unknown} orders reference packages missing from the package config; total_cost left blank")
+    unpriced = summary["unpriced_searches"].sum()
+    if unpriced:
+        print(f"[WARN] {int(unpriced)} searches could not be priced (unknown state, or county without a route)")
+    print(f"[INFO] costed {summary['orders'].sum():,} orders (total {summary['total_cost'].sum():,.2f}) to {output_path}")
+    if summary_path:
+        summary_path.parent.mkdir(parents=True, exist_ok=True)
+        summary.to_csv(summary_path, index=False)
+        print(f"[INFO] wrote {len(summary)} package rows to {summary_path}")
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cost orders with address histories against the pricing tables")
+    parser.add_argument("--orders", type=Path, required=True, help="CSV with order_id, package, addresses (STATE:County;...)")
+    parser.add_argument("--output", type=Path, required=True, help="Per-order cost CSV")
+    parser.add_argument("--summary", type=Path, help="Optional per-package summary CSV")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--costs", type=Path, default=COSTS_PATH)
+    parser.add_argument("--internal", type=Path, default=INTERNAL_PATH)
+    parser.add_argument("--routing", type=Path, default=ROUTING_PATH, help="Routing table from search_routing.py")
+    parser.add_argument("--packages", type=Path, default=PACKAGES_PATH)
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    with instrumented_run("order_cost_engine", args.metrics_json, args.profile):
+        with span("load_tables"):
+            try:
+                engine = OrderCostEngine.from_files(args.costs, args.internal, args.routing, args.packages)
+            except ValueError as exc:
+                raise SystemExit(str(exc))
+        run(args.orders, args.output, args.summary, engine, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
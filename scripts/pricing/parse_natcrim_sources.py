@@ -3,61 +3,167 @@
 from __future__ import annotations
 
 import argparse
+import gzip
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
 import pandas as pd
 
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from jurisdictions import state_keys
+from publish_natcrim_shards import SHARDS_DIR, publish_shards
+
 
 def load_sources(path: Path) -> pd.DataFrame:
     # The workbook contains descriptive rows above the header; skip first 4 rows
-    df = pd.read_excel(path, sheet_name="Source List", header=4)
-    df = df.rename(
-        columns={
-            "Unnamed: 0": "state",
-            "Unnamed: 1": "jurisdiction",
-            "Unnamed: 2": "source_name",
-            "Unnamed: 3": "record_type",
-            "Unnamed: 4": "coverage_notes",
-            "Unnamed: 5": "update_date",
-        }
-    )
+    with span("load") as load_span:
+        df = pd.read_excel(path, sheet_name="Source List", header=4)
+        load_span.rows_out = len(df)
+
+    with span("clean", rows_in=len(df)) as clean_span:
+        df = df.rename(
+            columns={
+                "Unnamed: 0": "state",
+                "Unnamed: 1": "jurisdiction",
+                "Unnamed: 2": "source_name",
+                "Unnamed: 3": "record_type",
+                "Unnamed: 4": "coverage_notes",
+                "Unnamed: 5": "update_date",
+            }
+        )
 
-    # Drop any rows without a state value or the descriptive header rows
-    df = df.dropna(subset=["state", "source_name"], how="all")
-    df = df[df["state"].astype(str).str.upper() != "STATE"]
-    # Remove prose rows that start with long sentences
-    df = df[~df["state"].astype(str).str.startswith("InformData")]
+        # Drop any rows without a state value or the descriptive header rows
+        df = df.dropna(subset=["state", "source_name"], how="all")
+        df = df[df["state"].astype(str).str.upper() != "STATE"]
+        # Remove prose rows that start with long sentences
+        df = df[~df["state"].astype(str).str.startswith("InformData")]
 
-    # Normalise types
-    df["state"] = df["state"].astype(str).str.strip().str.upper()
-    df["jurisdiction"] = df["jurisdiction"].astype(str).str.strip()
-    df["source_name"] = df["source_name"].astype(str).str.strip()
-    df["record_type"] = df["record_type"].fillna("Other").astype(str).str.strip()
-    df["coverage_notes"] = df["coverage_notes"].fillna("").astype(str).str.strip()
-    df["update_date"] = pd.to_datetime(df["update_date"], errors="coerce")
+        # Normalise types
+        state = df["state"].astype(str).str.strip().str.upper()
+        df["state"] = state_keys(state).fillna(state)
+        df["jurisdiction"] = df["jurisdiction"].astype(str).str.strip()
+        df["source_name"] = df["source_name"].astype(str).str.strip()
+        df["record_type"] = df["record_type"].fillna("Other").astype(str).str.strip()
+        df["coverage_notes"] = df["coverage_notes"].fillna("").astype(str).str.strip()
+        df["update_date"] = pd.to_datetime(df["update_date"], errors="coerce")
+
+        clean_span.rows_out = len(df)
+        clean_span.rows_rejected = clean_span.rows_in - len(df)
 
     return df
 
 
+RECORD_FIELDS = ["state", "jurisdiction", "source_name", "record_type", "coverage_notes", "updated_at"]
+OUTPUT_FORMATS = ("json", "compact", "ndjson")
+PRECOMPRESS_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+BATCH_SIZE = 5_000
+
+
+def _isoformat(values: pd.Series) -> pd.Series:
+    """Vectorized ``Timestamp.isoformat()``; NaT becomes None."""
+    out = values.dt.strftime("%Y-%m-%dT%H:%M:%S").astype(object)
+    fractional = values.notna() & ((values.dt.microsecond != 0) | (values.dt.nanosecond != 0))
+    if fractional.any():
+        out[fractional] = values[fractional].map(lambda ts: ts.isoformat())
+    return out.where(values.notna(), None)
+
+
+def record_columns(df: pd.DataFrame) -> Dict[str, List[Any]]:
+    """Project ``df`` onto the published record fields, one Python list per column."""
+    def text(col: str, default: Optional[str]) -> List[Any]:
+        if col not in df.columns:
+            return [default] * len(df)
+        values = df[col].astype(object)
+        return values.where(values.notna(), default).tolist()
+
+    return {
+        "state": text("state", None),
+        "jurisdiction": [v or "" for v in text("jurisdiction", "")],
+        "source_name": text("source_name", None),
+        "record_type": text("record_type", None),
+        "coverage_notes": [v or "" for v in text("coverage_notes", "")],
+        "updated_at": _isoformat(pd.to_datetime(df["update_date"])).tolist(),
+    }
+
+
 def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    records: List[Dict[str, Any]] = []
-    for row in df.itertuples(index=False):
-        records.append(
-            {
-                "state": row.state,
-                "jurisdiction": getattr(row, "jurisdiction", "") or "",
-                "source_name": row.source_name,
-                "record_type": row.record_type,
-                "coverage_notes": getattr(row, "coverage_notes", "") or "",
-                "updated_at": row.update_date.isoformat() if pd.notna(row.update_date) else None,
-            }
-        )
-    return records
+    columns = record_columns(df)
+    return [dict(zip(RECORD_FIELDS, row)) for row in zip(*(columns[f] for f in RECORD_FIELDS))]
+
+
+def iter_encoded(df: pd.DataFrame, fmt: str = "json", batch_size: int = BATCH_SIZE) -> Iterator[str]:
+    """Yield the encoded dataset in text chunks of at most ``batch_size`` records.
 
+    ``json`` matches ``json.dumps(records, indent=2)``, ``compact`` drops all
+    whitespace and ``ndjson`` writes one record per line.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r}; choose from {OUTPUT_FORMATS}")
+    if fmt == "json" and df.empty:
+        yield "[]"
+        return
 
-def main() -> None:
+    opening, separator, closing = {
+        "json": ("[\n", ",\n", "\n]"),
+        "compact": ("[", ",", "]"),
+        "ndjson": ("", "\n", "\n"),
+    }[fmt]
+    encoder = json.JSONEncoder(indent=2) if fmt == "json" else json.JSONEncoder(separators=(",", ":"))
+
+    yield opening
+    for start in range(0, len(df), batch_size):
+        columns = record_columns(df.iloc[start:start + batch_size])
+        encoded = [encoder.encode(dict(zip(RECORD_FIELDS, row))) for row in zip(*(columns[f] for f in RECORD_FIELDS))]
+        if fmt == "json":
+            encoded = ["  " + item.replace("\n", "\n  ") for item in encoded]
+        yield (separator if start else "") + separator.join(encoded)
+    if not (fmt == "ndjson" and df.empty):
+        yield closing
+
+
+class _BrotliWriter:
+    def __init__(self, path: Path) -> None:
+        import brotli  # type: ignore
+
+        self._fh = path.open("wb")
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT)
+
+    def write(self, chunk: str) -> None:
+        self._fh.write(self._compressor.process(chunk.encode("utf-8")))
+
+    def close(self) -> None:
+        self._fh.write(self._compressor.finish())
+        self._fh.close()
+
+
+def write_records(df: pd.DataFrame, output: Path, fmt: str = "json", precompress: Iterable[str] = ()) -> List[Path]:
+    """Stream ``df`` to ``output`` (plus ``.gz``/``.br`` siblings) without building the full record list."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    sinks: List[Any] = [output.open("w", encoding="utf-8")]
+    written = [output]
+    for codec in precompress:
+        target = output.with_name(output.name + PRECOMPRESS_SUFFIXES[codec])
+        if codec == "gzip":
+            sinks.append(gzip.open(target, "wt", encoding="utf-8", compresslevel=9))
+        else:
+            try:
+                sinks.append(_BrotliWriter(target))
+            except ImportError:
+                print("[WARN] brotli not installed; skipping .br output (pip install brotli)")
+                continue
+        written.append(target)
+    try:
+        for chunk in iter_encoded(df, fmt):
+            for sink in sinks:
+                sink.write(chunk)
+    finally:
+        for sink in sinks:
+            sink.close()
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Parse InformData NatCrim source workbook")
     parser.add_argument("--input", type=Path, required=True, help="Path to InformData workbook")
     parser.add_argument(
@@ -66,14 +172,41 @@ def main() -> None:
         default=Path("content/pricing/informdata_natcrim_sources.json"),
         help="Path to write JSON dataset",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="json (indented, default), compact (minified JSON array) or ndjson (one record per line)",
+    )
+    parser.add_argument(
+        "--precompress",
+        default="",
+        help="Comma-separated precompressed variants to write alongside the output (gzip, br)",
+    )
+    parser.add_argument(
+        "--publish-shards",
+        action="store_true",
+        help="Also publish per-state JSON shards under content/pricing/shards/informdata_natcrim_sources/",
+    )
+    add_instrumentation_args(parser)
+    args = parser.parse_args(argv)
 
-    df = load_sources(args.input)
-    records = to_records(df)
+    precompress = [c.strip() for c in args.precompress.split(",") if c.strip()]
+    unknown = sorted(set(precompress) - set(PRECOMPRESS_SUFFIXES))
+    if unknown:
+        parser.error(f"unknown --precompress codecs: {unknown}")
 
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-    args.output.write_text(json.dumps(records, indent=2))
-    print(f"[INFO] wrote {len(records)} records to {args.output}")
+    with instrumented_run("parse_natcrim_sources", args.metrics_json, args.profile):
+        df = load_sources(args.input)
+        with span("write", rows_in=len(df)):
+            written = write_records(df, args.output, args.format, precompress)
+        for path in written:
+            print(f"[INFO] wrote {len(df)} records to {path}")
+        if args.publish_shards:
+            with span("publish_shards", rows_in=len(df)):
+                records = pd.DataFrame(record_columns(df), columns=RECORD_FIELDS)
+                manifest = publish_shards(records, SHARDS_DIR / "informdata_natcrim_sources", "informdata_natcrim_sources")
+            print(f"[INFO] wrote {manifest}")
 
 
 if __name__ == "__main__":
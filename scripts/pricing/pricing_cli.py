@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Single entry point for the pricing and validation scripts.
+
+Each subcommand maps to one script's ``main``. Only the standard library is
+imported up front, so ``pricing --help``, command typos and usage errors
+return without loading pandas; a command's module (and whatever it imports)
+is loaded when that command runs. ``validate`` only needs ``csv`` and
+PyYAML, so checking small CSVs never pays for pandas at all.
+
+``batch`` runs several commands in one process, so the interpreter and
+pandas start once and later steps reuse the modules already imported.
+
+Usage:
+    python scripts/pricing/pricing_cli.py --help
+    python scripts/pricing/pricing_cli.py validate \
+        --input data/pricing/samples/informdata_costs_sample.csv --dataset-id base_costs
+    python scripts/pricing/pricing_cli.py batch \
+        "compute --input data/pricing/informdata_costs.csv" \
+        "build" \
+        "validate --input data/pricing/informdata_costs.csv --dataset-id base_costs"
+    python scripts/pricing/pricing_cli.py batch --file pricing_steps.txt --keep-going
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import shlex
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+VALIDATION_DIR = Path(__file__).resolve().parents[1] / "validation"
+if str(VALIDATION_DIR) not in sys.path:
+    sys.path.append(str(VALIDATION_DIR))
+
+
+class Command(NamedTuple):
+    module: str
+    help: str
+
+
+COMMANDS: Dict[str, Command] = {
+    "extract": Command("extract_informdata_costs", "Normalize InformData pricing costs from the finance workbook"),
+    "compute": Command("compute_internal_pricing", "Compute internal total costs including platform overhead"),
+    "build": Command("build_pricing_table", "Build the consolidated pricing table"),
+    "refresh-natcrim": Command("refresh_natcrim_data", "Refresh the NatCrim coverage exports from a raw workbook"),
+    "parse-natcrim": Command("parse_natcrim_sources", "Parse the InformData NatCrim source workbook to JSON"),
+    "export-sales": Command("export_sales_workbook", "Export pricing and NatCrim outputs to a multi-sheet XLSX workbook"),
+    "validate": Command("validate_pricing_data", "Validate pricing CSVs against YAML schemas (no pandas)"),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pricing",
+        description="Run pricing and validation commands. Use 'pricing <command> --help' for command options.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="<command>", required=True)
+    for name, command in COMMANDS.items():
+        # Command options are parsed by the script itself once it is imported
+        commands.add_parser(name, help=command.help, add_help=False)
+    batch = commands.add_parser("batch", help="Run several commands in one process")
+    batch.add_argument("steps", nargs="*", help="Quoted commands, e.g. \"compute --input costs.csv\"")
+    batch.add_argument("--file", type=Path, help="File with one command per line ('#' starts a comment)")
+    batch.add_argument("--keep-going", action="store_true", help="Run the remaining commands after a failure")
+    return parser
+
+
+def _exit_code(code: object) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # Scripts raise SystemExit("message") for fatal input errors
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_command(name: str, argv: Sequence[str]) -> int:
+    """Import the module behind ``name`` and run its ``main`` with ``argv``; return the exit code."""
+    command = COMMANDS[name]
+    module = importlib.import_module(command.module)
+    program = sys.argv[0] if sys.argv else ""
+    # argparse derives ``prog`` from argv[0], so usage lines read "pricing <command>"
+    sys.argv[:1] = [f"pricing {name}"]
+    try:
+        return _exit_code(module.main(list(argv)))
+    except SystemExit as exc:
+        return _exit_code(exc.code)
+    finally:
+        sys.argv[:1] = [program]
+
+
+def parse_steps(steps: Sequence[str], path: Optional[Path] = None) -> List[Tuple[str, List[str]]]:
+    """Split batch steps into ``(command, argv)`` pairs, rejecting unknown commands before anything runs."""
+    lines = list(steps)
+    if path is not None:
+        if not path.exists():
+            raise ValueError(f"Batch file not found: {path}")
+        lines.extend(path.read_text(encoding="utf-8").splitlines())
+    parsed: List[Tuple[str, List[str]]] = []
+    for line in lines:
+        tokens = shlex.split(line, comments=True)
+        if not tokens:
+            continue
+        if tokens[0] == "pricing":
+            tokens = tokens[1:]
+        if not tokens or tokens[0] not in COMMANDS:
+            raise ValueError(f"Unknown batch command {line!r}; expected one of {', '.join(COMMANDS)}")
+        parsed.append((tokens[0], tokens[1:]))
+    if not parsed:
+        raise ValueError("No commands to run; pass quoted commands or --file")
+    return parsed
+
+
+def run_batch(steps: Sequence[Tuple[str, List[str]]], keep_going: bool = False) -> int:
+    """Run ``steps`` in order in this process; stop at the first failure unless ``keep_going``."""
+    failed = 0
+    status = 0
+    for position, (name, argv) in enumerate(steps, start=1):
+        label = shlex.join([name, *argv])
+        print(f"[INFO] batch step {position}/{len(steps)}: {label}")
+        start = time.perf_counter()
+        try:
+            code = run_command(name, argv)
+        except Exception:
+            # One broken step should not take the rest of a --keep-going batch with it
+            traceback.print_exc()
+            code = 1
+        elapsed = time.perf_counter() - start
+        if code == 0:
+            print(f"[INFO] batch step {position}/{len(steps)} finished in {elapsed:.2f}s")
+            continue
+        failed += 1
+        status = status or code
+        print(f"[ERROR] batch step {position}/{len(steps)} ({name}) exited with status {code}", file=sys.stderr)
+        if not keep_going:
+            skipped = len(steps) - position
+            if skipped:
+                print(f"[WARN] skipped {skipped} remaining batch step(s)")
+            return status
+    if failed:
+        print(f"[WARN] {failed} of {len(steps)} batch step(s) failed")
+    return status
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    parser = build_parser()
+    if argv and argv[0] in COMMANDS:
+        # Pass everything after the command through untouched, including -h/--help
+        return run_command(argv[0], argv[1:])
+    args = parser.parse_args(argv)
+    try:
+        steps = parse_steps(args.steps, args.file)
+    except ValueError as exc:
+        parser.error(str(exc))
+    return run_batch(steps, args.keep_going)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Publish NatCrim source exports as per-state, content-hashed JSON shards.
+
+Layout written under ``<shards-dir>/<dataset>/``::
+
+    manifest.json                  # small, fixed name; lists every shard + the index
+    state_totals.<hash>.json       # per-state totals with each state's shard file, plus dataset-wide summary
+    AK.<hash>.json(.gz|.br)        # one columnar shard per state
+
+Shards are ``{"state", "columns", "rows"}`` objects so keys are not repeated
+per record. The index's ``summary`` (row and distinct-source counts, and per
+record type its rows, records, newest refresh and the shards holding it) lets
+pages draw headline numbers without loading any shard, and fetch only the
+shards a record-type view needs. File names carry a content hash, so CDNs can
+cache them forever and a refresh only changes the manifest plus the shards
+whose data moved.
+
+Usage:
+    python scripts/pricing/publish_natcrim_shards.py \
+        --input content/pricing/natcrim_sources_2025-10-03.csv --snapshot-date 2025-10-03
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from natcrim_parquet import read_sources_dataset
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SHARDS_DIR = PROJECT_ROOT / "content/pricing/shards"
+HASH_LENGTH = 12
+STATE_COLUMNS = ("standardized_state", "state")
+SHARD_FILE_PATTERN = re.compile(r"^(?:[A-Z]{2,}|UNKNOWN|state_totals)\.[0-9a-f]{%d}\.json(?:\.gz|\.br)?$" % HASH_LENGTH)
+
+
+def _encode(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _jsonable(df: pd.DataFrame) -> List[List[Any]]:
+    values = df.astype(object).where(df.notna(), None)
+    return values.to_numpy().tolist()
+
+
+def _summary(df: pd.DataFrame, states: pd.Series) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"rows": int(len(df))}
+    if "source_name" in df:
+        summary["sources"] = int(df["source_name"].nunique())
+    if "record_type" in df:
+        types = df.assign(
+            record_type=df["record_type"].astype("string").fillna("UNKNOWN"),
+            shard=states,
+            refresh=pd.to_datetime(df["refresh_date"], errors="coerce") if "refresh_date" in df else pd.NaT,
+        )
+        grouped = types.groupby("record_type", sort=True)
+        summary["record_types"] = [
+            {
+                "record_type": record_type,
+                "rows": int(len(group)),
+                "records": int(group["record_count"].sum()) if "record_count" in group else None,
+                "newest_refresh": group["refresh"].max().strftime("%Y-%m-%d") if group["refresh"].notna().any() else None,
+                "states": sorted(group["shard"].unique().tolist()),
+            }
+            for record_type, group in grouped
+        ]
+    return summary
+
+
+def _write_variants(out_dir: Path, stem: str, data: bytes, brotli_enabled: bool) -> Dict[str, Any]:
+    digest = hashlib.sha256(data).hexdigest()
+    name = f"{stem}.{digest[:HASH_LENGTH]}.json"
+    (out_dir / name).write_bytes(data)
+    entry: Dict[str, Any] = {"file": name, "sha256": digest, "bytes": len(data)}
+
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    (out_dir / f"{name}.gz").write_bytes(gz)
+    entry["gzip_bytes"] = len(gz)
+    if brotli_enabled:
+        import brotli  # type: ignore
+
+        br = brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+        (out_dir / f"{name}.br").write_bytes(br)
+        entry["br_bytes"] = len(br)
+    return entry
+
+
+def _brotli_available() -> bool:
+    try:
+        import brotli  # type: ignore  # noqa: F401
+    except ImportError:
+        print("[WARN] brotli not installed; publishing gzip variants only (pip install brotli)")
+        return False
+    return True
+
+
+def publish_shards(
+    df: pd.DataFrame,
+    out_dir: Path,
+    dataset: str,
+    snapshot: Optional[str] = None,
+    state_column: Optional[str] = None,
+    prune: bool = True,
+) -> Path:
+    """Write one shard per state plus the totals index and manifest; return the manifest path."""
+    state_column = state_column or next((c for c in STATE_COLUMNS if c in df.columns), None)
+    if state_column is None:
+        raise SystemExit(f"Input has no state column (expected one of {STATE_COLUMNS})")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    brotli_enabled = _brotli_available()
+    states = df[state_column].astype("string").str.strip().str.upper().fillna("UNKNOWN")
+    columns = list(df.columns)
+
+    shards: Dict[str, Dict[str, Any]] = {}
+    totals: List[List[Any]] = []
+    for state, group in df.groupby(states, sort=True):
+        payload = {"state": state, "columns": columns, "rows": _jsonable(group)}
+        entry = _write_variants(out_dir, state, _encode(payload), brotli_enabled)
+        entry["rows"] = len(group)
+        shards[state] = entry
+
+        state_name = group["state_name"].dropna().iloc[0] if "state_name" in group and group["state_name"].notna().any() else None
+        records = int(group["record_count"].sum()) if "record_count" in group else None
+        sources = int(group["source_name"].nunique()) if "source_name" in group else None
+        totals.append([state, state_name, sources, records, len(group), entry["file"]])
+
+    index_payload = {
+        "columns": ["state", "state_name", "sources", "records", "rows", "shard"],
+        "rows": totals,
+        "summary": _summary(df, states),
+    }
+    index_entry = _write_variants(out_dir, "state_totals", _encode(index_payload), brotli_enabled)
+
+    manifest = {
+        "dataset": dataset,
+        "snapshot": snapshot,
+        "columns": columns,
+        "total_rows": int(len(df)),
+        "index": index_entry,
+        "shards": shards,
+    }
+    manifest_path = out_dir / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+    if prune:
+        live = {index_entry["file"]} | {entry["file"] for entry in shards.values()}
+        for path in out_dir.iterdir():
+            base = re.sub(r"\.(gz|br)$", "", path.name)
+            if SHARD_FILE_PATTERN.match(path.name) and base not in live:
+                path.unlink()
+    return manifest_path
+
+
+def read_sources(path: Path) -> pd.DataFrame:
+    if path.is_dir():
+        return read_sources_dataset(path)
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    if path.suffix == ".ndjson":
+        return pd.read_json(path, lines=True, dtype=False)
+    if path.suffix == ".json":
+        return pd.read_json(path, dtype=False)
+    return pd.read_csv(path, keep_default_na=False, na_values=[""])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish per-state NatCrim JSON shards for the coverage pages")
+    parser.add_argument("--input", type=Path, required=True, help="natcrim_sources CSV/Parquet or parse_natcrim_sources JSON/NDJSON")
+    parser.add_argument("--dataset", help="Dataset name (default: input stem without the snapshot date)")
+    parser.add_argument("--snapshot-date", dest="snapshot_date", help="Snapshot date recorded in the manifest")
+    parser.add_argument("--shards-dir", type=Path, default=SHARDS_DIR)
+    parser.add_argument("--keep-stale", action="store_true", help="Do not delete shards no longer referenced by the manifest")
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    dataset = args.dataset or re.sub(r"_\d{4}-\d{2}-\d{2}$", "", args.input.stem)
+    with instrumented_run("publish_natcrim_shards", args.metrics_json, args.profile):
+        with span("load") as load_span:
+            df = read_sources(args.input)
+            load_span.rows_out = len(df)
+        with span("publish", rows_in=len(df)):
+            manifest_path = publish_shards(df, args.shards_dir / dataset, dataset, args.snapshot_date, prune=not args.keep_stale)
+    print(f"[INFO] wrote {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
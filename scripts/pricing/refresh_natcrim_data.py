@@ -8,111 +8,87 @@ import re
 from collections import defaultdict
 from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
+from frame_writer import write_frame
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from jurisdictions import STATE_MAP, state_keys
+from natcrim_coverage_index import build_index
+from natcrim_cube import STALE_BUCKET, build_cube, months_before, refresh_age_bucket, rollup, write_cube
+from natcrim_duplicates import duplicates_report
+from natcrim_parquet import COMPRESSION_CODECS, DEFAULT_COMPRESSION, write_sources_dataset
+from natcrim_reconcile import export_paths, print_summary, run as reconcile_exports
+from publish_natcrim_shards import SHARDS_DIR, publish_shards
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = PROJECT_ROOT / "data/pricing"
 CONTENT_DIR = PROJECT_ROOT / "content/pricing"
 REPORTS_DIR = PROJECT_ROOT / "reports"
 CONFIG_DIR = PROJECT_ROOT / "config"
+GAP_RECORD_TYPE = "COURT"
 
 
-STATE_MAP: Dict[str, str] = {
-    "AL": "Alabama",
-    "AK": "Alaska",
-    "AZ": "Arizona",
-    "AR": "Arkansas",
-    "CA": "California",
-    "CO": "Colorado",
-    "CT": "Connecticut",
-    "DE": "Delaware",
-    "FL": "Florida",
-    "GA": "Georgia",
-    "HI": "Hawaii",
-    "ID": "Idaho",
-    "IL": "Illinois",
-    "IN": "Indiana",
-    "IA": "Iowa",
-    "KS": "Kansas",
-    "KY": "Kentucky",
-    "LA": "Louisiana",
-    "ME": "Maine",
-    "MD": "Maryland",
-    "MA": "Massachusetts",
-    "MI": "Michigan",
-    "MN": "Minnesota",
-    "MS": "Mississippi",
-    "MO": "Missouri",
-    "MT": "Montana",
-    "NE": "Nebraska",
-    "NV": "Nevada",
-    "NH": "New Hampshire",
-    "NJ": "New Jersey",
-    "NM": "New Mexico",
-    "NY": "New York",
-    "NC": "North Carolina",
-    "ND": "North Dakota",
-    "OH": "Ohio",
-    "OK": "Oklahoma",
-    "OR": "Oregon",
-    "PA": "Pennsylvania",
-    "RI": "Rhode Island",
-    "SC": "South Carolina",
-    "SD": "South Dakota",
-    "TN": "Tennessee",
-    "TX": "Texas",
-    "UT": "Utah",
-    "VT": "Vermont",
-    "VA": "Virginia",
-    "WA": "Washington",
-    "WV": "West Virginia",
-    "WI": "Wisconsin",
-    "WY": "Wyoming",
-    "DC": "District of Columbia",
-    "PR": "Puerto Rico",
-    "GU": "Guam",
-    "VI": "U.S. Virgin Islands",
-    "AS": "American Samoa",
-    "MP": "Northern Mariana Islands",
-    "UK": "United Kingdom",
-}
-
-
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--source", required=True, help="Path to the raw InformData NatCrim workbook")
     parser.add_argument("--snapshot-date", dest="snapshot_date", help="Snapshot date (YYYY-MM-DD). Defaults to date inferred from filename or today.")
     parser.add_argument("--log-missing", dest="missing_log", help="Optional path for missing record count log CSV.")
-    return parser.parse_args()
+    parser.add_argument("--parquet-compression", choices=COMPRESSION_CODECS, default=DEFAULT_COMPRESSION, help="Codec for the state-partitioned sources Parquet dataset.")
+    parser.add_argument("--reconcile-abs-tolerance", type=float, default=0, help="Per-key record delta accepted when reconciling against the legacy export.")
+    parser.add_argument("--reconcile-rel-tolerance", type=float, default=0.0, help="Per-key record delta accepted as a fraction of the legacy count.")
+    parser.add_argument("--publish-shards", action="store_true", help="Also publish per-state JSON shards under content/pricing/shards/natcrim_sources/.")
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="Only estimate totals from a stratified sample of the workbook (see natcrim_preview.py); writes only the run metrics, no exports or reports.",
+    )
+    # natcrim_preview imports this module, so it can only be imported once this module has loaded
+    from natcrim_preview import add_preview_args
 
+    add_preview_args(parser, prefix="preview-")
+    add_instrumentation_args(parser)
+    return parser.parse_args(argv)
 
-def infer_snapshot_date(path: Path, explicit: Optional[str]) -> date:
-    if explicit:
-        return datetime.strptime(explicit, "%Y-%m-%d").date()
 
+def snapshot_date_from_name(path: Path) -> Optional[date]:
+    """Date in a workbook name: ``..._2025-10-03.xlsx``, ``20251003`` or SecureShare's ``as of 10.3.25``."""
     match = re.search(r"(20\d{2})[-_]?([01]\d)[-_]?([0-3]\d)", path.name)
     if match:
         year, month, day = match.groups()
         return date(int(year), int(month), int(day))
+    match = re.search(r"(?<!\d)([01]?\d)\.([0-3]?\d)\.(\d{2}|20\d{2})(?!\d)", path.name)
+    if match:
+        month, day, year = (int(part) for part in match.groups())
+        try:
+            return date(year if year > 99 else 2000 + year, month, day)
+        except ValueError:
+            return None
+    return None
+
 
-    return date.today()
+def infer_snapshot_date(path: Path, explicit: Optional[str]) -> date:
+    if explicit:
+        return datetime.strptime(explicit, "%Y-%m-%d").date()
+    return snapshot_date_from_name(path) or date.today()
+
+
+RAW_COLUMNS: Dict[str, str] = {
+    "State": "state_code",
+    "Data Type": "record_type",
+    "Source Name": "source_name",
+    "County/Jurisdiction": "coverage_scope",
+    "Update Date": "refresh_date",
+    "Number of Records": "record_count",
+}
 
 
 def load_raw_dataframe(source: Path) -> pd.DataFrame:
     df = pd.read_excel(source, sheet_name="Source List", header=8, dtype={"State": "string"})
-    df = df.rename(
-        columns={
-            "State": "state_code",
-            "Data Type": "record_type",
-            "Source Name": "source_name",
-            "County/Jurisdiction": "coverage_scope",
-            "Update Date": "refresh_date",
-            "Number of Records": "record_count",
-        }
-    )
+    df = df.rename(columns=RAW_COLUMNS)
     return df
 
 
@@ -127,7 +103,7 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     df["refresh_date"] = pd.to_datetime(df["refresh_date"], errors="coerce").dt.date
     df["record_count"] = pd.to_numeric(df["record_count"], errors="coerce")
 
-    df["standardized_state"] = df["state_code"]
+    df["standardized_state"] = state_keys(df["state_code"]).fillna(df["state_code"]).astype(df["state_code"].dtype)
     df["state_name"] = df["standardized_state"].map(STATE_MAP)
 
     df["record_count"] = df["record_count"].fillna(0).astype("int64")
@@ -225,103 +201,172 @@ def classify_domains(df: pd.DataFrame, overrides: Iterable[tuple[str | None, str
     return df.apply(classify, axis=1)
 
 
-def write_outputs(clean_df: pd.DataFrame, snapshot_stamp: str) -> Dict[str, Path]:
-    CONTENT_DIR.mkdir(parents=True, exist_ok=True)
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+def scope_dataframe(clean_df: pd.DataFrame) -> pd.DataFrame:
+    """Attach ``coverage_domain`` to the clean frame using the configured overrides."""
+    with span("classify", rows_in=len(clean_df)):
+        overrides = load_overrides()
+        domains = classify_domains(clean_df, overrides)
+        return clean_df.assign(coverage_domain=domains)
+
+
+def write_outputs(
+    clean_df: pd.DataFrame,
+    snapshot_stamp: str,
+    cube: Optional[pd.DataFrame] = None,
+    parquet_compression: str = DEFAULT_COMPRESSION,
+    scoped_df: Optional[pd.DataFrame] = None,
+    content_dir: Optional[Path] = None,
+) -> Dict[str, Path]:
+    if scoped_df is None:
+        scoped_df = scope_dataframe(clean_df)
+    if cube is None:
+        cube = build_cube(scoped_df, date.fromisoformat(snapshot_stamp))
+    content_dir = content_dir or CONTENT_DIR
+    content_dir.mkdir(parents=True, exist_ok=True)
 
     outputs: Dict[str, Path] = {}
 
-    sources_csv = CONTENT_DIR / f"natcrim_sources_{snapshot_stamp}.csv"
-    sources_parquet = CONTENT_DIR / f"natcrim_sources_{snapshot_stamp}.parquet"
-    clean_df.to_csv(sources_csv, index=False)
-    clean_df.to_parquet(sources_parquet, index=False)
+    sources_csv = content_dir / f"natcrim_sources_{snapshot_stamp}.csv"
+    # Single-file download next to the partitioned dataset, which cannot be downloaded as one link
+    sources_parquet = content_dir / f"natcrim_sources_{snapshot_stamp}.parquet"
+    sources_dataset = content_dir / f"natcrim_sources_{snapshot_stamp}"
+    with span("write_sources", rows_in=len(clean_df)):
+        write_frame(clean_df, {"csv": sources_csv, "parquet": sources_parquet})
+        # The analytics feed also carries coverage_domain so queries can filter on it
+        write_sources_dataset(scoped_df, sources_dataset, parquet_compression)
     outputs["sources_csv"] = sources_csv
     outputs["sources_parquet"] = sources_parquet
+    outputs["sources_dataset"] = sources_dataset
 
-    state_totals = clean_df.groupby(["standardized_state", "state_name"], as_index=False)["record_count"].sum().sort_values("standardized_state")
-    state_totals_path = CONTENT_DIR / f"natcrim_state_totals_{snapshot_stamp}.csv"
-    state_totals.to_csv(state_totals_path, index=False)
+    with span("aggregate_totals", rows_in=len(cube)):
+        state_totals = rollup(cube, ["standardized_state", "state_name"])[["standardized_state", "state_name", "record_count"]].sort_values("standardized_state")
+        record_type_totals = rollup(cube, ["record_type"])[["record_type", "record_count"]].sort_values("record_type")
+    state_totals_path = content_dir / f"natcrim_state_totals_{snapshot_stamp}.csv"
+    write_frame(state_totals, {"csv": state_totals_path})
     outputs["state_totals"] = state_totals_path
 
-    record_type_totals = clean_df.groupby("record_type", as_index=False)["record_count"].sum().sort_values("record_type")
-    record_type_totals_path = CONTENT_DIR / f"natcrim_record_type_totals_{snapshot_stamp}.csv"
-    record_type_totals.to_csv(record_type_totals_path, index=False)
+    record_type_totals_path = content_dir / f"natcrim_record_type_totals_{snapshot_stamp}.csv"
+    write_frame(record_type_totals, {"csv": record_type_totals_path})
     outputs["record_type_totals"] = record_type_totals_path
 
-    return outputs
+    cube_path = write_cube(cube, content_dir / f"natcrim_rollup_cube_{snapshot_stamp}.parquet")
+    outputs["rollup_cube"] = cube_path
 
+    return outputs
 
-def write_scope_summary(clean_df: pd.DataFrame, snapshot_stamp: str) -> Dict[str, Path]:
-    overrides = load_overrides()
-    domains = classify_domains(clean_df, overrides)
-    scoped_df = clean_df.assign(coverage_domain=domains)
 
-    scope_summary = (
-        scoped_df.groupby(["standardized_state", "state_name", "coverage_domain"], as_index=False)
-        .agg(source_count=("source_name", "nunique"), total_records=("record_count", "sum"))
-        .sort_values(["standardized_state", "coverage_domain"])
-    )
-    scope_summary_path = CONTENT_DIR / f"natcrim_scope_summary_{snapshot_stamp}.csv"
-    scope_summary.to_csv(scope_summary_path, index=False)
-
-    # Duplicate key report for auditability
-    dupes_key = scoped_df[["standardized_state", "record_type", "source_name", "coverage_scope"]].astype(str).agg("|".join, axis=1)
-    duplicates = scoped_df[dupes_key.duplicated(keep=False)].copy()
-    duplicates_path = REPORTS_DIR / f"natcrim_scope_duplicates_{snapshot_stamp}.csv"
+def write_scope_summary(
+    clean_df: pd.DataFrame,
+    snapshot_stamp: str,
+    cube: Optional[pd.DataFrame] = None,
+    content_dir: Optional[Path] = None,
+    reports_dir: Optional[Path] = None,
+) -> Dict[str, Path]:
+    content_dir, reports_dir = content_dir or CONTENT_DIR, reports_dir or REPORTS_DIR
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    scoped_df = clean_df if "coverage_domain" in clean_df.columns else scope_dataframe(clean_df)
+    if cube is None:
+        cube = build_cube(scoped_df, date.fromisoformat(snapshot_stamp))
+
+    with span("aggregate_scope", rows_in=len(cube)) as aggregate_span:
+        scope_summary = (
+            rollup(cube, ["standardized_state", "state_name", "coverage_domain"])
+            .rename(columns={"record_count": "total_records"})
+            [["standardized_state", "state_name", "coverage_domain", "source_count", "total_records"]]
+            .sort_values(["standardized_state", "coverage_domain"])
+        )
+        aggregate_span.rows_out = len(scope_summary)
+    scope_summary_path = content_dir / f"natcrim_scope_summary_{snapshot_stamp}.csv"
+    write_frame(scope_summary, {"csv": scope_summary_path})
+
+    # Exact duplicate keys plus near-duplicate source names, for auditability
+    with span("duplicates", rows_in=len(scoped_df)) as dupes_span:
+        duplicates = duplicates_report(scoped_df)
+        dupes_span.rows_out = len(duplicates)
+    duplicates_path = reports_dir / f"natcrim_scope_duplicates_{snapshot_stamp}.csv"
     if duplicates.empty:
         duplicates_path.write_text("")
     else:
-        duplicates.to_csv(duplicates_path, index=False)
+        write_frame(duplicates, {"csv": duplicates_path})
 
     return {"scope_summary": scope_summary_path, "scope_duplicates": duplicates_path, "scoped_df": scoped_df}
 
 
-def write_missing_counts(clean_df: pd.DataFrame, snapshot_stamp: str, override_path: Optional[Path]) -> Path:
+def write_missing_counts(clean_df: pd.DataFrame, snapshot_stamp: str, override_path: Optional[Path], reports_dir: Optional[Path] = None) -> Path:
     missing = clean_df[clean_df["record_count"] == 0][["standardized_state", "record_type", "source_name", "coverage_scope"]]
-    log_path = override_path or (REPORTS_DIR / f"natcrim_missing_counts_{snapshot_stamp}.csv")
+    log_path = override_path or ((reports_dir or REPORTS_DIR) / f"natcrim_missing_counts_{snapshot_stamp}.csv")
     log_path.parent.mkdir(parents=True, exist_ok=True)
     if missing.empty:
         log_path.write_text("standardized_state,record_type,source_name,coverage_scope\n")
     else:
-        missing.to_csv(log_path, index=False)
+        write_frame(missing, {"csv": log_path})
     return log_path
 
 
-def write_qa_reports(scoped_df: pd.DataFrame, snapshot_stamp: str) -> Dict[str, Path]:
+def write_qa_reports(
+    scoped_df: pd.DataFrame,
+    snapshot_stamp: str,
+    cube: Optional[pd.DataFrame] = None,
+    reports_dir: Optional[Path] = None,
+) -> Dict[str, Path]:
+    reports_dir = reports_dir or REPORTS_DIR
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    # Refresh ages are measured from the snapshot date, so rebuilding an old snapshot gives the same reports
+    reference = date.fromisoformat(snapshot_stamp)
+    if cube is None or cube.attrs.get("reference_date") != reference.isoformat():
+        cube = build_cube(scoped_df, reference)
     statewide_path = CONTENT_DIR / "informdata_statewide_coverage.csv"
     qa_outputs: Dict[str, Path] = {}
 
+    with span("coverage_index", rows_in=len(scoped_df)) as index_span:
+        index = build_index(scoped_df)
+        index_span.rows_out = len(index)
+        index_span.rows_rejected = len(index.unresolved)
+
+    missing_states = []
+    court_gaps = []
+    county_gaps = pd.DataFrame()
     if statewide_path.exists():
         statewide_df = pd.read_csv(statewide_path)
-        statewide_df["state_code"] = statewide_df["state_code"].str.replace("US-", "", regex=False)
+        statewide_df["state_code"] = state_keys(statewide_df["state_code"])
         statewide_df["recommended_method"] = statewide_df["recommended_method"].fillna("")
 
-        county_counts = (
-            scoped_df[scoped_df["coverage_domain"] == "COUNTY"]
-            .groupby("standardized_state")["source_name"].nunique()
-            .to_dict()
-        )
-
         needs_county = statewide_df[statewide_df["recommended_method"].str.contains("County", case=False, na=False)]
-        missing_states = [
-            {
-                "code": row["state_code"],
-                "name": row["state_name"],
-                "reason": "NatCrim dataset has no county-level sources where county researchers are required.",
-            }
-            for _, row in needs_county.iterrows()
-            if county_counts.get(row["state_code"], 0) == 0
-        ]
-    else:
-        missing_states = []
-
-    coverage_report = REPORTS_DIR / f"natcrim_coverage_gaps_{snapshot_stamp}.md"
-    stale_report = REPORTS_DIR / f"natcrim_stale_sources_{snapshot_stamp}.csv"
-
-    cutoff = date.today().replace(year=date.today().year - 1)
-    stale_sources = scoped_df.copy()
-    stale_sources["refresh_date_dt"] = pd.to_datetime(stale_sources["refresh_date"], errors="coerce")
-    stale_sources = stale_sources[stale_sources["refresh_date_dt"].dt.date < cutoff][
+        court_bit = index.mask_for([GAP_RECORD_TYPE])
+        gap_positions = []
+        for _, row in needs_county.iterrows():
+            counties = index.select([row["state_code"]])
+            # Only county-scoped court sources count; DOC facilities or arrest agencies do not replace
+            # county researchers, and a state with no indexed counties has no coverage at all
+            if not len(index.select([row["state_code"]], has=[GAP_RECORD_TYPE])):
+                missing_states.append({
+                    "code": row["state_code"],
+                    "name": row["state_name"],
+                    "reason": f"NatCrim dataset has no county-level {GAP_RECORD_TYPE} sources where county researchers are required.",
+                })
+            lacking = index.select([row["state_code"]], lacks=[GAP_RECORD_TYPE])
+            if len(lacking):
+                gap_positions.append(lacking)
+                court_gaps.append({
+                    "code": row["state_code"],
+                    "name": row["state_name"],
+                    "counties": len(counties),
+                    "lacking": len(lacking),
+                    "statewide": bool(index.statewide_mask.get(row["state_code"], 0) & court_bit),
+                    "examples": [index.county_names[i] for i in lacking[:5]],
+                })
+        if gap_positions:
+            county_gaps = index.frame(np.concatenate(gap_positions))
+
+    county_gaps_path = reports_dir / f"natcrim_county_coverage_gaps_{snapshot_stamp}.csv"
+    write_frame(county_gaps, {"csv": county_gaps_path})
+
+    coverage_report = reports_dir / f"natcrim_coverage_gaps_{snapshot_stamp}.md"
+    stale_report = reports_dir / f"natcrim_stale_sources_{snapshot_stamp}.csv"
+
+    cutoff = months_before(reference, 12)
+    stale_mask = refresh_age_bucket(scoped_df["refresh_date"], reference) == STALE_BUCKET
+    stale_sources = scoped_df[stale_mask][
         [
             "standardized_state",
             "state_name",
@@ -332,18 +377,19 @@ def write_qa_reports(scoped_df: pd.DataFrame, snapshot_stamp: str) -> Dict[str,
         ]
     ]
     stale_sources = stale_sources.fillna({"standardized_state": "UNKNOWN", "state_name": "Unknown"})
-    stale_sources.to_csv(stale_report, index=False)
+    write_frame(stale_sources, {"csv": stale_report})
 
+    stale_cells = cube[cube["refresh_age"] == STALE_BUCKET].fillna({"standardized_state": "UNKNOWN", "state_name": "Unknown"})
     stale_summary = (
-        stale_sources.groupby(["standardized_state", "state_name"], as_index=False)
-        .agg(stale_sources=("source_name", "nunique"), oldest_refresh=("refresh_date", "min"))
+        rollup(stale_cells, ["standardized_state", "state_name"])
+        .rename(columns={"source_count": "stale_sources"})
         .sort_values("stale_sources", ascending=False)
     )
 
     lines = [
         "# NatCrim Coverage QA Report",
         "",
-        f"- **Generated:** {date.today():%Y-%m-%d}",
+        f"- **Snapshot:** {snapshot_stamp}",
         f"- **Stale refresh threshold:** {cutoff:%Y-%m-%d}",
         "",
         "## States Lacking County-Level Coverage",
@@ -354,13 +400,35 @@ def write_qa_reports(scoped_df: pd.DataFrame, snapshot_stamp: str) -> Dict[str,
         for item in sorted(missing_states, key=lambda x: x["code"]):
             lines.append(f"| {item['code']} ({item['name']}) | {item['reason']} |")
     else:
-        lines.append("No gaps detected — every county-required state has at least one county-level source in the NatCrim dataset.")
+        lines.append(f"No gaps detected — every county-required state has at least one county-level {GAP_RECORD_TYPE} source in the NatCrim dataset.")
+
+    lines.extend(["", f"## Counties Without County-Level {GAP_RECORD_TYPE.title()} Coverage"])
+    if court_gaps:
+        lines.append(
+            f"Counties in county-required states with no county-scoped {GAP_RECORD_TYPE} source. "
+            f"See `{(REPORTS_DIR / county_gaps_path.name).relative_to(PROJECT_ROOT)}` for every county."
+        )
+        lines.append("| State | Counties | Lacking | Statewide Source | Examples |")
+        lines.append("| --- | --- | --- | --- | --- |")
+        for item in sorted(court_gaps, key=lambda x: x["code"]):
+            statewide = "Yes" if item["statewide"] else "No"
+            lines.append(
+                f"| {item['code']} ({item['name']}) | {item['counties']} | {item['lacking']} | {statewide} | {', '.join(item['examples'])} |"
+            )
+    else:
+        lines.append(f"Every county in county-required states has a county-scoped {GAP_RECORD_TYPE} source.")
+    if not index.unresolved.empty:
+        lines.append("")
+        lines.append(
+            f"{len(index.unresolved):,} source rows name a coverage scope that does not match a known county "
+            "(typos or out-of-state scopes) and are excluded from county coverage."
+        )
 
     lines.extend(["", "## Sources Older Than 12 Months"])
     if stale_summary.empty:
         lines.append("All sources refreshed within the last 12 months.")
     else:
-        lines.append(f"See `{stale_report.relative_to(PROJECT_ROOT)}` for the full export. Top states:")
+        lines.append(f"See `{(REPORTS_DIR / stale_report.name).relative_to(PROJECT_ROOT)}` for the full export. Top states:")
         lines.append("| State | Stale Sources | Oldest Refresh |")
         lines.append("| --- | --- | --- |")
         for _, row in stale_summary.head(15).iterrows():
@@ -369,26 +437,98 @@ def write_qa_reports(scoped_df: pd.DataFrame, snapshot_stamp: str) -> Dict[str,
     coverage_report.write_text("\n".join(lines) + "\n")
 
     qa_outputs["coverage_report"] = coverage_report
+    qa_outputs["county_gaps"] = county_gaps_path
     qa_outputs["stale_report"] = stale_report
     return qa_outputs
 
 
-def main() -> None:
-    args = parse_args()
+def refresh_snapshot(
+    source_path: Path,
+    snapshot_stamp: str,
+    parquet_compression: str = DEFAULT_COMPRESSION,
+    missing_log: Optional[Path] = None,
+    publish: bool = False,
+    reconcile_abs_tolerance: float = 0,
+    reconcile_rel_tolerance: float = 0.0,
+    content_dir: Optional[Path] = None,
+    reports_dir: Optional[Path] = None,
+) -> Tuple[Dict[str, Path], pd.DataFrame]:
+    """Run the full refresh for one workbook; returns the labelled output paths and the clean frame.
+
+    Outputs go to ``content_dir``/``reports_dir`` (default: the published
+    locations). Inputs such as the statewide coverage sheet and the legacy
+    export to reconcile against are always read from the published locations.
+    """
+    content_dir, reports_dir = content_dir or CONTENT_DIR, reports_dir or REPORTS_DIR
+    with span("load") as load_span:
+        raw_df = load_raw_dataframe(source_path)
+        load_span.rows_out = len(raw_df)
+    with span("clean", rows_in=len(raw_df)) as clean_span:
+        clean_df = clean_dataframe(raw_df)
+        clean_span.rows_out = len(clean_df)
+
+    scoped_df = scope_dataframe(clean_df)
+    with span("cube", rows_in=len(scoped_df)) as cube_span:
+        cube = build_cube(scoped_df, date.fromisoformat(snapshot_stamp))
+        cube_span.rows_out = len(cube)
+
+    with span("outputs", rows_in=len(clean_df)):
+        outputs = write_outputs(clean_df, snapshot_stamp, cube, parquet_compression, scoped_df, content_dir)
+    if publish:
+        with span("publish_shards", rows_in=len(clean_df)):
+            outputs["shard_manifest"] = publish_shards(clean_df, SHARDS_DIR / "natcrim_sources", "natcrim_sources", snapshot_stamp)
+    with span("scope_summary", rows_in=len(clean_df)):
+        scoped_outputs = write_scope_summary(scoped_df, snapshot_stamp, cube, content_dir, reports_dir)
+    outputs["scope_summary"] = scoped_outputs["scope_summary"]
+    outputs["scope_duplicates"] = scoped_outputs["scope_duplicates"]
+    with span("missing_counts", rows_in=len(clean_df)) as missing_span:
+        outputs["missing_counts"] = write_missing_counts(clean_df, snapshot_stamp, missing_log, reports_dir)
+        missing_span.rows_rejected = int((clean_df["record_count"] == 0).sum())
+    with span("qa_reports", rows_in=len(clean_df)):
+        outputs.update(write_qa_reports(scoped_df, snapshot_stamp, cube, reports_dir))
+    if export_paths(snapshot_stamp, CONTENT_DIR)["legacy_sources"].exists():
+        with span("reconcile", rows_in=len(clean_df)):
+            reconciled = reconcile_exports(
+                snapshot_stamp, content_dir, reports_dir, reconcile_abs_tolerance, reconcile_rel_tolerance, legacy_dir=CONTENT_DIR
+            )
+        outputs["reconciliation"] = reconciled["report"]
+        outputs["reconciliation_summary"] = reconciled["summary"]
+    return outputs, clean_df
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
     source_path = Path(args.source).expanduser().resolve()
     if not source_path.exists():
         raise SystemExit(f"Source workbook not found: {source_path}")
 
+    if args.preview:
+        # natcrim_preview reuses this module's clean/classify steps, so import it here
+        from natcrim_preview import print_preview, run_preview
+
+        with instrumented_run("refresh_natcrim_data_preview", args.metrics_json, args.profile):
+            try:
+                preview = run_preview(source_path, args.preview_per_stratum, args.preview_seed, tuple(args.preview_expected_records))
+            except ValueError as exc:
+                raise SystemExit(f"[ERROR] {exc}")
+        print_preview(preview)
+        if preview.problems:
+            raise SystemExit(1)
+        return
+
     snapshot = infer_snapshot_date(source_path, args.snapshot_date)
     snapshot_stamp = snapshot.strftime("%Y-%m-%d")
 
-    raw_df = load_raw_dataframe(source_path)
-    clean_df = clean_dataframe(raw_df)
-
-    outputs = write_outputs(clean_df, snapshot_stamp)
-    scoped_outputs = write_scope_summary(clean_df, snapshot_stamp)
-    missing_log_path = write_missing_counts(clean_df, snapshot_stamp, Path(args.missing_log).expanduser() if args.missing_log else None)
-    qa_outputs = write_qa_reports(scoped_outputs["scoped_df"], snapshot_stamp)
+    with instrumented_run("refresh_natcrim_data", args.metrics_json, args.profile):
+        outputs, clean_df = refresh_snapshot(
+            source_path,
+            snapshot_stamp,
+            args.parquet_compression,
+            Path(args.missing_log).expanduser().resolve() if args.missing_log else None,
+            args.publish_shards,
+            args.reconcile_abs_tolerance,
+            args.reconcile_rel_tolerance,
+        )
 
     total_records = clean_df["record_count"].sum()
     unique_states = clean_df["standardized_state"].nunique()
@@ -401,11 +541,11 @@ def main() -> None:
     print("")
     for label, path in outputs.items():
         print(f"  {label.replace('_', ' ').title():<28} {path.relative_to(PROJECT_ROOT)}")
-    print(f"  Scope summary{'':<18} {scoped_outputs['scope_summary'].relative_to(PROJECT_ROOT)}")
-    print(f"  Duplicates report{'':<16} {scoped_outputs['scope_duplicates'].relative_to(PROJECT_ROOT)}")
-    print(f"  Missing counts log{'':<15} {missing_log_path.relative_to(PROJECT_ROOT)}")
-    print(f"  Coverage QA{'':<22} {qa_outputs['coverage_report'].relative_to(PROJECT_ROOT)}")
-    print(f"  Stale source export{'':<13} {qa_outputs['stale_report'].relative_to(PROJECT_ROOT)}")
+    print("")
+    if "reconciliation_summary" in outputs:
+        print_summary(outputs["reconciliation_summary"])
+    else:
+        print(f"[WARN] No legacy InformData export for {snapshot_stamp}; skipped reconciliation")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Run compute + build in one process, handing typed frames between stages in memory.
+
+The standalone scripts round-trip through ``internal_pricing.csv``; this runner
+computes the internal pricing frame, feeds it straight into the table builder
+and only serializes CSV/JSON once both stages have finished.
+
+Usage:
+    python scripts/pricing/run_pricing_pipeline.py \
+        --costs data/pricing/informdata_costs.csv \
+        --internal-output data/pricing/internal_pricing.csv \
+        --output content/pricing/informdata_pricing_table.csv
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+import build_pricing_table
+import compute_internal_pricing
+from frame_writer import log_written, write_outputs
+from instrumentation import add_instrumentation_args, instrumented_run, span
+
+
+def read_csv_frame(path: Path, text_columns: Iterable[str] = ()) -> pd.DataFrame:
+    """Read a pricing CSV with the Arrow parser when pyarrow is installed.
+
+    ``text_columns`` are pinned to strings so the Arrow parser does not turn
+    ISO dates into timestamps; the result matches ``pd.read_csv`` exactly.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.read_csv(path)
+    return pd.read_csv(path, engine="pyarrow", dtype={col: str for col in text_columns})
+
+
+def run(
+    cost_path: Path,
+    competitor_path: Path,
+    internal_output: Path,
+    output_path: Path,
+    default_platform: float,
+    version: str,
+    config_path: Path | None,
+) -> None:
+    with span("load") as load_span:
+        cost_df = read_csv_frame(cost_path, text_columns=["effective_date"])
+        competitor_df = read_csv_frame(competitor_path, text_columns=["observed_date"])
+        overrides = compute_internal_pricing.load_overrides(config_path)
+        load_span.rows_out = len(cost_df)
+
+    with span("compute", rows_in=len(cost_df)) as compute_span:
+        internal_df = compute_internal_pricing.compute_frame(cost_df, default_platform, version, overrides)
+        compute_span.rows_out = len(internal_df)
+    with span("build", rows_in=len(internal_df)) as build_span:
+        table = build_pricing_table.build_frame(cost_df, internal_df, competitor_df)
+        build_span.rows_out = len(table)
+
+    with span("write_internal", rows_in=len(internal_df)):
+        log_written(write_outputs(internal_df, internal_output))
+    build_pricing_table.write_table(table, output_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compute internal pricing and build the pricing table in one pass")
+    parser.add_argument("--costs", type=Path, default=Path("data/pricing/informdata_costs.csv"))
+    parser.add_argument("--competitor", type=Path, default=Path("data/pricing/competitor_msps.csv"))
+    parser.add_argument("--internal-output", type=Path, default=Path("data/pricing/internal_pricing.csv"))
+    parser.add_argument("--output", type=Path, default=Path("content/pricing/informdata_pricing_table.csv"))
+    parser.add_argument(
+        "--default-platform",
+        type=float,
+        default=compute_internal_pricing.DEFAULT_PLATFORM_COST,
+        help="Default platform cost to add when no override exists",
+    )
+    parser.add_argument("--version", default=compute_internal_pricing.DEFAULT_VERSION)
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=compute_internal_pricing.DEFAULT_CONFIG_PATH,
+        help="Optional JSON config with per-service automation/platform overrides",
+    )
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    config_path: Path | None = args.config
+    if config_path and not config_path.exists():
+        config_path = None
+
+    with instrumented_run("run_pricing_pipeline", args.metrics_json, args.profile):
+        run(args.costs, args.competitor, args.internal_output, args.output, args.default_platform, args.version, config_path)
+
+
+if __name__ == "__main__":
+    main()
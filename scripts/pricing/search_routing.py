@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Compile the statewide-vs-county search routing table and the county fee summary.
+
+For every county in the court fee schedule the cheapest compliant route is
+precomputed:
+
+* ``statewide`` – the state's repository (``STATEWIDE_CRIMINAL_<ST>`` in
+  ``informdata_statewide.csv`` plus the coverage sheet's source cost). Only
+  compliant where ``informdata_statewide_coverage.csv`` marks the statewide
+  source as recommended (complete case/disposition coverage);
+* ``county`` – the county's plain fee row (search cost, 10-year surcharge,
+  court fee and access fee). Court variants listed next to it ("Belknap +
+  District", "Ashley and Hamburg District Court") are optional add-ons
+  under "... by Request" headers and are not added in; a county with no
+  plain row is priced from its cheapest row.
+
+A county takes the statewide route when it is compliant and no dearer than
+the county search. States with a compliant statewide source also get a
+``county_key = "*"`` row so counties missing from the fee sheet still route.
+The table is keyed and sorted by ``(state_code, county_key)``; order costing
+(``order_cost_engine``) is a lookup against it.
+
+The same pass regenerates ``content/pricing/county_fee_summary.csv`` (fee
+averages/median per fee-sheet state plus total-fee percentiles and route
+counts).
+
+Usage:
+    python scripts/pricing/search_routing.py
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from court_fee_index import FEE_COLUMNS
+from instrumentation import add_instrumentation_args, instrumented_run, span
+from jurisdictions import NATIONAL_CODE, county_keys, state_keys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FEES_PATH = PROJECT_ROOT / "data/pricing/informdata_court_access_fees.csv"
+STATEWIDE_PATH = PROJECT_ROOT / "data/pricing/informdata_statewide.csv"
+COVERAGE_PATH = PROJECT_ROOT / "content/pricing/informdata_statewide_coverage.csv"
+ROUTING_PATH = PROJECT_ROOT / "content/pricing/search_routing.csv"
+SUMMARY_PATH = PROJECT_ROOT / "content/pricing/county_fee_summary.csv"
+
+ROUTE_COUNTY, ROUTE_STATEWIDE = "county", "statewide"
+STATEWIDE_KEY = "*"
+STATEWIDE_SERVICE_PREFIX = "STATEWIDE_CRIMINAL_"
+ROUTING_COLUMNS = [
+    "state_code",
+    "county_key",
+    "county_name",
+    "route",
+    "route_cost",
+    "county_cost",
+    "statewide_cost",
+    "statewide_compliant",
+]
+PERCENTILES = (0.25, 0.5, 0.75, 0.9)
+
+Route = Tuple[str, float]
+
+
+def county_search_costs(fees: pd.DataFrame) -> pd.DataFrame:
+    """``state_code``/``county_key``/``county_name``/``county_cost`` per county in the fee schedule."""
+    rows = fees.dropna(subset=["state_code", "county_key"])
+    rows = rows[rows["state_code"] != NATIONAL_CODE]
+    rows = rows.assign(total_fee=rows[list(FEE_COLUMNS)].fillna(0.0).sum(axis=1))
+    # The plain county row ("Belknap") is the standard search; court-specific rows are add-ons
+    rows = rows.assign(plain=county_keys(rows["jurisdiction"]) == rows["county_key"])
+    rows = rows.sort_values(["plain", "total_fee"], ascending=[False, True], kind="stable")
+    counties = rows.drop_duplicates(["state_code", "county_key"]).sort_values(["state_code", "county_key"])
+    counties = counties.rename(columns={"jurisdiction": "county_name", "total_fee": "county_cost"})
+    counties["county_cost"] = counties["county_cost"].round(2)
+    return counties[["state_code", "county_key", "county_name", "county_cost"]].reset_index(drop=True)
+
+
+def statewide_search_costs(statewide: pd.DataFrame, coverage: pd.DataFrame) -> pd.DataFrame:
+    """``state_code``/``statewide_cost``/``statewide_compliant`` for every state with a priced statewide search."""
+    searches = statewide[statewide["service_id"].str.startswith(STATEWIDE_SERVICE_PREFIX)]
+    search_cost = searches.groupby("state_code")["informdata_cost"].min()
+
+    coverage = pd.DataFrame({
+        "state_code": state_keys(coverage["state_code"]),
+        "source_cost": coverage["source_cost_usd"].fillna(0.0).astype(float),
+        "statewide_compliant": coverage["statewide_recommended"].astype("string").str.strip().str.upper().eq("YES").fillna(False).astype(bool),
+    }).dropna(subset=["state_code"])
+    unpriced = sorted(set(coverage.loc[coverage["statewide_compliant"], "state_code"]) - set(search_cost.index))
+    for state in unpriced:
+        print(f"[WARN] statewide source recommended for {state} but no {STATEWIDE_SERVICE_PREFIX}{state} price; routing counties")
+
+    out = coverage.merge(search_cost.rename("search_cost").reset_index(), on="state_code", how="inner")
+    out["statewide_cost"] = (out["search_cost"] + out["source_cost"]).round(2)
+    return out[["state_code", "statewide_cost", "statewide_compliant"]].sort_values("state_code").reset_index(drop=True)
+
+
+def build_routing(fees: pd.DataFrame, statewide: pd.DataFrame, coverage: pd.DataFrame) -> pd.DataFrame:
+    """Cheapest compliant route per ``(state_code, county_key)``, plus ``*`` fallback rows for statewide states."""
+    counties = county_search_costs(fees)
+    options = statewide_search_costs(statewide, coverage)
+    table = counties.merge(options, on="state_code", how="left")
+    table["statewide_compliant"] = table["statewide_compliant"].fillna(False).astype(bool)
+
+    use_statewide = table["statewide_compliant"].to_numpy() & (table["statewide_cost"] <= table["county_cost"]).to_numpy()
+    table["route"] = np.where(use_statewide, ROUTE_STATEWIDE, ROUTE_COUNTY)
+    table["route_cost"] = np.where(use_statewide, table["statewide_cost"], table["county_cost"])
+
+    fallback = options[options["statewide_compliant"]].assign(
+        county_key=STATEWIDE_KEY,
+        county_name="All other counties",
+        route=ROUTE_STATEWIDE,
+        route_cost=lambda df: df["statewide_cost"],
+        county_cost=np.nan,
+    )
+    table = pd.concat([table, fallback], ignore_index=True)[ROUTING_COLUMNS]
+    table = table.sort_values(["state_code", "county_key"], kind="stable").reset_index(drop=True)
+    if table.duplicated(["state_code", "county_key"]).any():
+        raise ValueError("Routing table has duplicate (state_code, county_key) keys")
+    return table
+
+
+def fee_summary(fees: pd.DataFrame, routing: pd.DataFrame) -> pd.DataFrame:
+    """Per fee-sheet state: jurisdiction count, fee averages/median, total-fee percentiles and route counts."""
+    fees = fees.assign(total_fee=fees[list(FEE_COLUMNS)].fillna(0.0).sum(axis=1))
+    grouped = fees.groupby("state", sort=True)
+    summary = grouped.agg(
+        jurisdictions=("jurisdiction", "size"),
+        avg_search_cost=("search_cost", "mean"),
+        median_search_cost=("search_cost", "median"),
+        avg_court_fee=("court_fee", "mean"),
+        avg_access_fee=("access_fee", "mean"),
+    )
+    quantiles = grouped["total_fee"].quantile(list(PERCENTILES)).unstack()
+    for q in PERCENTILES:
+        summary[f"p{int(q * 100)}_total_fee"] = quantiles[q]
+
+    counties = routing[routing["county_key"] != STATEWIDE_KEY]
+    routes = counties.groupby(["state_code", "route"]).size().unstack(fill_value=0)
+    routes = routes.reindex(columns=[ROUTE_STATEWIDE, ROUTE_COUNTY], fill_value=0)
+    codes = state_keys(summary.index.to_series())
+    summary["statewide_routed_counties"] = codes.map(routes[ROUTE_STATEWIDE]).fillna(0).astype("int64").to_numpy()
+    summary["county_routed_counties"] = codes.map(routes[ROUTE_COUNTY]).fillna(0).astype("int64").to_numpy()
+    statewide_cost = routing.drop_duplicates("state_code").set_index("state_code")["statewide_cost"]
+    summary["statewide_cost"] = codes.map(statewide_cost).to_numpy()
+    return summary.round(2).reset_index()
+
+
+def load_routes(path: Path = ROUTING_PATH) -> Dict[Tuple[str, str], Route]:
+    """``(state_code, county_key) -> (route, cost)``; use :func:`lookup_route` for the ``*`` fallback."""
+    table = pd.read_csv(path, usecols=["state_code", "county_key", "route", "route_cost"], dtype={"county_key": str}, keep_default_na=False)
+    return {
+        (state, key): (route, float(cost))
+        for state, key, route, cost in zip(table["state_code"], table["county_key"], table["route"], table["route_cost"])
+    }
+
+
+def lookup_route(routes: Dict[Tuple[str, str], Route], state: Optional[str], county: Optional[str]) -> Optional[Route]:
+    if not state:
+        return None
+    return routes.get((state, county or STATEWIDE_KEY)) or routes.get((state, STATEWIDE_KEY))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile the search routing table and county fee summary")
+    parser.add_argument("--fees", type=Path, default=FEES_PATH)
+    parser.add_argument("--statewide", type=Path, default=STATEWIDE_PATH)
+    parser.add_argument("--coverage", type=Path, default=COVERAGE_PATH)
+    parser.add_argument("--output", type=Path, default=ROUTING_PATH, help="Routing table CSV")
+    parser.add_argument("--summary-output", type=Path, default=SUMMARY_PATH, help="County fee summary CSV")
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    with instrumented_run("search_routing", args.metrics_json, args.profile):
+        with span("load"):
+            fees = pd.read_csv(args.fees)
+            statewide = pd.read_csv(args.statewide)
+            coverage = pd.read_csv(args.coverage)
+        with span("route", rows_in=len(fees)) as route_span:
+            routing = build_routing(fees, statewide, coverage)
+            summary = fee_summary(fees, routing)
+            route_span.rows_out = len(routing)
+        for frame, path, label in ((routing, args.output, "routes"), (summary, args.summary_output, "state summaries")):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            frame.to_csv(path, index=False)
+            print(f"[INFO] wrote {len(frame)} {label} to {path}")
+        statewide_share = (routing["route"] == ROUTE_STATEWIDE).mean()
+        print(f"[INFO] {statewide_share:.0%} of routes use a statewide source")
+
+
+if __name__ == "__main__":
+    main()
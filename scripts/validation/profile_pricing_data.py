@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""Stream column-level profiles (nulls, distinct counts, ranges, top values, quantiles) of pricing datasets.
+
+Any CSV file or directory that validate_pricing_data.py accepts can be profiled.
+Rows are read in chunks and folded into small per-column sketches, so memory
+stays flat however large the input is:
+
+* row / null / unparsable counts and exact min/max,
+* HyperLogLog registers for the distinct count (about 1.6% standard error),
+* a KLL-style compactor for quantiles of numeric and date columns,
+* Misra-Gries counters for the most frequent values.
+
+Every sketch is mergeable, and its state is saved in the profile JSON. Profiles of
+file chunks, directory members or older snapshots can therefore be combined
+with ``--merge`` without rescanning the data. Merging the same source file twice
+is refused.
+
+Usage:
+    python scripts/validation/profile_pricing_data.py \
+        --input data/pricing/informdata_costs.csv --dataset-id base_costs \
+        --output docs/data_schemas/reports/informdata_costs_profile.json
+
+    python scripts/validation/profile_pricing_data.py \
+        --merge reports/part-1_profile.json reports/part-2_profile.json \
+        --output docs/data_schemas/reports/natcrim_sources_profile.json
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import datetime as dt
+import hashlib
+import json
+import math
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from validate_pricing_data import Schema, iter_csv_files, load_schema
+from instrumentation import add_instrumentation_args, instrumented_run, span
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+REPORTS_DIR = PROJECT_ROOT / "docs/data_schemas/reports"
+PROFILE_FORMAT = 1
+DEFAULT_CHUNK_SIZE = 50_000
+HLL_PRECISION = 12
+QUANTILE_K = 512
+HEAVY_HITTER_CAPACITY = 64
+TOP_VALUES = 10
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+# Schema dtypes that get a value distribution; everything else is profiled as text
+SCHEMA_KINDS = {"number": "numeric", "integer": "numeric", "date": "date"}
+_EPOCH = dt.date(1970, 1, 1)
+
+
+def _pack(array: np.ndarray) -> str:
+    """Sketch arrays are stored as base64 of the zlib-compressed little-endian bytes."""
+    return base64.b64encode(zlib.compress(array.astype(array.dtype.newbyteorder("<")).tobytes())).decode("ascii")
+
+
+def _unpack(text: str, dtype: Any) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype=np.dtype(dtype).newbyteorder("<")).astype(dtype)
+
+
+class HyperLogLog:
+    """Distinct-count sketch over 64-bit value hashes; merging takes the register-wise max."""
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[np.ndarray] = None) -> None:
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8) if registers is None else registers
+
+    def update(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # Rank = trailing zeros + 1 of the remaining bits; the lowest set bit is an exact power of two
+        lowest = rest & (~rest + np.uint64(1))
+        rank = np.where(rest == 0, bits + 1, np.log2(lowest.astype(np.float64), where=rest != 0, out=np.zeros(len(rest))) + 1)
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge HyperLogLog precisions {self.precision} and {other.precision}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            raw = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(raw))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"precision": self.precision, "registers": _pack(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        return cls(data["precision"], _unpack(data["registers"], np.uint8))
+
+
+class QuantileSketch:
+    """KLL-style compactor: level ``h`` holds sorted survivors of weight ``2**h``, at most ``k`` each."""
+
+    def __init__(self, k: int = QUANTILE_K, levels: Optional[List[np.ndarray]] = None, n: int = 0, seed: int = 0) -> None:
+        self.k = k
+        self.levels = levels or [np.empty(0)]
+        self.n = n
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> None:
+        if not len(values):
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values.astype(np.float64)])
+        self.n += len(values)
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge quantile sketches with k={self.k} and k={other.k}")
+        for height, level in enumerate(other.levels):
+            if height == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[height] = np.concatenate([self.levels[height], level])
+        self.n += other.n
+        self._compress()
+
+    def _compress(self) -> None:
+        height = 0
+        while height < len(self.levels):
+            level = self.levels[height]
+            if len(level) > self.k:
+                level = np.sort(level)
+                paired = len(level) - len(level) % 2
+                # Keep every other item of each pair at double weight; a random offset keeps the rank error unbiased
+                promoted = level[self._rng.integers(2):paired:2]
+                self.levels[height] = level[paired:]
+                if height + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[height + 1] = np.concatenate([self.levels[height + 1], promoted])
+            height += 1
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        if not self.n:
+            return [None] * len(qs)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** height) for height, level in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side="left")
+        return [float(values[order][min(pos, len(values) - 1)]) for pos in positions]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "n": self.n, "levels": [_pack(level) for level in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        return cls(data["k"], [_unpack(level, np.float64) for level in data["levels"]], data["n"])
+
+
+class HeavyHitters:
+    """Misra-Gries frequent-value counters; each count undercounts by at most ``error``."""
+
+    def __init__(self, capacity: int = HEAVY_HITTER_CAPACITY, counts: Optional[Dict[str, int]] = None, error: int = 0) -> None:
+        self.capacity = capacity
+        self.counts: Dict[str, int] = counts or {}
+        self.error = error
+
+    def update(self, values: pd.Series) -> None:
+        for value, count in values.value_counts(sort=False).items():
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+        self._prune()
+
+    def merge(self, other: "HeavyHitters") -> None:
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.error += other.error
+        self._prune()
+
+    def _prune(self) -> None:
+        if len(self.counts) <= self.capacity:
+            return
+        threshold = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = {value: count - threshold for value, count in self.counts.items() if count > threshold}
+        self.error += threshold
+
+    def top(self, n: int = TOP_VALUES) -> List[Dict[str, Any]]:
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+        return [{"value": value, "count": count, "max_error": self.error} for value, count in ranked]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"capacity": self.capacity, "error": self.error, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HeavyHitters":
+        return cls(data["capacity"], dict(data["counts"]), data["error"])
+
+
+class ColumnProfile:
+    """All sketches for one column. ``kind`` is numeric, date or text."""
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.count = 0
+        self.nulls = 0
+        self.unparsed = 0
+        self.min: Any = None
+        self.max: Any = None
+        self.distinct = HyperLogLog()
+        self.frequent = HeavyHitters()
+        self.quantiles = QuantileSketch() if kind != "text" else None
+
+    def update(self, raw: pd.Series) -> None:
+        present = raw.dropna()
+        self.count += len(raw)
+        self.nulls += len(raw) - len(present)
+        if not len(present):
+            return
+        self.frequent.update(present)
+        if self.kind == "text":
+            self.distinct.update(pd.util.hash_array(present.to_numpy(dtype=object)))
+            self._extend(present.min(), present.max())
+            return
+        values = _parse(present, self.kind).dropna()
+        self.unparsed += len(present) - len(values)
+        if not len(values):
+            return
+        array = values.to_numpy(dtype=np.float64)
+        # Hash parsed values so "4.5" and "4.50" count once
+        self.distinct.update(pd.util.hash_array(array))
+        self.quantiles.update(array)
+        self._extend(float(array.min()), float(array.max()))
+
+    def merge(self, other: "ColumnProfile") -> None:
+        if other.kind != self.kind:
+            raise ValueError(f"Cannot merge a {other.kind} column into a {self.kind} column")
+        self.count += other.count
+        self.nulls += other.nulls
+        self.unparsed += other.unparsed
+        if other.min is not None:
+            self._extend(other.min, other.max)
+        self.distinct.merge(other.distinct)
+        self.frequent.merge(other.frequent)
+        if self.quantiles is not None:
+            self.quantiles.merge(other.quantiles)
+
+    def _extend(self, low: Any, high: Any) -> None:
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def _render(self, value: Optional[float]) -> Any:
+        if value is None or self.kind != "date":
+            return value
+        return (_EPOCH + dt.timedelta(days=int(value))).isoformat()
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {
+            "kind": self.kind,
+            "count": self.count,
+            "nulls": self.nulls,
+            "null_rate": round(self.nulls / self.count, 6) if self.count else 0.0,
+            "unparsed": self.unparsed,
+            "distinct_estimate": self.distinct.estimate() if self.count > self.nulls else 0,
+            "min": self._render(self.min),
+            "max": self._render(self.max),
+            "top_values": self.frequent.top(),
+        }
+        if self.quantiles is not None:
+            summary["quantiles"] = {
+                f"p{round(q * 100):02d}": self._render(value)
+                for q, value in zip(QUANTILES, self.quantiles.quantiles(QUANTILES))
+            }
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = {
+            "count": self.count,
+            "nulls": self.nulls,
+            "unparsed": self.unparsed,
+            "min": self.min,
+            "max": self.max,
+            "distinct": self.distinct.to_dict(),
+            "frequent": self.frequent.to_dict(),
+        }
+        if self.quantiles is not None:
+            state["quantiles"] = self.quantiles.to_dict()
+        return {**self.summary(), "sketch": state}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ColumnProfile":
+        state = data["sketch"]
+        profile = cls(data["kind"])
+        profile.count, profile.nulls, profile.unparsed = state["count"], state["nulls"], state["unparsed"]
+        profile.min, profile.max = state["min"], state["max"]
+        profile.distinct = HyperLogLog.from_dict(state["distinct"])
+        profile.frequent = HeavyHitters.from_dict(state["frequent"])
+        if "quantiles" in state:
+            profile.quantiles = QuantileSketch.from_dict(state["quantiles"])
+        return profile
+
+
+class DatasetProfile:
+    """Column profiles for one dataset plus the source files (by content hash) folded into them."""
+
+    def __init__(self, dataset_id: str) -> None:
+        self.dataset_id = dataset_id
+        self.rows = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+        self.sources: List[Dict[str, Any]] = []
+
+    def update(self, chunk: pd.DataFrame, kinds: Dict[str, str]) -> None:
+        self.rows += len(chunk)
+        for column in chunk.columns:
+            if column not in self.columns:
+                self.columns[column] = ColumnProfile(kinds.get(column) or infer_kind(chunk[column]))
+                # Column first seen part-way through: earlier rows were all nulls
+                self.columns[column].count = self.columns[column].nulls = self.rows - len(chunk)
+            self.columns[column].update(chunk[column])
+
+    def merge(self, other: "DatasetProfile") -> None:
+        seen = {source["sha256"]: source["path"] for source in self.sources}
+        overlap = [source["path"] for source in other.sources if source["sha256"] in seen]
+        if overlap:
+            raise ValueError(f"Sources already folded into this profile: {overlap}")
+        for name, column in other.columns.items():
+            if name not in self.columns:
+                self.columns[name] = ColumnProfile(column.kind)
+                self.columns[name].count = self.columns[name].nulls = self.rows
+            self.columns[name].merge(column)
+        for name, column in self.columns.items():
+            if name not in other.columns:
+                column.count += other.rows
+                column.nulls += other.rows
+        self.rows += other.rows
+        self.sources.extend(other.sources)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": PROFILE_FORMAT,
+            "dataset_id": self.dataset_id,
+            "rows": self.rows,
+            "sources": self.sources,
+            "columns": {name: column.to_dict() for name, column in self.columns.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DatasetProfile":
+        if data.get("format") != PROFILE_FORMAT:
+            raise ValueError(f"Unsupported profile format {data.get('format')!r} (expected {PROFILE_FORMAT})")
+        profile = cls(data["dataset_id"])
+        profile.rows = data["rows"]
+        profile.sources = list(data["sources"])
+        profile.columns = {name: ColumnProfile.from_dict(column) for name, column in data["columns"].items()}
+        return profile
+
+
+def _parse(values: pd.Series, kind: str) -> pd.Series:
+    if kind == "numeric":
+        return pd.to_numeric(values, errors="coerce")
+    dates = pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+    return (dates - pd.Timestamp(_EPOCH)).dt.days.astype("float64")
+
+
+def infer_kind(values: pd.Series) -> str:
+    """numeric or date when every non-empty value in the first chunk parses as one, else text."""
+    present = values.dropna()
+    if not len(present):
+        return "text"
+    for kind in ("numeric", "date"):
+        if _parse(present, kind).notna().all():
+            return kind
+    return "text"
+
+
+def schema_kinds(schema: Optional[Schema]) -> Dict[str, str]:
+    if schema is None:
+        return {}
+    return {field.name: SCHEMA_KINDS.get(field.dtype, "text") for field in schema.fields}
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def profile_file(path: Path, dataset_id: str, kinds: Dict[str, str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> DatasetProfile:
+    """Profile one CSV in ``chunk_size`` row chunks; values are kept as raw strings until a sketch parses them."""
+    if not path.exists():
+        raise ValueError(f"Input file not found: {path}")
+    profile = DatasetProfile(dataset_id)
+    reader = pd.read_csv(path, dtype="string", keep_default_na=False, na_values=[""], chunksize=chunk_size)
+    for chunk in reader:
+        profile.update(chunk, kinds)
+    try:
+        relative = path.resolve().relative_to(PROJECT_ROOT)
+    except ValueError:
+        relative = path
+    profile.sources.append({"path": str(relative), "rows": profile.rows, "sha256": _sha256(path)})
+    return profile
+
+
+def profile_paths(paths: Iterable[Path], dataset_id: str, kinds: Dict[str, str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> DatasetProfile:
+    """Profile each CSV under ``paths`` separately and merge the results."""
+    merged = DatasetProfile(dataset_id)
+    for path in paths:
+        for csv_path in iter_csv_files(path):
+            print(f"[INFO] Profiling {csv_path}")
+            with span(f"profile:{csv_path.name}") as profile_span:
+                part = profile_file(csv_path, dataset_id, kinds, chunk_size)
+                profile_span.rows_in = part.rows
+            merged.merge(part)
+    return merged
+
+
+def merge_profiles(paths: Sequence[Path]) -> DatasetProfile:
+    """Combine saved profile JSONs without touching the underlying data."""
+    if not paths:
+        raise ValueError("No profiles to merge")
+    profiles = [DatasetProfile.from_dict(json.loads(path.read_text(encoding="utf-8"))) for path in paths]
+    merged = DatasetProfile(profiles[0].dataset_id)
+    for profile in profiles:
+        if profile.dataset_id != merged.dataset_id:
+            raise ValueError(f"Cannot merge profiles of {merged.dataset_id!r} and {profile.dataset_id!r}")
+        merged.merge(profile)
+    return merged
+
+
+def write_profile(profile: DatasetProfile, output: Path) -> Path:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + ".tmp")
+    tmp.write_text(json.dumps(profile.to_dict(), indent=2) + "\n", encoding="utf-8")
+    tmp.replace(output)
+    return output
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile pricing datasets with mergeable streaming sketches")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", type=Path, nargs="+", help="CSV files or directories to profile")
+    source.add_argument("--merge", type=Path, nargs="+", help="Existing profile JSONs to combine")
+    parser.add_argument("--schema", help="Schema file; its field dtypes decide which columns get quantiles")
+    parser.add_argument("--dataset-id", help="Dataset identifier (also selects the schema when one exists)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--output", type=Path, help="Profile JSON (default: docs/data_schemas/reports/<input>_profile.json)")
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
+
+    with instrumented_run("profile_pricing_data", args.metrics_json, args.profile):
+        try:
+            if args.merge:
+                with span("merge_profiles", rows_in=len(args.merge)):
+                    profile = merge_profiles(args.merge)
+                default_name = profile.dataset_id
+            else:
+                schema = None
+                if args.schema or (args.dataset_id and Path(f"docs/data_schemas/schemas/{args.dataset_id}.schema.yaml").exists()):
+                    with span("load_schema"):
+                        schema = load_schema(Path(args.schema) if args.schema else None, args.dataset_id)
+                default_name = args.input[0].stem
+                dataset_id = args.dataset_id or (schema.dataset_id if schema else default_name)
+                profile = profile_paths(args.input, dataset_id, schema_kinds(schema), args.chunk_size)
+        except ValueError as exc:
+            raise SystemExit(str(exc))
+        output = args.output or REPORTS_DIR / f"{default_name}_profile.json"
+        with span("write_profile"):
+            write_profile(profile, output)
+
+    print(f"[INFO] Profiled {profile.rows:,} rows x {len(profile.columns)} columns from {len(profile.sources)} file(s)")
+    print(f"[INFO] Wrote profile to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,7 +20,7 @@ import re
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 try:
     import yaml  # type: ignore
@@ -30,6 +30,9 @@ except Exception as exc:  # pragma: no cover
     )
     raise
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pricing"))
+from instrumentation import add_instrumentation_args, instrumented_run, span  # noqa: E402
+
 
 @dataclass
 class FieldRule:
@@ -105,6 +108,8 @@ class PricingValidator:
         self.strict = strict
         self.messages: List[ValidationMessage] = []
         self._unique_trackers: Dict[str, set] = {}
+        self.rows_checked = 0
+        self.rows_rejected = 0
 
     def validate_file(self, csv_path: Path) -> bool:
         if not csv_path.exists():
@@ -115,7 +120,9 @@ class PricingValidator:
             self._validate_columns(reader.fieldnames, csv_path)
             ok = True
             for index, row in enumerate(reader, start=2):  # include header row offset
+                self.rows_checked += 1
                 if not self._validate_row(row, index):
+                    self.rows_rejected += 1
                     ok = False
                     if self.fail_fast:
                         break
@@ -328,7 +335,7 @@ def build_report(messages: List[ValidationMessage]) -> Dict[str, Any]:
     }
 
 
-def main() -> int:
+def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="Validate pricing datasets")
     parser.add_argument("--input", required=True, help="CSV file or directory to validate")
     parser.add_argument("--schema", help="Path to schema file")
@@ -337,21 +344,29 @@ def main() -> int:
     parser.add_argument("--fail-fast", action="store_true")
     parser.add_argument("--strict", action="store_true")
     parser.add_argument("--sample-check", action="store_true")
-    args = parser.parse_args()
-
-    schema = load_schema(Path(args.schema) if args.schema else None, args.dataset_id)
-    validator = PricingValidator(schema, fail_fast=args.fail_fast, strict=args.strict)
-
-    ok = True
-    for csv_path in iter_csv_files(Path(args.input)):
-        print(f"[INFO] Validating {csv_path}")
-        if not validator.validate_file(csv_path):
-            ok = False
+    add_instrumentation_args(parser)
+    args = parser.parse_args(argv)
+
+    with instrumented_run("validate_pricing_data", args.metrics_json, args.profile):
+        with span("load_schema"):
+            schema = load_schema(Path(args.schema) if args.schema else None, args.dataset_id)
+        validator = PricingValidator(schema, fail_fast=args.fail_fast, strict=args.strict)
+
+        ok = True
+        for csv_path in iter_csv_files(Path(args.input)):
+            print(f"[INFO] Validating {csv_path}")
+            checked, rejected = validator.rows_checked, validator.rows_rejected
+            with span(f"validate:{csv_path.name}") as validate_span:
+                if not validator.validate_file(csv_path):
+                    ok = False
+                validate_span.rows_in = validator.rows_checked - checked
+                validate_span.rows_rejected = validator.rows_rejected - rejected
 
-    if args.sample_check:
-        print("[INFO] Running sample validation")
-        if not run_sample_check(schema.dataset_id, validator):
-            ok = False
+        if args.sample_check:
+            print("[INFO] Running sample validation")
+            with span("sample_check"):
+                if not run_sample_check(schema.dataset_id, validator):
+                    ok = False
 
     for msg in validator.messages:
         stream = sys.stderr if msg.level == "ERROR" else sys.stdout
@@ -0,0 +1,58 @@
+/**
+ * Tests for the prebuilt retrieval index
+ * Run with: node --test test/retrieval-index.test.js
+ */
+
+import { test } from 'node:test';
+import assert from 'node:assert';
+import path from 'path';
+import { loadRetrievalIndex, rankWithIndex } from '../utils/retrieval-index.js';
+import { tokenize } from '../utils/text-processing.js';
+
+const index = loadRetrievalIndex(path.join(process.cwd(), 'data', 'retrieval_index.json'));
+
+// Brute-force ranker as in api/chat.js
+function tfidfRank(query, docs) {
+  const toksDocs = docs.map(d => tokenize(d.text));
+  const df = new Map();
+  toksDocs.forEach(tokens => new Set(tokens).forEach(t => df.set(t, (df.get(t) || 0) + 1)));
+  const idf = t => Math.log(1 + docs.length / ((df.get(t) || 0) + 1));
+  const vector = tokens => {
+    const tf = new Map();
+    tokens.forEach(t => tf.set(t, (tf.get(t) || 0) + 1));
+    const v = new Map();
+    tf.forEach((f, t) => v.set(t, f * idf(t)));
+    return v;
+  };
+  const vcos = (a, b) => {
+    let dot = 0, na = 0, nb = 0;
+    a.forEach((va, t) => { na += va * va; dot += va * (b.get(t) || 0); });
+    b.forEach(vb => (nb += vb * vb));
+    return dot / ((Math.sqrt(na) || 1) * (Math.sqrt(nb) || 1));
+  };
+  const qv = vector(tokenize(query));
+  return docs.map((d, i) => ({ i, score: vcos(qv, vector(toksDocs[i])) })).sort((a, b) => b.score - a.score);
+}
+
+test('retrieval index: loads with a supported format', () => {
+  assert.ok(index, 'Run python scripts/pricing/build_retrieval_index.py');
+  assert.strictEqual(index.dictionary.length, index.idf.length);
+  assert.strictEqual(index.chunks.length, index.norms.length);
+});
+
+test('retrieval index: Python tokenizer matches utils/text-processing.js', () => {
+  for (const chunk of index.chunks) {
+    for (const token of tokenize(chunk.text)) {
+      assert.ok(index.tokenIds.has(token), `token ${token} missing from dictionary`);
+    }
+  }
+});
+
+test('retrieval index: postings ranking matches brute-force TF-IDF', () => {
+  for (const query of ['motor vehicle records', 'county vs statewide searches', 'Texas court fees', 'unknownword pricing']) {
+    const expected = tfidfRank(query, index.chunks).slice(0, 6);
+    const actual = rankWithIndex(query, index, 6);
+    actual.forEach((r, j) => assert.ok(Math.abs(r.score - expected[j].score) < 1e-4, `${query}: rank ${j}`));
+  }
+  assert.strictEqual(index.chunks[rankWithIndex('motor vehicle records', index, 1)[0].i].url, '/mvr_api.html');
+});
@@ -0,0 +1,66 @@
+/**
+ * Precomputed retrieval index (data/retrieval_index.json)
+ *
+ * Built offline by scripts/pricing/build_retrieval_index.py: chunks, token
+ * dictionary, IDF weights, postings and chunk norms. Ranking only touches the
+ * postings of the query's tokens and gives the same cosine scores as the
+ * TF-IDF ranker in api/chat.js.
+ */
+
+import fs from 'fs';
+import { tokenize } from './text-processing.js';
+
+/** Index layout this reader understands (INDEX_FORMAT in the builder) */
+export const RETRIEVAL_INDEX_FORMAT = 1;
+
+/**
+ * Load and prepare a retrieval index
+ * @param {string} filePath - Path to retrieval_index.json
+ * @returns {Object|null} Index with a token lookup map, or null if missing/unsupported
+ */
+export function loadRetrievalIndex(filePath) {
+  if (!fs.existsSync(filePath)) return null;
+  const data = JSON.parse(fs.readFileSync(filePath, 'utf8'));
+  if (data.format !== RETRIEVAL_INDEX_FORMAT) {
+    console.warn(`Retrieval index format ${data.format} unsupported (expected ${RETRIEVAL_INDEX_FORMAT})`);
+    return null;
+  }
+  data.tokenIds = new Map(data.dictionary.map((token, i) => [token, i]));
+  return data;
+}
+
+/**
+ * Rank index chunks against a query by TF-IDF cosine similarity
+ * @param {string} query - Search query
+ * @param {Object} index - Index from loadRetrievalIndex
+ * @param {number} [k=6] - Number of results
+ * @returns {Array<{i: number, score: number}>} Top chunks (highest score first)
+ */
+export function rankWithIndex(query, index, k = 6) {
+  const n = index.chunks.length;
+  const tf = new Map();
+  tokenize(query).forEach(t => tf.set(t, (tf.get(t) || 0) + 1));
+
+  const scores = new Float64Array(n);
+  let queryNorm = 0;
+  tf.forEach((f, token) => {
+    const id = index.tokenIds.get(token);
+    // Unknown tokens have df = 0; they only add to the query norm
+    const idf = id === undefined ? Math.log(1 + n) : index.idf[id];
+    const weight = f * idf;
+    queryNorm += weight * weight;
+    if (id === undefined) return;
+    const postings = index.postings[id];
+    for (let p = 0; p < postings.length; p += 2) {
+      scores[postings[p]] += weight * postings[p + 1] * idf;
+    }
+  });
+
+  queryNorm = Math.sqrt(queryNorm) || 1;
+  const ranked = [];
+  for (let i = 0; i < n; i++) {
+    ranked.push({ i, score: scores[i] / (queryNorm * (index.norms[i] || 1)) });
+  }
+  ranked.sort((a, b) => b.score - a.score || a.i - b.i);
+  return ranked.slice(0, k);
+}